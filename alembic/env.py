@@ -17,7 +17,8 @@ load_dotenv()
 
 # アプリケーションのモデルとデータベース設定をインポート
 from app.db.database import Base
-from app.models import project, task, user, message  # モデルをインポートして登録
+from app.db.search_index import is_search_index_object
+from app.models import project, task, user, message, read_cursor, unread_counter, cache_event  # モデルをインポートして登録
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -37,6 +38,12 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """全文検索用のテーブル・インデックス（app.db.search_index）を自動生成の比較から除外"""
+    return not is_search_index_object(name, type_)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -59,6 +66,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -82,7 +90,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,48 @@
+"""add_message_filter_indexes
+
+Revision ID: 4c8d2f1a9b3e
+Revises: 121031dedf54
+Create Date: 2026-10-18 09:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8d2f1a9b3e'
+down_revision: Union[str, None] = '121031dedf54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (インデックス名, カラム) の一覧
+MESSAGE_INDEXES = [
+    ('ix_messages_project_id_created_at', ['project_id', 'created_at']),
+    ('ix_messages_task_id_created_at', ['task_id', 'created_at']),
+    ('ix_messages_recipient_id_is_read', ['recipient_id', 'is_read']),
+    ('ix_messages_parent_id_created_at', ['parent_id', 'created_at']),
+    ('ix_messages_user_id_recipient_id_created_at', ['user_id', 'recipient_id', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 論理削除されていない行のみを対象とする部分インデックスを作成
+    for name, columns in MESSAGE_INDEXES:
+        op.create_index(
+            name,
+            'messages',
+            columns,
+            unique=False,
+            sqlite_where=sa.text('is_deleted = 0'),
+            postgresql_where=sa.text('is_deleted = false'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _ in reversed(MESSAGE_INDEXES):
+        op.drop_index(name, table_name='messages')
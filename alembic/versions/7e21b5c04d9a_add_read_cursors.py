@@ -0,0 +1,37 @@
+"""add_read_cursors
+
+Revision ID: 7e21b5c04d9a
+Revises: 4c8d2f1a9b3e
+Create Date: 2026-10-18 10:03:17.551204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e21b5c04d9a'
+down_revision: Union[str, None] = '4c8d2f1a9b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ユーザー×チャンネルごとの既読カーソル
+    op.create_table('read_cursors',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('channel_type', sa.String(length=20), nullable=False),
+    sa.Column('channel_id', sa.Integer(), nullable=False),
+    sa.Column('last_read_message_id', sa.Integer(), nullable=False, server_default=sa.text('0')),
+    sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'channel_type', 'channel_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('read_cursors')
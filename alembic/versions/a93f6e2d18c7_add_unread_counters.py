@@ -0,0 +1,48 @@
+"""add_unread_counters
+
+Revision ID: a93f6e2d18c7
+Revises: 7e21b5c04d9a
+Create Date: 2026-10-18 10:41:52.087733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93f6e2d18c7'
+down_revision: Union[str, None] = '7e21b5c04d9a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ユーザー×チャンネルごとの未読カウンター
+    op.create_table('unread_counters',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('channel_type', sa.String(length=20), nullable=False),
+    sa.Column('channel_id', sa.Integer(), nullable=False),
+    sa.Column('unread_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+    sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'channel_type', 'channel_id')
+    )
+    
+    # 既存の未読DMからカウンターを初期化
+    op.execute(
+        """
+        INSERT INTO unread_counters (user_id, channel_type, channel_id, unread_count, updated_at)
+        SELECT recipient_id, 'dm', user_id, COUNT(*), CURRENT_TIMESTAMP
+        FROM messages
+        WHERE recipient_id IS NOT NULL AND is_read = false AND is_deleted = false
+        GROUP BY recipient_id, user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('unread_counters')
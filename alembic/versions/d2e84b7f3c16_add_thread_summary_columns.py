@@ -0,0 +1,63 @@
+"""add_thread_summary_columns
+
+Revision ID: d2e84b7f3c16
+Revises: c5d71e08a4f2
+Create Date: 2026-10-18 12:02:44.730915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e84b7f3c16'
+down_revision: Union[str, None] = 'c5d71e08a4f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # スレッドの集計値を保持する非正規化カラムを追加
+    op.add_column('messages', sa.Column('reply_count', sa.Integer(), nullable=False, server_default=sa.text('0')))
+    op.add_column('messages', sa.Column('last_reply_at', sa.DateTime(), nullable=True))
+    op.add_column('messages', sa.Column('last_reply_id', sa.Integer(), nullable=True))
+    op.add_column('messages', sa.Column('participant_count', sa.Integer(), nullable=False, server_default=sa.text('0')))
+    
+    # 既存のスレッドの集計値を一括で埋める
+    op.execute(
+        """
+        UPDATE messages SET
+            reply_count = (
+                SELECT COUNT(*) FROM messages AS r
+                WHERE r.parent_id = messages.id AND r.is_deleted = false
+            ),
+            last_reply_id = (
+                SELECT MAX(r.id) FROM messages AS r
+                WHERE r.parent_id = messages.id AND r.is_deleted = false
+            ),
+            participant_count = (
+                SELECT COUNT(DISTINCT r.user_id) FROM messages AS r
+                WHERE r.parent_id = messages.id AND r.is_deleted = false
+            )
+        WHERE EXISTS (SELECT 1 FROM messages AS r WHERE r.parent_id = messages.id)
+        """
+    )
+    op.execute(
+        """
+        UPDATE messages SET last_reply_at = (
+            SELECT r.created_at FROM messages AS r WHERE r.id = messages.last_reply_id
+        )
+        WHERE last_reply_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('messages', 'participant_count')
+    op.drop_column('messages', 'last_reply_id')
+    op.drop_column('messages', 'last_reply_at')
+    op.drop_column('messages', 'reply_count')
@@ -0,0 +1,40 @@
+"""add_cache_events
+
+Revision ID: e6b09a4c27d1
+Revises: d2e84b7f3c16
+Create Date: 2026-10-18 16:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b09a4c27d1'
+down_revision: Union[str, None] = 'd2e84b7f3c16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLiteを共有するプロセス間でキャッシュの無効化を伝えるイベントログ（PostgreSQLではNOTIFYを使うため空のまま）
+    op.create_table('cache_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('origin', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=50), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    op.create_index(op.f('ix_cache_events_created_at'), 'cache_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cache_events_created_at'), table_name='cache_events')
+    op.drop_table('cache_events')
@@ -6,5 +6,11 @@ from . import project
 from . import task
 from . import user
 from . import message
+from . import read_cursor
+from . import unread_counter
+from . import search
+from . import read
+from . import recent
+from . import invalidation
 
-__all__ = ["project", "task", "user", "message"]
+__all__ = ["project", "task", "user", "message", "read_cursor", "unread_counter", "search", "read", "recent", "invalidation"]
@@ -0,0 +1,67 @@
+"""
+CRUD操作の非同期版
+
+各CRUDモジュールの公開関数を、AsyncSessionを受け取る非同期関数として提供します。
+処理は AsyncSession.run_sync() で同期版の関数をそのまま実行するため、
+未読数やスレッド集計などの更新処理も同期版と同じトランザクションで行われます。
+
+Example:
+    ```python
+    from app.crud import aio
+
+    async with AsyncSessionLocal() as db:
+        messages = await aio.message.get_messages(db, project_id=1)
+    ```
+"""
+import functools
+import inspect
+from types import ModuleType, SimpleNamespace
+from typing import Any, Callable, Coroutine
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import message as _message
+from app.crud import project as _project
+from app.crud import read as _read
+from app.crud import read_cursor as _read_cursor
+from app.crud import search as _search
+from app.crud import task as _task
+from app.crud import unread_counter as _unread_counter
+from app.crud import user as _user
+
+
+def to_async(fn: Callable[..., Any]) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """
+    Sessionを第一引数に取る同期関数を、AsyncSessionを受け取る非同期関数に変換する
+
+    Args:
+        fn: Sessionを第一引数に取る同期関数
+
+    Returns:
+        非同期関数
+    """
+    @functools.wraps(fn)
+    async def wrapper(db: AsyncSession, *args: Any, **kwargs: Any) -> Any:
+        return await db.run_sync(fn, *args, **kwargs)
+    return wrapper
+
+
+def _async_module(module: ModuleType) -> SimpleNamespace:
+    """モジュールで定義された、dbを第一引数に取る公開関数を非同期版にまとめる"""
+    return SimpleNamespace(**{
+        name: to_async(fn)
+        for name, fn in inspect.getmembers(module, inspect.isfunction)
+        if not name.startswith("_")
+        and fn.__module__ == module.__name__
+        and next(iter(inspect.signature(fn).parameters), None) == "db"
+    })
+
+
+project = _async_module(_project)
+task = _async_module(_task)
+user = _async_module(_user)
+message = _async_module(_message)
+read_cursor = _async_module(_read_cursor)
+unread_counter = _async_module(_unread_counter)
+search = _async_module(_search)
+read = _async_module(_read)
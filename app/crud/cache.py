@@ -0,0 +1,302 @@
+"""
+ユーザー・プロジェクト・タスクのプロセス内キャッシュ
+
+ほとんど変更されないのに繰り返し参照されるエンティティ（ツールやリソースからの
+ユーザー・プロジェクト・タスクの取得）を、件数上限（LRU）と有効期限（TTL）付きで
+プロセス内に保持し、DBへの往復を省きます。
+
+- キャッシュするのは全列を読み込んだ行のスナップショット（どのセッションにも
+  属さないdetached状態のインスタンス）です。ヒットした場合は
+  Session.merge(load=False) でSQLを発行せずに呼び出し元のセッションへ取り込みます。
+- 同じプロセスでの作成・更新・削除は crud の各関数が invalidate() を呼び、
+  その場とコミット後の2回無効化します。コミット前に別のスレッドが古い行を
+  読み込んでキャッシュした場合も、コミット後の無効化で取り除かれます。
+- 他のプロセスでの変更は、app.crud.invalidation のイベントで無効化されます。
+  SQLでの直接の変更は、TTLが切れるまで反映されません。
+
+件数上限と有効期限は DEVLOG_CACHE_SIZE / DEVLOG_CACHE_TTL 環境変数で設定でき、
+DEVLOG_CACHE_SIZE=0 でキャッシュを無効にできます。
+
+invalidate() はモデル・エンティティごとの世代番号（generations）も進めます。
+リソースの描画結果のキャッシュ（app.resources.render_cache）は、この世代番号を
+バージョンとして使い、DBに問い合わせずに再利用できるかを判定します。
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import AbstractSet, Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.crud.projection import column_names
+
+T = TypeVar("T")
+
+# キャッシュする最大件数（0でキャッシュを無効化）
+CACHE_SIZE: int = int(os.getenv("DEVLOG_CACHE_SIZE", "1024"))
+
+# キャッシュの有効期限（秒）
+CACHE_TTL: float = float(os.getenv("DEVLOG_CACHE_TTL", "60"))
+
+# コミット後に無効化するエンティティを Session.info に保持するキー
+_PENDING_KEY = "devlog_cache_invalidations"
+
+
+class EntityCache:
+    """
+    件数上限（LRU）と有効期限（TTL）付きのエンティティキャッシュ
+    
+    キーは (モデル名, 検索方法, 値) の組です（例: ("User", "username", "alice")）。
+    複数スレッドから使われるため、ロックで保護します。
+    """
+    
+    def __init__(self, max_size: int = CACHE_SIZE, ttl: float = CACHE_TTL) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+    
+    def get(self, key: Tuple[str, str, Hashable]) -> Optional[Any]:
+        """キャッシュされたスナップショットを取得（ない場合・期限切れの場合はNone）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return snapshot
+    
+    def put(self, key: Tuple[str, str, Hashable], snapshot: Any) -> None:
+        """スナップショットを保存し、上限を超えた場合は最も古く使われたものを捨てる"""
+        with self._lock:
+            if key not in self._entries:
+                self._counts[key[0]] = self._counts.get(key[0], 0) + 1
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def invalidate(self, model_name: str, entity_ids: Optional[AbstractSet[Hashable]] = None) -> None:
+        """
+        エンティティのキャッシュを無効化
+        
+        ユーザー名など、ID以外のキーで保存されたものも含めて取り除きます。
+        entity_ids がNoneの場合は、そのモデルのキャッシュをすべて取り除きます。
+        """
+        with self._lock:
+            # メッセージなど、キャッシュしていないモデルの書き込みでは走査しない
+            if not self._counts.get(model_name):
+                return
+            stale = [
+                key for key, (_, snapshot) in self._entries.items()
+                if key[0] == model_name and (entity_ids is None or snapshot.id in entity_ids)
+            ]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+    
+    def _remove(self, key: Tuple[str, str, Hashable]) -> None:
+        del self._entries[key]
+        self._counts[key[0]] -= 1
+    
+    def clear(self) -> None:
+        """すべてのキャッシュを取り除く"""
+        with self._lock:
+            self._entries.clear()
+            self._counts.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """設定と現在の件数・ヒット率などの統計情報を返す"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class Generations:
+    """
+    モデル・エンティティごとの世代番号
+    
+    書き込みのたびに、プロセス全体で単調増加する番号を記録します。
+    描画結果などを作ったときの番号と現在の番号を比べれば、その後に
+    書き込みがあったかどうかをDBに問い合わせずに判定できます。
+    
+    エンティティごとの番号は max_entities 件まで保持し、追い出した番号は
+    下限（floor）として全エンティティに適用します。追い出した後も
+    「変更なし」と誤判定することはなく、再描画が増えるだけです。
+    """
+    
+    def __init__(self, max_entities: int = 10000) -> None:
+        self.max_entities = max_entities
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._floor = 0
+        self._models: Dict[str, int] = {}
+        self._all_entities: Dict[str, int] = {}
+        self._entities: "OrderedDict[Tuple[str, Hashable], int]" = OrderedDict()
+    
+    def bump(self, model_name: str, entity_ids: Optional[AbstractSet[Hashable]] = None) -> None:
+        """書き込みを記録（entity_ids がNoneの場合は、そのモデルの全エンティティ）"""
+        with self._lock:
+            self._sequence += 1
+            self._models[model_name] = self._sequence
+            if entity_ids is None:
+                self._all_entities[model_name] = self._sequence
+                return
+            for entity_id in entity_ids:
+                key = (model_name, entity_id)
+                self._entities[key] = self._sequence
+                self._entities.move_to_end(key)
+            while len(self._entities) > self.max_entities:
+                _, evicted = self._entities.popitem(last=False)
+                self._floor = max(self._floor, evicted)
+    
+    def model(self, model_name: str) -> int:
+        """モデルのいずれかのエンティティに最後に書き込んだときの番号"""
+        with self._lock:
+            return self._models.get(model_name, 0)
+    
+    def entity(self, model_name: str, entity_id: Hashable) -> int:
+        """エンティティに最後に書き込んだときの番号"""
+        with self._lock:
+            return max(
+                self._entities.get((model_name, entity_id), 0),
+                self._all_entities.get(model_name, 0),
+                self._floor,
+            )
+
+
+# アプリケーション全体で共有するキャッシュと世代番号
+entity_cache = EntityCache()
+generations = Generations()
+
+
+def cached_get(
+    db: Session,
+    model: type,
+    lookup: str,
+    value: Hashable,
+    load: Callable[[], Optional[T]],
+    partial: bool = False
+) -> Optional[T]:
+    """
+    キャッシュを使ってエンティティを1件取得
+    
+    Args:
+        db: セッション
+        model: モデルクラス
+        lookup: 検索方法（"id"、"username" など）
+        value: 検索する値
+        load: キャッシュにない場合にDBから読み込む関数
+        partial: loadが一部の列だけを読み込む場合True（結果はキャッシュしない）
+    
+    Returns:
+        セッションに属するインスタンス（存在しない場合はNone）
+    """
+    if not entity_cache.enabled:
+        return load()
+    
+    key = (model.__name__, lookup, value)
+    snapshot = entity_cache.get(key)
+    if snapshot is not None:
+        # 同じセッションで既に読み込まれている場合は、そちらを優先する
+        existing = db.identity_map.get(db.identity_key(model, snapshot.id))
+        return existing if existing is not None else db.merge(snapshot, load=False)
+    
+    instance = load()
+    if instance is not None and not partial:
+        snapshot = _snapshot(model, instance)
+        if snapshot is not None:
+            entity_cache.put(key, snapshot)
+    return instance
+
+
+def _snapshot(model: type, instance: Any) -> Optional[Any]:
+    """全列が読み込まれたインスタンスから、どのセッションにも属さないコピーを作成"""
+    state = instance.__dict__
+    names = column_names(model)
+    if any(name not in state for name in names):
+        return None
+    snapshot = model(**{name: state[name] for name in names})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def invalidate(db: Session, model: type, *entity_ids: Hashable) -> None:
+    """
+    エンティティのキャッシュを、その場とセッションのコミット後に無効化
+    
+    あわせて世代番号を進めます。作成を含め、キャッシュや描画結果に影響する
+    書き込みを行う crud の関数から呼び出してください。
+    entity_ids を省略した場合は、そのモデルのキャッシュをすべて無効化します。
+    """
+    name = model.__name__
+    ids = set(entity_ids) or None
+    entity_cache.invalidate(name, ids)
+    generations.bump(name, ids)
+    
+    # モデル名ごとに、コミット後に無効化するID（Noneはすべて）をまとめておく
+    pending = db.info.setdefault(_PENDING_KEY, {})
+    if ids is None or (name in pending and pending[name] is None):
+        pending[name] = None
+    else:
+        pending.setdefault(name, set()).update(ids)
+
+
+def pending_invalidations(db: Session) -> Dict[str, Optional[AbstractSet[Hashable]]]:
+    """
+    セッションのコミット後に無効化する予定のエンティティを取得
+    
+    Returns:
+        モデル名と、無効化するIDの集合（Noneはそのモデルのすべて）の辞書
+    """
+    return dict(db.info.get(_PENDING_KEY, {}))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    # after_commit はSAVEPOINTの解放（begin_nested() のコミット）でも発火する。
+    # 外側のトランザクションがまだコミットされていないため、無効化はその後まで待つ
+    if session.in_nested_transaction():
+        return
+    for model_name, entity_ids in session.info.pop(_PENDING_KEY, {}).items():
+        entity_cache.invalidate(model_name, entity_ids)
+        generations.bump(model_name, entity_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction) -> None:
+    # ロールバックされた変更はDBに反映されないため、コミット後の無効化は不要
+    # （SAVEPOINTのロールバックでは、外側のトランザクションの変更が残るため捨てない）
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,49 @@
+"""
+データベース方言ごとの差異を吸収するヘルパー
+
+DevLogはSQLiteとPostgreSQLをサポートしており、
+UPSERTや関数名などの差異をここでまとめて扱います。
+"""
+from typing import Any
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def dialect_name(db: Session) -> str:
+    """セッションが接続しているデータベースの方言名を取得"""
+    return db.get_bind().dialect.name
+
+
+def upsert(db: Session, model: Any):
+    """
+    ON CONFLICT 句を使用できるINSERT文を作成
+    
+    Raises:
+        NotImplementedError: SQLite / PostgreSQL 以外の場合
+    """
+    name = dialect_name(db)
+    if name == "sqlite":
+        return sqlite.insert(model)
+    if name == "postgresql":
+        return postgresql.insert(model)
+    raise NotImplementedError(f"Upsert is not supported on {name}")
+
+
+def greatest(db: Session, *values: Any):
+    """引数の最大値を返すSQL式（SQLiteは複数引数のmax関数）"""
+    if dialect_name(db) == "sqlite":
+        return func.max(*values)
+    return func.greatest(*values)
+
+
+def set_local_lock_timeout(db: Session, milliseconds: int) -> None:
+    """
+    現在のトランザクションで行ロックを待つ時間の上限を設定
+    
+    PostgreSQLでは SET LOCAL lock_timeout を使用し、トランザクションの終了時に元に戻ります。
+    SQLiteはデータベース単位のロックのため、接続時の busy_timeout が同じ役割を果たします。
+    """
+    if dialect_name(db) == "postgresql":
+        db.execute(text(f"SET LOCAL lock_timeout = {int(milliseconds)}"))
@@ -0,0 +1,414 @@
+"""
+プロセス間のキャッシュ無効化（invalidation bus）
+
+エンティティキャッシュ（app.crud.cache）、世代番号を使う描画結果のキャッシュ、
+最新メッセージのバッファ（app.crud.recent）はプロセスごとに持つため、
+同じデータベースを使う別のプロセスの書き込みはTTLが切れるまで反映されません。
+書き込んだプロセスが (モデル, ID, 世代番号) のイベントを発行し、他のプロセスが
+それを受け取って該当するキャッシュを無効化します。
+
+- PostgreSQL: コミット前に pg_notify() で通知し（NOTIFYはコミット時に届きます）、
+  各プロセスは専用の接続で LISTEN します（psycopg2 が必要です）。
+- SQLite: コミット前に cache_events テーブルにイベントを追加し、各プロセスは
+  専用の接続で PRAGMA data_version を CACHE_BUS_INTERVAL 秒ごとに確認します。
+  値が変わったとき（他の接続がコミットしたとき）だけ、前回より大きいIDのイベントを読み込みます。
+
+イベントは書き込みと同じトランザクションで発行されるため、ロールバックした書き込みの
+イベントは届きません。自分のプロセスのイベントは、発行元の識別子（origin）で読み飛ばします。
+接続が切れた場合や、保持期間（CACHE_BUS_RETENTION 秒）を過ぎてイベントが削除され
+取りこぼした場合は、すべてのキャッシュを捨てます。
+
+イベントを受け取るスレッドは app.main の lifespan で開始します。
+DEVLOG_CACHE_BUS=false で無効にできます（インメモリのSQLiteでは常に無効です）。
+"""
+import json
+import logging
+import os
+import select as select_module
+import socket
+import threading
+import time
+import uuid
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+from sqlalchemy import Engine, create_engine, delete, event, func, insert, select
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.exc import UnboundExecutionError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.crud.cache import entity_cache, generations, pending_invalidations
+from app.crud.recent import recent_messages
+from app.db.database import (
+    SQLALCHEMY_DATABASE_URL,
+    SQLITE_READER_PRAGMAS,
+    async_engine,
+    configure_sqlite_engine,
+    connect_args,
+    engine,
+)
+from app.db.writer import writer
+from app.models.cache_event import CacheEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _shared_database(database_url: str) -> bool:
+    # 複数のプロセスから同じデータベースを参照できる場合だけ有効にする
+    backend = make_url(database_url).get_backend_name()
+    if backend == "sqlite":
+        return ":memory:" not in database_url and not database_url.endswith("://")
+    return backend == "postgresql"
+
+
+# プロセス間のキャッシュ無効化を行うか
+CACHE_BUS: bool = (
+    os.getenv("DEVLOG_CACHE_BUS", "true").lower() in ("1", "true", "yes", "on")
+    and _shared_database(SQLALCHEMY_DATABASE_URL)
+)
+
+# SQLiteで PRAGMA data_version を確認する間隔（秒）
+CACHE_BUS_INTERVAL: float = float(os.getenv("DEVLOG_CACHE_BUS_INTERVAL_MS", "20")) / 1000
+
+# SQLiteの cache_events テーブルにイベントを保持する期間（秒、CACHE_TTL 以上にすること）
+CACHE_BUS_RETENTION: float = float(os.getenv("DEVLOG_CACHE_BUS_RETENTION", "300"))
+
+# PostgreSQLの通知チャンネル
+CHANNEL = "devlog_cache"
+
+# 1つのモデルでこれを超える件数のIDを変更した場合は、モデル全体の無効化として伝える
+MAX_EVENT_IDS = 100
+
+# 取りこぼした場合にすべて無効化するモデル
+CACHED_MODELS = ("User", "Project", "Task", "Message")
+
+Changes = Dict[str, Optional[Set[Hashable]]]
+
+
+def create_listener_engine(database_url: str) -> Engine:
+    """
+    イベントを受け取る専用接続のエンジンを作成
+    
+    SQLiteでは自動コミットモードの読み取り専用接続にし、確認の合間に
+    読み取りトランザクション（スナップショット）を保持しないようにします。
+    """
+    if make_url(database_url).get_backend_name() != "sqlite":
+        return create_engine(database_url, poolclass=NullPool)
+    listener_engine = create_engine(
+        database_url,
+        connect_args={**connect_args, "isolation_level": None},
+        poolclass=NullPool,
+    )
+    configure_sqlite_engine(listener_engine, SQLITE_READER_PRAGMAS)
+    return listener_engine
+
+
+def _merge(changes: Changes, model_name: str, entity_id: Optional[Hashable]) -> None:
+    # モデル名ごとにIDをまとめる（Noneはモデル全体）
+    if entity_id is None or (model_name in changes and changes[model_name] is None):
+        changes[model_name] = None
+    else:
+        changes.setdefault(model_name, set()).add(entity_id)
+
+
+class InvalidationBus:
+    """
+    キャッシュ無効化イベントの発行と受信
+    
+    発行は、登録したエンジン（register()）にバインドされたセッションのコミット時に行います。
+    受信は start() で開始する専用スレッドで行います。
+    """
+    
+    def __init__(
+        self,
+        database_url: str,
+        origin: Optional[str] = None,
+        interval: float = CACHE_BUS_INTERVAL,
+        retention: float = CACHE_BUS_RETENTION
+    ) -> None:
+        self.database_url = database_url
+        self.backend = make_url(database_url).get_backend_name()
+        self.origin = origin or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"[-64:]
+        self.interval = interval
+        self.retention = retention
+        self._engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+        self._listener: Optional[Engine] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._last_id: Optional[int] = None
+        self._data_version: Optional[int] = None
+        self._last_prune = 0.0
+        self.published = 0
+        self.received = 0
+        self.full_flushes = 0
+        self.reconnects = 0
+        self.last_delay = 0.0
+        self.max_delay = 0.0
+    
+    def register(self, *engines: Engine) -> None:
+        """コミット時にイベントを発行するエンジンを登録"""
+        self._engines.update(engines)
+    
+    def publishes_for(self, session: Session) -> bool:
+        """セッションが登録したエンジン（またはその接続）にバインドされているか"""
+        try:
+            bind = session.get_bind()
+        except UnboundExecutionError:
+            return False
+        return getattr(bind, "engine", bind) in self._engines
+    
+    def publish(self, session: Session, changes: Changes) -> None:
+        """
+        無効化イベントをセッションのトランザクションで発行する
+        
+        Args:
+            session: コミットしようとしているセッション
+            changes: モデル名と、変更したIDの集合（Noneはそのモデルのすべて）の辞書
+        """
+        if self.backend == "postgresql":
+            for model_name, entity_ids in changes.items():
+                payload = {
+                    "origin": self.origin,
+                    "model": model_name,
+                    "ids": sorted(entity_ids) if entity_ids and len(entity_ids) <= MAX_EVENT_IDS else None,
+                    "generation": generations.model(model_name),
+                    "time": time.time(),
+                }
+                session.execute(select(func.pg_notify(CHANNEL, json.dumps(payload))))
+            with self._lock:
+                self.published += len(changes)
+            return
+        
+        now = datetime.now(timezone.utc)
+        rows = []
+        for model_name, entity_ids in changes.items():
+            generation = generations.model(model_name)
+            targets: Iterable[Optional[Hashable]] = (
+                sorted(entity_ids) if entity_ids and len(entity_ids) <= MAX_EVENT_IDS else [None]
+            )
+            rows.extend(
+                {"origin": self.origin, "model": model_name, "entity_id": entity_id,
+                 "generation": generation, "created_at": now}
+                for entity_id in targets
+            )
+        session.execute(insert(CacheEvent.__table__), rows)
+        with self._lock:
+            self.published += len(rows)
+            prune = time.monotonic() - self._last_prune >= self.retention / 2
+            if prune:
+                self._last_prune = time.monotonic()
+        
+        # 古いイベントの削除も、書き込みロックを取得済みのこのトランザクションで行う
+        if prune:
+            session.execute(
+                delete(CacheEvent.__table__).where(CacheEvent.created_at < now - timedelta(seconds=self.retention))
+            )
+    
+    def start(self) -> None:
+        """
+        イベントを受け取るスレッドを開始する
+        
+        SQLiteでは、開始時点の最後のイベントIDをここで記録し、これ以降にコミットされた
+        他のプロセスの書き込みを取りこぼさないようにします。
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._listener is None:
+                self._listener = create_listener_engine(self.database_url)
+            if self.backend != "postgresql" and self._last_id is None:
+                try:
+                    with self._listener.connect() as connection:
+                        self.poll(connection)
+                except Exception:
+                    # スレッドで接続し直したときに記録する
+                    logger.warning("Could not read the last cache invalidation event", exc_info=True)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="devlog-invalidation", daemon=True)
+            self._thread.start()
+    
+    def close(self) -> None:
+        """イベントを受け取るスレッドを止める"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        if thread is not None:
+            thread.join()
+        if self._listener is not None:
+            self._listener.dispose()
+            self._listener = None
+    
+    def poll(self, connection: Connection) -> int:
+        """
+        SQLiteの cache_events から、他のプロセスのイベントを読み込んで適用する
+        
+        最初の呼び出しでは、現在の最後のイベントIDを記録するだけです。
+        
+        Args:
+            connection: create_listener_engine() のエンジンの接続（呼び出しごとに同じ接続を使うこと）
+        
+        Returns:
+            適用した他のプロセスのイベントの件数
+        """
+        # data_version は、同じ接続で前回確認した後に他の接続がコミットした場合だけ変わる
+        version = connection.exec_driver_sql("PRAGMA data_version").scalar()
+        if self._last_id is None:
+            self._last_id = connection.execute(select(func.coalesce(func.max(CacheEvent.id), 0))).scalar()
+            self._data_version = version
+            return 0
+        if version == self._data_version:
+            return 0
+        self._data_version = version
+        
+        rows = connection.execute(
+            select(CacheEvent.id, CacheEvent.origin, CacheEvent.model, CacheEvent.entity_id, CacheEvent.created_at)
+            .where(CacheEvent.id > self._last_id)
+            .order_by(CacheEvent.id)
+        ).all()
+        if not rows:
+            return 0
+        
+        # IDは連番のため、途中が欠けていれば保持期間を過ぎて削除されたイベントを取りこぼしている
+        missed = rows[0].id != self._last_id + 1
+        self._last_id = rows[-1].id
+        if missed:
+            logger.warning("Cache invalidation events were pruned before being read, clearing all caches")
+            self.flush()
+            return 0
+        
+        changes: Changes = {}
+        oldest = None
+        for row in rows:
+            if row.origin == self.origin:
+                continue
+            _merge(changes, row.model, row.entity_id)
+            oldest = row.created_at if oldest is None else min(oldest, row.created_at)
+        if not changes:
+            return 0
+        
+        self.apply(changes)
+        # SQLiteのDateTimeはタイムゾーンなしのUTCで読み込まれる
+        self._record_delay(datetime.now(timezone.utc).replace(tzinfo=None) - oldest.replace(tzinfo=None))
+        received = sum(1 for row in rows if row.origin != self.origin)
+        self.received += received
+        return received
+    
+    def apply(self, changes: Changes) -> None:
+        """他のプロセスで変更されたエンティティのキャッシュを無効化する"""
+        # 世代番号より先にバッファを捨てる（先に世代番号が進むと、その間に描画された
+        # 古いバッファの内容が新しい世代番号でキャッシュされる）
+        if "Message" in changes:
+            # 他のプロセスで作成・更新されたメッセージの内容は分からないため、最新メッセージは読み直す
+            recent_messages.apply([("reset", None)])
+        for model_name, entity_ids in changes.items():
+            entity_cache.invalidate(model_name, entity_ids)
+            generations.bump(model_name, entity_ids)
+    
+    def flush(self) -> None:
+        """イベントを取りこぼした可能性がある場合に、すべてのキャッシュを捨てる"""
+        recent_messages.apply([("reset", None)])
+        entity_cache.clear()
+        for model_name in CACHED_MODELS:
+            generations.bump(model_name)
+        self.full_flushes += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """設定と発行・受信したイベントの件数、受信までの遅延などの統計情報を返す"""
+        return {
+            "enabled": True,
+            "backend": "notify" if self.backend == "postgresql" else "data_version",
+            "origin": self.origin,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval_ms": self.interval * 1000,
+            "retention_seconds": self.retention,
+            "published": self.published,
+            "received": self.received,
+            "full_flushes": self.full_flushes,
+            "reconnects": self.reconnects,
+            "last_delay_ms": round(self.last_delay * 1000, 3),
+            "max_delay_ms": round(self.max_delay * 1000, 3),
+        }
+    
+    def _record_delay(self, delay: timedelta) -> None:
+        self.last_delay = max(delay.total_seconds(), 0.0)
+        self.max_delay = max(self.max_delay, self.last_delay)
+    
+    def _run(self) -> None:
+        connected = False
+        while not self._stop.is_set():
+            try:
+                if connected:
+                    self.reconnects += 1
+                    # 切断中の通知は届かないため、取りこぼしている可能性がある
+                    # （SQLiteのイベントはテーブルに残っているため、続きから読み込める）
+                    if self.backend == "postgresql":
+                        self.flush()
+                connected = True
+                if self.backend == "postgresql":
+                    self._listen()
+                else:
+                    self._poll_forever()
+            except Exception:
+                logger.warning("Cache invalidation listener failed, reconnecting", exc_info=True)
+                self._stop.wait(1.0)
+    
+    def _poll_forever(self) -> None:
+        with self._listener.connect() as connection:
+            # data_version は接続ごとの値のため、接続し直したら比較しない
+            self._data_version = None
+            while not self._stop.is_set():
+                self.poll(connection)
+                self._stop.wait(self.interval)
+    
+    def _listen(self) -> None:
+        raw = self._listener.raw_connection()
+        try:
+            connection = raw.driver_connection
+            if not hasattr(connection, "notifies"):
+                raise RuntimeError("The cache invalidation bus on PostgreSQL requires the psycopg2 driver")
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            while not self._stop.is_set():
+                # 停止の要求に応じられるよう、一定時間ごとに待機を抜ける
+                if not select_module.select([connection], [], [], 0.5)[0]:
+                    continue
+                connection.poll()
+                changes: Changes = {}
+                sent = None
+                while connection.notifies:
+                    payload = json.loads(connection.notifies.pop(0).payload)
+                    if payload["origin"] == self.origin:
+                        continue
+                    for entity_id in payload["ids"] if payload["ids"] is not None else [None]:
+                        _merge(changes, payload["model"], entity_id)
+                    sent = payload["time"] if sent is None else min(sent, payload["time"])
+                    self.received += 1
+                if changes:
+                    self.apply(changes)
+                    self._record_delay(timedelta(seconds=time.time() - sent))
+        finally:
+            raw.close()
+
+
+# アプリケーション全体で共有するバス（CACHE_BUS が無効な場合はNone）
+invalidation_bus: Optional[InvalidationBus] = InvalidationBus(SQLALCHEMY_DATABASE_URL) if CACHE_BUS else None
+
+if invalidation_bus is not None:
+    invalidation_bus.register(engine, async_engine.sync_engine)
+    if writer is not None:
+        invalidation_bus.register(writer.engine)
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_before_commit(session: Session) -> None:
+    # 書き込みと同じトランザクションで発行し、コミットされた書き込みのイベントだけが届くようにする。
+    # before_commit はSAVEPOINTの解放でも発火するため、外側のコミットの時だけ発行する
+    if invalidation_bus is None or session.in_nested_transaction():
+        return
+    changes = pending_invalidations(session)
+    if changes and invalidation_bus.publishes_for(session):
+        invalidation_bus.publish(session, changes)
@@ -1,17 +1,38 @@
 """
 メッセージのCRUD操作
 """
+from datetime import datetime
 from typing import List, Optional, Union
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    Integer, Row, String, and_, case, cast, exists, func, literal, or_, select, union_all, update
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, aliased, joinedload, load_only
 
 from app.models.message import Message
 from app.models.user import User
+from app.models.read_cursor import ReadCursor
+from app.models.unread_counter import UnreadCounter
 from app.schemas.message import MessageCreate, DirectMessageCreate, MessageUpdate
+from app.schemas.read_cursor import ChannelType
+from app.crud.cache import invalidate
+from app.crud.dialect import dialect_name
+from app.crud.pagination import decode_id_cursor
+from app.crud.projection import apply_fields, column_names, validate_fields
+from app.crud.read import message_conditions
+from app.crud.read_cursor import advance_read_cursor
+from app.crud.session import commit_new, insert_many_returning, insert_returning, update_returning
+from app.crud import recent, unread_counter
 
 
-def get_message(db: Session, message_id: int) -> Optional[Message]:
-    """IDによるメッセージの取得"""
-    return db.query(Message).filter(Message.id == message_id, Message.is_deleted == False).first()
+def get_message(db: Session, message_id: int, fields: Optional[List[str]] = None) -> Optional[Message]:
+    """
+    IDによるメッセージの取得
+    
+    fieldsを指定した場合は、その列（とID）だけを読み込みます。
+    """
+    query = db.query(Message).filter(Message.id == message_id, Message.is_deleted == False)
+    return apply_fields(query, Message, fields).first()
 
 
 def get_messages(
@@ -24,33 +45,31 @@ def get_messages(
     recipient_id: Optional[int] = None,
     message_type: Optional[str] = None,
     parent_id: Optional[int] = None,
-    include_deleted: bool = False
+    include_deleted: bool = False,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
 ) -> List[Message]:
-    """メッセージリストの取得"""
-    query = db.query(Message)
-    
-    if not include_deleted:
-        query = query.filter(Message.is_deleted == False)
-    
-    if project_id is not None:
-        query = query.filter(Message.project_id == project_id)
-    
-    if task_id is not None:
-        query = query.filter(Message.task_id == task_id)
-    
-    if user_id is not None:
-        query = query.filter(Message.user_id == user_id)
-    
-    if recipient_id is not None:
-        query = query.filter(Message.recipient_id == recipient_id)
-    
-    if message_type is not None:
-        query = query.filter(Message.message_type == message_type)
+    """
+    メッセージリストの取得
     
-    if parent_id is not None:
-        query = query.filter(Message.parent_id == parent_id)
+    新しい順（created_at, id の降順）に返します。
+    cursorを指定した場合は、そのカーソルが指す行より古いメッセージを返します。
+    fieldsを指定した場合は、その列とID・作成日時（カーソル用）だけを読み込みます。
+    """
+    query = apply_fields(db.query(Message), Message, fields, "created_at").filter(*message_conditions(
+        project_id=project_id,
+        task_id=task_id,
+        user_id=user_id,
+        recipient_id=recipient_id,
+        message_type=message_type,
+        parent_id=parent_id,
+        include_deleted=include_deleted,
+        cursor=cursor
+    ))
     
-    return query.order_by(Message.created_at.desc()).offset(skip).limit(limit).all()
+    return query.order_by(
+        Message.created_at.desc(), Message.id.desc()
+    ).offset(skip).limit(limit).all()
 
 
 def get_direct_messages(
@@ -58,17 +77,33 @@ def get_direct_messages(
     user_id: int,
     other_user_id: int,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    fields: Optional[List[str]] = None
 ) -> List[Message]:
-    """2ユーザー間のダイレクトメッセージを取得"""
-    return db.query(Message).filter(
-        Message.is_deleted == False,
-        Message.message_type == "direct_message",
-        (
-            (Message.user_id == user_id) & (Message.recipient_id == other_user_id) |
-            (Message.user_id == other_user_id) & (Message.recipient_id == user_id)
+    """
+    2ユーザー間のダイレクトメッセージを取得
+    
+    fieldsを指定した場合は、その列（とID）だけを読み込みます。
+    """
+    names = column_names(Message) if fields is None else validate_fields(Message, [*fields, "created_at"])
+    columns = [getattr(Message, name) for name in names]
+    
+    # 送信方向ごとのクエリをUNION ALLで結合し、
+    # 双方で (user_id, recipient_id, created_at) インデックスを使用する。
+    # UNIONの内側でも必要な列だけをSELECTする
+    def direction(sender_id: int, receiver_id: int):
+        return select(*columns).where(
+            Message.is_deleted == False,
+            Message.message_type == "direct_message",
+            Message.user_id == sender_id,
+            Message.recipient_id == receiver_id
         )
-    ).order_by(Message.created_at.desc()).offset(skip).limit(limit).all()
+    
+    dms = aliased(Message, union_all(direction(user_id, other_user_id), direction(other_user_id, user_id)).subquery())
+    query = db.query(dms)
+    if fields is not None:
+        query = query.options(load_only(*(getattr(dms, name) for name in names), raiseload=True))
+    return query.order_by(dms.created_at.desc()).offset(skip).limit(limit).all()
 
 
 def get_thread_messages(
@@ -84,6 +119,145 @@ def get_thread_messages(
     ).order_by(Message.created_at.asc()).offset(skip).limit(limit).all()
 
 
+def _thread_path_segment(db: Session, message_id):
+    """スレッドのパス順ソート用に、メッセージIDをゼロ埋めした文字列にする"""
+    if dialect_name(db) == "sqlite":
+        return func.printf("%010d", message_id)
+    return func.lpad(cast(message_id, String), 10, "0")
+
+
+def get_thread_tree(
+    db: Session,
+    root_id: int,
+    max_depth: int = 10,
+    limit: int = 500
+) -> List[Row]:
+    """
+    スレッド全体を再帰CTEの1クエリで取得
+    
+    ルートメッセージからmax_depth階層までの返信を、深さ優先のパス順
+    （同じ親の返信は投稿順）で返します。論理削除されたメッセージも
+    ツリー構造を保つために含まれます。
+    
+    Returns:
+        (Message, depth, path) の行のリスト。pathは "0000000001/0000000005" 形式
+    """
+    reply = aliased(Message)
+    
+    tree = select(
+        Message.id.label("id"),
+        literal(0, Integer).label("depth"),
+        _thread_path_segment(db, Message.id).label("path"),
+    ).where(Message.id == root_id).cte("thread_tree", recursive=True)
+    
+    tree = tree.union_all(
+        select(
+            reply.id,
+            tree.c.depth + 1,
+            tree.c.path + "/" + _thread_path_segment(db, reply.id),
+        ).where(
+            reply.parent_id == tree.c.id,
+            tree.c.depth < max_depth,
+        )
+    )
+    
+    stmt = (
+        select(Message, tree.c.depth, tree.c.path)
+        .join(tree, Message.id == tree.c.id)
+        .order_by(tree.c.path)
+        .limit(limit)
+    )
+    return db.execute(stmt).all()
+
+
+def get_conversations(
+    db: Session,
+    user_id: int,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> List[Row]:
+    """
+    ユーザーの会話一覧（受信箱）を取得
+    
+    DM相手ごと、および参加しているプロジェクト / タスクのチャンネルごとに
+    最新のメッセージと未読数を、最新メッセージの新しい順に返します。
+    チャンネルごとの最新行は ROW_NUMBER() OVER (PARTITION BY ...) の1クエリで求めます。
+    
+    Returns:
+        (Message, channel_type, channel_id, unread_count) の行のリスト
+    """
+    channel_type = case(
+        (Message.recipient_id.is_not(None), ChannelType.DM.value),
+        (Message.task_id.is_not(None), ChannelType.TASK.value),
+        else_=ChannelType.PROJECT.value,
+    )
+    channel_id = case(
+        (
+            Message.recipient_id.is_not(None),
+            case((Message.user_id == user_id, Message.recipient_id), else_=Message.user_id),
+        ),
+        (Message.task_id.is_not(None), Message.task_id),
+        else_=Message.project_id,
+    )
+    
+    def joined_channels(kind: str):
+        return select(ReadCursor.channel_id).where(
+            ReadCursor.user_id == user_id,
+            ReadCursor.channel_type == kind,
+        )
+    
+    ranked = select(
+        Message.id.label("id"),
+        channel_type.label("channel_type"),
+        channel_id.label("channel_id"),
+        func.row_number().over(
+            partition_by=(channel_type, channel_id),
+            order_by=Message.id.desc(),
+        ).label("rn"),
+    ).where(
+        Message.is_deleted == False,
+        or_(
+            # 送受信したDM
+            and_(Message.user_id == user_id, Message.recipient_id.is_not(None)),
+            Message.recipient_id == user_id,
+            # 参加しているタスク / プロジェクトのチャンネル
+            and_(
+                Message.recipient_id.is_(None),
+                Message.task_id.in_(joined_channels(ChannelType.TASK.value)),
+            ),
+            and_(
+                Message.recipient_id.is_(None),
+                Message.task_id.is_(None),
+                Message.project_id.in_(joined_channels(ChannelType.PROJECT.value)),
+            ),
+        ),
+    ).subquery("ranked")
+    
+    stmt = (
+        select(
+            Message,
+            ranked.c.channel_type,
+            ranked.c.channel_id,
+            func.coalesce(UnreadCounter.unread_count, 0).label("unread_count"),
+        )
+        .join(ranked, Message.id == ranked.c.id)
+        .outerjoin(
+            UnreadCounter,
+            and_(
+                UnreadCounter.user_id == user_id,
+                UnreadCounter.channel_type == ranked.c.channel_type,
+                UnreadCounter.channel_id == ranked.c.channel_id,
+            ),
+        )
+        .where(ranked.c.rn == 1)
+    )
+    
+    if cursor:
+        stmt = stmt.where(Message.id < decode_id_cursor(cursor))
+    
+    return db.execute(stmt.order_by(Message.id.desc()).limit(limit)).all()
+
+
 def get_unread_messages(
     db: Session,
     user_id: int,
@@ -102,55 +276,298 @@ def get_unread_messages(
     return query.order_by(Message.created_at.desc()).all()
 
 
+def _other_replies_by_author(reply: Message):
+    """同じ親に対する、同じ投稿者の他の（削除されていない）返信が存在するかの条件式"""
+    other = aliased(Message)
+    return exists().where(
+        other.parent_id == reply.parent_id,
+        other.user_id == reply.user_id,
+        other.id != reply.id,
+        other.is_deleted == False,
+    )
+
+
+def _record_reply_created(db: Session, reply: Message) -> None:
+    """返信の作成時に親メッセージのスレッド集計値を1回のUPDATEで更新"""
+    if reply.parent_id is None:
+        return
+    db.execute(
+        update(Message)
+        .where(Message.id == reply.parent_id)
+        .values(
+            reply_count=Message.reply_count + 1,
+            last_reply_at=reply.created_at,
+            last_reply_id=reply.id,
+            participant_count=Message.participant_count + case(
+                (_other_replies_by_author(reply), 0), else_=1
+            ),
+            # 返信は親メッセージの編集ではないため updated_at は変えない
+            updated_at=Message.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _record_reply_deleted(db: Session, reply: Message) -> None:
+    """返信の論理削除時に親メッセージのスレッド集計値を1回のUPDATEで更新"""
+    if reply.parent_id is None:
+        return
+    sibling = aliased(Message)
+    latest_id = (
+        select(func.max(sibling.id))
+        .where(
+            sibling.parent_id == reply.parent_id,
+            sibling.id != reply.id,
+            sibling.is_deleted == False,
+        )
+        .scalar_subquery()
+    )
+    latest = aliased(Message)
+    db.execute(
+        update(Message)
+        .where(Message.id == reply.parent_id)
+        .values(
+            reply_count=case((Message.reply_count > 0, Message.reply_count - 1), else_=0),
+            last_reply_id=latest_id,
+            last_reply_at=select(latest.created_at).where(latest.id == latest_id).scalar_subquery(),
+            participant_count=Message.participant_count - case(
+                (_other_replies_by_author(reply), 0),
+                (Message.participant_count > 0, 1),
+                else_=0,
+            ),
+            updated_at=Message.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _record_reply_restored(db: Session, reply: Message) -> None:
+    """返信の論理削除の取り消し時に親メッセージのスレッド集計値を1回のUPDATEで更新"""
+    if reply.parent_id is None:
+        return
+    sibling = aliased(Message)
+    latest_id = (
+        select(func.max(sibling.id))
+        .where(
+            sibling.parent_id == reply.parent_id,
+            or_(sibling.id == reply.id, sibling.is_deleted == False),
+        )
+        .scalar_subquery()
+    )
+    latest = aliased(Message)
+    db.execute(
+        update(Message)
+        .where(Message.id == reply.parent_id)
+        .values(
+            reply_count=Message.reply_count + 1,
+            last_reply_id=latest_id,
+            last_reply_at=select(latest.created_at).where(latest.id == latest_id).scalar_subquery(),
+            participant_count=Message.participant_count + case(
+                (_other_replies_by_author(reply), 0), else_=1
+            ),
+            updated_at=Message.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
 def create_message(db: Session, message: MessageCreate) -> Message:
     """メッセージの作成"""
-    db_message = Message(**message.model_dump())
-    db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
+    db_message = insert_returning(db, Message, message.model_dump())
+    unread_counter.record_message_created(db, db_message)
+    _record_reply_created(db, db_message)
+    invalidate(db, Message, db_message.id)
+    recent.record_created(db, db_message)
+    commit_new(db, db_message)
     return db_message
 
 
+def create_messages_bulk(
+    db: Session,
+    messages: List[MessageCreate],
+    atomic: bool = False
+) -> List[Union[Message, DBAPIError]]:
+    """
+    メッセージの一括作成（1トランザクション）
+    
+    INSERT ... RETURNING をexecutemanyでまとめて実行し、未読カウンターと
+    スレッド集計値の更新もまとめてから1回だけコミットします。
+    一括INSERTが失敗した場合、atomic が偽なら1件ずつSAVEPOINTの中で作成し直し、
+    失敗した項目だけを例外として返します。atomic が真なら何も作成せずに例外を送出します。
+    
+    Args:
+        messages: 作成するメッセージ
+        atomic: 1件でも失敗したら全件を作成しない
+    
+    Returns:
+        入力と同じ順序の、作成したメッセージまたは失敗の原因となった例外のリスト
+    
+    Raises:
+        DBAPIError: atomic が真で、いずれかのメッセージを作成できなかった場合
+    """
+    rows = [message.model_dump() for message in messages]
+    try:
+        results: List[Union[Message, DBAPIError]] = list(insert_many_returning(db, Message, rows))
+    except DBAPIError:
+        db.rollback()
+        if atomic:
+            raise
+        results = []
+        for values in rows:
+            try:
+                with db.begin_nested():
+                    results.append(insert_returning(db, Message, values))
+            except DBAPIError as e:
+                results.append(e)
+    
+    created = [result for result in results if isinstance(result, Message)]
+    unread_counter.record_messages_created(db, created)
+    for db_message in created:
+        _record_reply_created(db, db_message)
+    if created:
+        invalidate(db, Message, *(db_message.id for db_message in created))
+    recent.record_created(db, *created)
+    commit_new(db, *created)
+    return results
+
+
 def create_direct_message(db: Session, dm: DirectMessageCreate) -> Message:
     """ダイレクトメッセージの作成"""
-    db_message = Message(
-        content=dm.content,
-        message_type="direct_message",
-        user_id=dm.user_id,
-        recipient_id=dm.recipient_id,
-        parent_id=dm.parent_id,
-        project_id=None,
-        task_id=None
-    )
-    db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
+    db_message = insert_returning(db, Message, {
+        "content": dm.content,
+        "message_type": "direct_message",
+        "user_id": dm.user_id,
+        "recipient_id": dm.recipient_id,
+        "parent_id": dm.parent_id,
+        "project_id": None,
+        "task_id": None
+    })
+    unread_counter.record_message_created(db, db_message)
+    _record_reply_created(db, db_message)
+    invalidate(db, Message, db_message.id)
+    recent.record_created(db, db_message)
+    commit_new(db, db_message)
     return db_message
 
 
-def update_message(db: Session, message_id: int, message_update: MessageUpdate) -> Optional[Message]:
-    """メッセージの更新"""
+def update_message(
+    db: Session,
+    message_id: int,
+    message_update: MessageUpdate,
+    expected_updated_at: Optional[datetime] = None
+) -> Optional[Message]:
+    """
+    メッセージの更新（UPDATE ... RETURNING）
+    
+    is_read / is_deleted を変更する場合は mark_as_read / mark_as_deleted と同じく
+    未読カウンターと親メッセージのスレッド集計値も更新します（未読に戻す・削除の取り消しでは
+    それぞれを戻します）。これらの更新とメッセージのUPDATEは1つのSAVEPOINTで行い、
+    expected_updated_at が一致しない場合はすべて取り消します。
+    
+    Args:
+        expected_updated_at: 指定した場合、updated_at が一致するときだけ更新する
+    
+    Returns:
+        更新後のメッセージ（存在しない場合はNone）
+    
+    Raises:
+        StaleDataError: expected_updated_at が現在の値と一致しない場合
+    """
+    values = message_update.model_dump(exclude_unset=True)
+    previous = db.query(Message).filter(Message.id == message_id).first()
+    if previous is None:
+        return None
+    
+    deleted = values.get("is_deleted")
+    deleted_changed = deleted is not None and deleted != previous.is_deleted
+    with db.begin_nested():
+        unread_counter.record_message_flags_changed(
+            db,
+            previous,
+            is_read=previous.is_read if values.get("is_read") is None else values["is_read"],
+            is_deleted=previous.is_deleted if deleted is None else deleted,
+        )
+        if deleted_changed:
+            if deleted:
+                _record_reply_deleted(db, previous)
+            else:
+                _record_reply_restored(db, previous)
+        db_message = update_returning(db, Message, message_id, values, expected_updated_at)
+    if db_message is None:
+        return None
+    
+    invalidate(db, Message, message_id)
+    if deleted_changed and deleted:
+        recent.record_deleted(db, message_id)
+    else:
+        recent.record_updated(db, db_message)
+    commit_new(db, db_message)
+    return db_message
+
+
+def mark_as_read(db: Session, message_id: int) -> Optional[Message]:
+    """メッセージを既読にする（未読カウンターも同じトランザクションで減算）"""
     db_message = db.query(Message).filter(Message.id == message_id).first()
     if not db_message:
         return None
     
-    update_data = message_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_message, field, value)
+    if not db_message.is_read:
+        unread_counter.record_message_read(db, db_message)
+        db_message.is_read = True
     
     db.commit()
     db.refresh(db_message)
     return db_message
 
 
-def mark_as_read(db: Session, message_id: int) -> Optional[Message]:
-    """メッセージを既読にする"""
-    return update_message(db, message_id, MessageUpdate(is_read=True))
+def mark_messages_as_read(db: Session, message_ids: List[int]) -> int:
+    """
+    複数のメッセージを1回のUPDATEで既読にする
+    
+    UPDATE ... WHERE id IN (...) RETURNING で未読だった行だけを更新し、
+    返された送信者・受信者から未読カウンターをまとめて減算します。
+    存在しないIDや既読のメッセージは無視されます。
+    
+    Returns:
+        既読にしたメッセージ数
+    """
+    if not message_ids:
+        return 0
+    
+    condition = and_(Message.id.in_(set(message_ids)), Message.is_read == False)
+    stmt = (
+        update(Message)
+        .where(condition)
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.update_returning:
+        rows = db.execute(stmt.returning(Message.user_id, Message.recipient_id, Message.is_deleted)).all()
+    else:
+        rows = db.execute(select(Message.user_id, Message.recipient_id, Message.is_deleted).where(condition)).all()
+        db.execute(stmt)
+    
+    unread_counter.record_messages_read(db, rows)
+    db.commit()
+    return len(rows)
 
 
 def mark_as_deleted(db: Session, message_id: int) -> Optional[Message]:
-    """メッセージを論理削除する"""
-    return update_message(db, message_id, MessageUpdate(is_deleted=True))
+    """メッセージを論理削除する（未読カウンターも同じトランザクションで減算）"""
+    db_message = db.query(Message).filter(Message.id == message_id).first()
+    if not db_message:
+        return None
+    
+    if not db_message.is_deleted:
+        unread_counter.record_message_deleted(db, db_message)
+        _record_reply_deleted(db, db_message)
+        db_message.is_deleted = True
+        invalidate(db, Message, message_id)
+        recent.record_deleted(db, message_id)
+    
+    db.commit()
+    db.refresh(db_message)
+    return db_message
 
 
 def mark_conversation_as_read(db: Session, user_id: int, other_user_id: int) -> int:
@@ -162,5 +579,9 @@ def mark_conversation_as_read(db: Session, user_id: int, other_user_id: int) ->
         Message.is_deleted == False
     ).update({Message.is_read: True})
     
+    # DMチャンネルの既読カーソルも最新メッセージまで進める
+    advance_read_cursor(db, user_id, ChannelType.DM.value, other_user_id)
+    unread_counter.reset_counter(db, user_id, ChannelType.DM.value, other_user_id)
+    
     db.commit()
     return count 
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+キーセット（カーソル）ページネーション
+
+ページの末尾行のソートキーを不透明な文字列（カーソル）にエンコードし、
+次ページの取得を OFFSET ではなくインデックスの範囲検索で行えるようにする。
+"""
+import base64
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+
+def encode_cursor(*values: Any) -> str:
+    """ソートキーの値をカーソル文字列にエンコード"""
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    カーソル文字列をソートキーの値のリストにデコード
+    
+    Raises:
+        ValueError: カーソルの形式が不正な場合
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """id のみをキーとするカーソルをデコード"""
+    values = decode_cursor(cursor)
+    if len(values) != 1 or not isinstance(values[0], int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values[0]
+
+
+def decode_created_at_cursor(cursor: str) -> tuple:
+    """(created_at, id) をキーとするカーソルをデコード"""
+    values = decode_cursor(cursor)
+    if len(values) != 2 or not isinstance(values[1], int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    try:
+        created_at = datetime.fromisoformat(values[0])
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return created_at, values[1]
+
+
+def decode_score_cursor(cursor: str) -> tuple:
+    """(score, id) をキーとするカーソルをデコード（検索結果用）"""
+    values = decode_cursor(cursor)
+    if (
+        len(values) != 2
+        or not isinstance(values[0], (int, float))
+        or not isinstance(values[1], int)
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return float(values[0]), values[1]
+
+
+def next_id_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """id 順のページから次ページのカーソルを生成（最終ページなら None）"""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(items[-1].id)
+
+
+def next_created_at_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """
+    (created_at, id) 順のページから次ページのカーソルを生成（最終ページなら None）
+    
+    ページの各要素はORMインスタンスと、crud.read が返す RowMapping のどちらでもよい。
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, Mapping):
+        return encode_cursor(last["created_at"], last["id"])
+    return encode_cursor(last.created_at, last.id)
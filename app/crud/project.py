@@ -1,65 +1,123 @@
 """
 プロジェクトのCRUD操作
 """
+from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
 from app.models.project import Project
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.crud import recent
+from app.crud.cache import cached_get, invalidate
+from app.crud.pagination import decode_id_cursor
+from app.crud.projection import apply_fields
+from app.crud.session import commit_new, insert_returning, update_returning
 
 
-def get_project(db: Session, project_id: int) -> Optional[Project]:
-    """IDによるプロジェクトの取得"""
-    return db.query(Project).filter(Project.id == project_id).first()
+def get_project(db: Session, project_id: int, fields: Optional[List[str]] = None) -> Optional[Project]:
+    """
+    IDによるプロジェクトの取得
+    
+    キャッシュ（app.crud.cache）にある場合はDBに問い合わせません。
+    fieldsを指定した場合は、その列（とID）だけを読み込みます。
+    """
+    return cached_get(
+        db, Project, "id", project_id,
+        lambda: apply_fields(db.query(Project), Project, fields).filter(Project.id == project_id).first(),
+        partial=fields is not None
+    )
 
 
-def get_projects(db: Session, skip: int = 0, limit: int = 100) -> List[Project]:
-    """プロジェクトリストの取得"""
-    return db.query(Project).offset(skip).limit(limit).all()
+def get_projects(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> List[Project]:
+    """
+    プロジェクトリストの取得
+    
+    ID順に返します。cursorを指定した場合は、そのカーソルが指すプロジェクトの次から返します。
+    fieldsを指定した場合は、その列（とID）だけを読み込みます。
+    """
+    query = apply_fields(db.query(Project), Project, fields)
+    
+    if cursor:
+        query = query.filter(Project.id > decode_id_cursor(cursor))
+    
+    return query.order_by(Project.id).offset(skip).limit(limit).all()
 
 
 def create_project(db: Session, project: ProjectCreate) -> Project:
-    """プロジェクトの作成"""
-    db_project = Project(**project.model_dump())
-    db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    """プロジェクトの作成（INSERT ... RETURNING の1往復）"""
+    db_project = insert_returning(db, Project, project.model_dump())
+    invalidate(db, Project, db_project.id)
+    commit_new(db, db_project)
     return db_project
 
 
 def update_project(
-    db: Session, project_id: int, project: ProjectUpdate
+    db: Session,
+    project_id: int,
+    project: ProjectUpdate,
+    expected_updated_at: Optional[datetime] = None
 ) -> Optional[Project]:
-    """プロジェクトの更新"""
-    db_project = get_project(db, project_id=project_id)
-    if db_project is None:
-        return None
+    """
+    プロジェクトの更新（UPDATE ... RETURNING の1往復）
     
-    update_data = project.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_project, field, value)
+    Args:
+        expected_updated_at: 指定した場合、updated_at が一致するときだけ更新する
     
-    db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    Returns:
+        更新後のプロジェクト（存在しない場合はNone）
+    
+    Raises:
+        StaleDataError: expected_updated_at が現在の値と一致しない場合
+    """
+    db_project = update_returning(
+        db, Project, project_id, project.model_dump(exclude_unset=True), expected_updated_at
+    )
+    if db_project is None:
+        return None
+    invalidate(db, Project, project_id)
+    commit_new(db, db_project)
     return db_project
 
 
 def delete_project(db: Session, project_id: int) -> bool:
-    """プロジェクトの削除"""
-    db_project = get_project(db, project_id=project_id)
-    if db_project is None:
-        return False
+    """
+    プロジェクトの削除（存在確認のSELECTを行わず、削除件数で判定）
     
-    # 関連するタスクを削除
+    関連するタスクの削除とメッセージの変更はSAVEPOINTの中で行い、プロジェクトが
+    存在しなかった場合はそれだけを取り消します（呼び出し元の未コミットの変更は残します）。
+    """
     from app.models.task import Task
-    db.query(Task).filter(Task.project_id == project_id).delete()
+    from app.models.message import Message
+    
+    savepoint = db.begin_nested()
+    # 関連するタスクを削除
+    db.query(Task).filter(Task.project_id == project_id).delete(synchronize_session=False)
     
     # 関連するメッセージのproject_idをNullに設定
-    from app.models.message import Message
-    db.query(Message).filter(Message.project_id == project_id).update({"project_id": None})
+    db.query(Message).filter(Message.project_id == project_id).update(
+        {"project_id": None}, synchronize_session=False
+    )
     
     # プロジェクトを削除
-    db.delete(db_project)
+    result = db.execute(
+        delete(Project).where(Project.id == project_id),
+        execution_options={"synchronize_session": False},
+    )
+    if result.rowcount == 0:
+        savepoint.rollback()
+        return False
+    savepoint.commit()
+    # 関連するタスクも削除され、メッセージも変更されるため、まとめて無効化
+    invalidate(db, Project, project_id)
+    invalidate(db, Task)
+    invalidate(db, Message)
+    recent.record_reset(db)
     db.commit()
     return True 
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+取得する列の絞り込み（フィールド射影）
+
+一覧・取得系の関数で、呼び出し側が必要とする列だけをSELECTするためのヘルパーです。
+指定されなかった列は読み込まれず、アクセスすると例外になるため、
+誤って追加のSELECTが発生することもありません。
+"""
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy.orm import load_only
+
+
+def column_names(model: Any) -> List[str]:
+    """モデルの列名を定義順に取得"""
+    return [attribute.key for attribute in model.__mapper__.column_attrs]
+
+
+def validate_fields(model: Any, fields: Sequence[str]) -> List[str]:
+    """
+    列名のリストを検証し、重複を除いてIDを先頭に含めたリストを返す
+    
+    Raises:
+        ValueError: モデルに存在しない列名が含まれる場合
+    """
+    names = column_names(model)
+    unknown = [field for field in fields if field not in names]
+    if unknown:
+        raise ValueError(f"Unknown fields for {model.__name__}: {', '.join(unknown)} (available: {', '.join(names)})")
+    return list(dict.fromkeys(["id", *fields]))
+
+
+def load_fields(model: Any, fields: Optional[Sequence[str]], *required: str):
+    """
+    指定した列だけを読み込むローダーオプションを作成
+    
+    Args:
+        model: モデルクラス
+        fields: 読み込む列名（Noneの場合は全列）
+        *required: 並び順やページングのために常に読み込む列名
+    
+    Returns:
+        Query.options() に渡すオプション（fields がNoneの場合はNone）
+    
+    Raises:
+        ValueError: モデルに存在しない列名が含まれる場合
+    """
+    if fields is None:
+        return None
+    names = validate_fields(model, [*fields, *required])
+    return load_only(*(getattr(model, name) for name in names), raiseload=True)
+
+
+def apply_fields(query, model: Any, fields: Optional[Sequence[str]], *required: str):
+    """fields が指定された場合だけ、クエリに列の絞り込みを適用する"""
+    option = load_fields(model, fields, *required)
+    return query if option is None else query.options(option)
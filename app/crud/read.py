@@ -0,0 +1,125 @@
+"""
+ORMを経由しない読み取り専用の一覧取得
+
+大量の行を返す一覧ツールやリソース向けに、Coreの select(...).mappings() で
+行を取得します。ORMインスタンスの構築、アイデンティティマップへの登録、
+属性の変更追跡を行わないため、行数が多いほどCPU時間とメモリを節約できます。
+
+返す行は読み取り専用の RowMapping です。更新が必要な場合は crud.message などの
+ORMを使う関数で取得してください。
+"""
+from typing import List, Optional
+
+from sqlalchemy import RowMapping, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.message import Message
+from app.models.user import User
+from app.crud.pagination import decode_created_at_cursor
+from app.crud.projection import column_names, validate_fields
+
+
+def message_conditions(
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    recipient_id: Optional[int] = None,
+    message_type: Optional[str] = None,
+    parent_id: Optional[int] = None,
+    include_deleted: bool = False,
+    cursor: Optional[str] = None
+) -> list:
+    """
+    メッセージ一覧の絞り込み条件を作成
+    
+    ORMのクエリ（crud.message.get_messages）とCoreのクエリで共通に使います。
+    
+    Raises:
+        ValueError: カーソルの形式が不正な場合
+    """
+    conditions = []
+    
+    if not include_deleted:
+        conditions.append(Message.is_deleted == False)
+    
+    if project_id is not None:
+        conditions.append(Message.project_id == project_id)
+    
+    if task_id is not None:
+        conditions.append(Message.task_id == task_id)
+    
+    if user_id is not None:
+        conditions.append(Message.user_id == user_id)
+    
+    if recipient_id is not None:
+        conditions.append(Message.recipient_id == recipient_id)
+    
+    if message_type is not None:
+        conditions.append(Message.message_type == message_type)
+    
+    if parent_id is not None:
+        conditions.append(Message.parent_id == parent_id)
+    
+    if cursor:
+        created_at, message_id = decode_created_at_cursor(cursor)
+        conditions.append(tuple_(Message.created_at, Message.id) < tuple_(created_at, message_id))
+    
+    return conditions
+
+
+def select_messages(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    recipient_id: Optional[int] = None,
+    message_type: Optional[str] = None,
+    parent_id: Optional[int] = None,
+    include_deleted: bool = False,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> List[RowMapping]:
+    """
+    メッセージ一覧を行（RowMapping）として取得
+    
+    crud.message.get_messages と同じ条件・順序（created_at, id の降順）で、
+    ORMインスタンスを作らずに返します。
+    fieldsを指定した場合は、その列とID・作成日時（カーソル用）だけをSELECTします。
+    
+    Raises:
+        ValueError: 存在しない列名やカーソルの形式が不正な場合
+    """
+    names = column_names(Message) if fields is None else validate_fields(Message, [*fields, "created_at"])
+    statement = (
+        select(*(getattr(Message, name) for name in names))
+        .where(*message_conditions(
+            project_id=project_id,
+            task_id=task_id,
+            user_id=user_id,
+            recipient_id=recipient_id,
+            message_type=message_type,
+            parent_id=parent_id,
+            include_deleted=include_deleted,
+            cursor=cursor
+        ))
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return db.execute(statement).mappings().all()
+
+
+def select_users_by_id(db: Session, user_ids: List[int], fields: List[str]) -> dict:
+    """
+    複数ユーザーを1回のSELECTで取得し、IDをキーにした辞書で返す
+    
+    Raises:
+        ValueError: 存在しない列名が含まれる場合
+    """
+    if not user_ids:
+        return {}
+    names = validate_fields(User, fields)
+    statement = select(*(getattr(User, name) for name in names)).where(User.id.in_(set(user_ids)))
+    return {row["id"]: row for row in db.execute(statement).mappings()}
@@ -0,0 +1,236 @@
+"""
+既読カーソルのCRUD操作
+
+チャンネル（プロジェクト・タスク・DM相手）ごとに最後に読んだメッセージIDを保持し、
+「未読」をそのIDより大きいメッセージとして扱います。
+"""
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.message import Message
+from app.models.read_cursor import ReadCursor
+from app.schemas.read_cursor import ChannelType
+from app.crud.dialect import greatest, upsert
+from app.crud.session import commit_new
+
+
+def resolve_channel(
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    peer_id: Optional[int] = None
+) -> Tuple[str, int]:
+    """
+    プロジェクトID・タスクID・DM相手のいずれか1つからチャンネルを決定
+    
+    Raises:
+        ValueError: 指定が1つでない場合
+    """
+    given = [
+        (channel_type, channel_id)
+        for channel_type, channel_id in (
+            (ChannelType.PROJECT.value, project_id),
+            (ChannelType.TASK.value, task_id),
+            (ChannelType.DM.value, peer_id),
+        )
+        if channel_id is not None
+    ]
+    if len(given) != 1:
+        raise ValueError("Exactly one of project_id, task_id or peer_id is required")
+    return given[0]
+
+
+def message_channel(message: Message, user_id: int) -> Optional[Tuple[str, int]]:
+    """
+    指定ユーザーから見たメッセージの所属チャンネルを取得
+    
+    DM > タスク > プロジェクト の優先順で判定します。
+    """
+    if message.recipient_id is not None:
+        peer_id = message.recipient_id if message.user_id == user_id else message.user_id
+        return ChannelType.DM.value, peer_id
+    if message.task_id is not None:
+        return ChannelType.TASK.value, message.task_id
+    if message.project_id is not None:
+        return ChannelType.PROJECT.value, message.project_id
+    return None
+
+
+def channel_condition(channel_type: str, channel_id: int, user_id: int):
+    """指定ユーザーから見たチャンネルに属するメッセージの条件式"""
+    if channel_type == ChannelType.DM.value:
+        return or_(
+            and_(Message.user_id == channel_id, Message.recipient_id == user_id),
+            and_(Message.user_id == user_id, Message.recipient_id == channel_id),
+        )
+    if channel_type == ChannelType.TASK.value:
+        return and_(Message.task_id == channel_id, Message.recipient_id.is_(None))
+    if channel_type == ChannelType.PROJECT.value:
+        return and_(
+            Message.project_id == channel_id,
+            Message.task_id.is_(None),
+            Message.recipient_id.is_(None),
+        )
+    raise ValueError(f"Invalid channel type: {channel_type}")
+
+
+def last_read_position(user_id: int, channel_type: str, channel_id: int):
+    """既読カーソルの位置を返すスカラーサブクエリ（カーソルがなければ0）"""
+    return func.coalesce(
+        select(ReadCursor.last_read_message_id)
+        .where(
+            ReadCursor.user_id == user_id,
+            ReadCursor.channel_type == channel_type,
+            ReadCursor.channel_id == channel_id,
+        )
+        .scalar_subquery(),
+        0,
+    )
+
+
+def get_read_cursor(
+    db: Session, user_id: int, channel_type: str, channel_id: int
+) -> Optional[ReadCursor]:
+    """既読カーソルの取得"""
+    return db.get(ReadCursor, (user_id, channel_type, channel_id))
+
+
+def get_read_cursors(db: Session, user_id: int) -> List[ReadCursor]:
+    """ユーザーの全チャンネルの既読カーソルを取得"""
+    return db.query(ReadCursor).filter(ReadCursor.user_id == user_id).all()
+
+
+def advance_read_cursor(
+    db: Session,
+    user_id: int,
+    channel_type: str,
+    channel_id: int,
+    message_id: Optional[int] = None
+) -> None:
+    """
+    既読カーソルを進める（コミットは呼び出し側で行う）
+    
+    1回のUPSERTで実行し、カーソルが後退することはありません。
+    message_idを省略した場合はチャンネルの最新メッセージまで既読にします。
+    """
+    db.execute(_advance_statement(db, user_id, channel_type, channel_id, message_id))
+
+
+def _advance_statement(
+    db: Session,
+    user_id: int,
+    channel_type: str,
+    channel_id: int,
+    message_id: Optional[int] = None
+):
+    """既読カーソルを進めるUPSERT文を作成"""
+    if message_id is None:
+        value = func.coalesce(
+            select(func.max(Message.id))
+            .where(channel_condition(channel_type, channel_id, user_id))
+            .scalar_subquery(),
+            0,
+        )
+    else:
+        value = message_id
+    
+    stmt = upsert(db, ReadCursor).values(
+        user_id=user_id,
+        channel_type=channel_type,
+        channel_id=channel_id,
+        last_read_message_id=value,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ReadCursor.user_id, ReadCursor.channel_type, ReadCursor.channel_id],
+        set_={
+            "last_read_message_id": greatest(
+                db, ReadCursor.last_read_message_id, stmt.excluded.last_read_message_id
+            ),
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    return stmt
+
+
+def mark_channel_read(
+    db: Session,
+    user_id: int,
+    channel_type: str,
+    channel_id: int,
+    message_id: Optional[int] = None
+) -> Optional[ReadCursor]:
+    """
+    チャンネルを既読にする
+    
+    DMチャンネルの場合は、カーソル以下の受信メッセージの is_read も更新します。
+    未読カウンターも同じトランザクションで数え直します。
+    """
+    cursor, _, _ = read_channel_up_to(db, user_id, channel_type, channel_id, message_id)
+    return cursor
+
+
+def read_channel_up_to(
+    db: Session,
+    user_id: int,
+    channel_type: str,
+    channel_id: int,
+    up_to_message_id: Optional[int] = None
+) -> Tuple[ReadCursor, int, int]:
+    """
+    チャンネルを指定したメッセージ（ウォーターマーク）まで既読にする
+    
+    既読カーソルのUPSERT・DMの is_read のUPDATE・未読カウンターの数え直しを
+    それぞれ1文で行い、行ごとの読み込みはしません。ウォーターマークより後に
+    届いたメッセージは未読のまま残ります。
+    
+    Args:
+        up_to_message_id: 既読にする最後のメッセージID（省略時はチャンネルの最新メッセージ）
+    
+    Returns:
+        (既読カーソル, 既読にしたDMの件数, 残りの未読数)
+    """
+    from app.crud.unread_counter import refresh_counter
+    
+    cursor = db.scalars(
+        _advance_statement(db, user_id, channel_type, channel_id, up_to_message_id).returning(ReadCursor),
+        execution_options={"populate_existing": True},
+    ).one()
+    
+    marked = 0
+    if channel_type == ChannelType.DM.value:
+        marked = db.execute(
+            update(Message)
+            .where(
+                Message.user_id == channel_id,
+                Message.recipient_id == user_id,
+                Message.is_read == False,
+                Message.id <= cursor.last_read_message_id,
+            )
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    
+    unread_count = refresh_counter(db, user_id, channel_type, channel_id)
+    commit_new(db, cursor)
+    return cursor, marked, unread_count
+
+
+def get_unread_channel_messages(
+    db: Session,
+    user_id: int,
+    channel_type: str,
+    channel_id: int,
+    limit: int = 100
+) -> List[Message]:
+    """
+    チャンネルの未読メッセージを取得
+    
+    既読カーソルより大きいIDの、他のユーザーが投稿したメッセージを古い順に返します。
+    """
+    return db.query(Message).filter(
+        channel_condition(channel_type, channel_id, user_id),
+        Message.id > last_read_position(user_id, channel_type, channel_id),
+        Message.user_id != user_id,
+        Message.is_deleted == False
+    ).order_by(Message.id.asc()).limit(limit).all()
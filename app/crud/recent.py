@@ -0,0 +1,268 @@
+"""
+最新メッセージのプロセス内バッファ
+
+messages://recent リソースは、読み込みのたびに全メッセージを作成日時の降順に
+並べ替えていました（プロジェクトを指定しない場合に使えるインデックスがありません）。
+削除されていない最新 RECENT_SIZE 件のメッセージを、全体とプロジェクトごとに
+固定長のバッファとしてプロセス内に保持し、DBに問い合わせずに返します。
+
+- 全体のバッファは起動時（app.main の lifespan）に seed() で読み込みます。
+  プロジェクトごとのバッファは、最初に参照されたときに読み込みます。
+- crud.message の作成・更新・論理削除の各関数が record_*() を呼び、
+  コミット後にバッファへ反映します（ロールバックした変更は反映しません）。
+- 他のプロセスでのメッセージの変更は、app.crud.invalidation のイベントで
+  バッファを捨てて読み直します。SQLでの直接の変更は、CACHE_TTL 秒ごとの読み直しで反映されます。
+
+各バッファは「削除されていないメッセージのうち、新しい順に len 件」を常に
+正確に保持します。削除で件数が減った場合、要求された件数に足りなければ
+DBから読み直します。保持する列は RECENT_FIELDS だけです（既読状態は保持しません）。
+件数は DEVLOG_RECENT_SIZE 環境変数で設定でき、0 でバッファを無効にできます。
+"""
+import bisect
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud.cache import CACHE_TTL
+from app.crud.read import select_messages
+from app.models.message import Message
+
+# バッファに保持する最新メッセージの件数（0でバッファを無効化）
+RECENT_SIZE: int = int(os.getenv("DEVLOG_RECENT_SIZE", "100"))
+
+# プロジェクトごとのバッファを保持する最大プロジェクト数
+RECENT_PROJECTS = 256
+
+# バッファに保持する列
+RECENT_FIELDS = (
+    "id", "content", "message_type", "user_id", "recipient_id", "project_id", "task_id", "parent_id",
+    "created_at", "is_deleted"
+)
+
+# コミット後に反映する変更を Session.info に保持するキー
+_PENDING_KEY = "devlog_recent_messages"
+
+# 全体のバッファのキー（プロジェクトごとのバッファはプロジェクトID）
+_GLOBAL = "all"
+
+
+def _sort_key(row: Dict[str, Any]) -> Tuple[Any, int]:
+    # get_messages と同じ (created_at, id) の順序
+    return row["created_at"], row["id"]
+
+
+class _Window:
+    """1つの絞り込み条件（全体または1プロジェクト）の最新メッセージ（古い順）"""
+    
+    def __init__(self, rows: List[Dict[str, Any]], size: int) -> None:
+        self.size = size
+        # DBの件数が size 未満だった場合、すべてのメッセージを保持している
+        self.complete = len(rows) < size
+        self.rows = sorted(rows, key=_sort_key)
+        self.keys = [_sort_key(row) for row in self.rows]
+        self.loaded_at = time.monotonic()
+    
+    def add(self, row: Dict[str, Any]) -> None:
+        key = _sort_key(row)
+        index = bisect.bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            return
+        # 保持している最も古いものより古い場合、その間にあるメッセージが分からないため保持しない
+        if index == 0 and not self.complete and self.rows:
+            return
+        self.rows.insert(index, row)
+        self.keys.insert(index, key)
+        if len(self.rows) > self.size:
+            del self.rows[0], self.keys[0]
+            self.complete = False
+    
+    def remove(self, message_id: int) -> None:
+        for index, row in enumerate(self.rows):
+            if row["id"] == message_id:
+                del self.rows[index], self.keys[index]
+                return
+    
+    def latest(self, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """新しい順に limit 件（保持している件数では足りない場合はNone）"""
+        if limit > len(self.rows) and not self.complete:
+            return None
+        return self.rows[::-1][:limit]
+
+
+class RecentMessages:
+    """
+    全体とプロジェクトごとの最新メッセージのバッファ
+    
+    コミット済みの変更は連番付きのログにも残し、バッファをDBから読み込んでいる
+    間にコミットされた変更を、読み込み後に適用し直します。
+    複数スレッドから使われるため、ロックで保護します。
+    """
+    
+    def __init__(self, size: int = RECENT_SIZE, ttl: float = CACHE_TTL, max_projects: int = RECENT_PROJECTS) -> None:
+        self.size = size
+        self.ttl = ttl
+        self.max_projects = max_projects
+        self._windows: "OrderedDict[Any, _Window]" = OrderedDict()
+        self._sequence = 0
+        self._log: Deque[Tuple[int, str, Any]] = deque(maxlen=1024)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+    
+    def seed(self, db: Session) -> None:
+        """全体のバッファをDBから読み込む（起動時に呼び出す）"""
+        if self.enabled:
+            self._load(db, _GLOBAL)
+    
+    def latest(self, db: Session, limit: int, project_id: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        削除されていない最新のメッセージを新しい順に取得
+        
+        Args:
+            db: バッファが未読み込み・期限切れ・件数不足の場合に使うセッション
+            limit: 取得件数
+            project_id: プロジェクトで絞り込む場合のID
+        
+        Returns:
+            RECENT_FIELDS の列を持つ辞書のリスト（limit が RECENT_SIZE を超えるなど、バッファから返せない場合はNone）
+        """
+        if not self.enabled or limit > self.size:
+            return None
+        
+        key = _GLOBAL if project_id is None else project_id
+        with self._lock:
+            window = self._windows.get(key)
+            if window is not None and window.loaded_at + self.ttl > time.monotonic():
+                rows = window.latest(limit)
+                if rows is not None:
+                    self._windows.move_to_end(key)
+                    self.hits += 1
+                    return rows
+            self.misses += 1
+        return self._load(db, key).latest(limit)
+    
+    def _load(self, db: Session, key: Any) -> _Window:
+        with self._lock:
+            sequence = self._sequence
+        rows = select_messages(
+            db, limit=self.size, project_id=None if key == _GLOBAL else key, fields=list(RECENT_FIELDS)
+        )
+        window = _Window([dict(row) for row in rows], self.size)
+        
+        with self._lock:
+            missed = [entry for entry in self._log if entry[0] > sequence]
+            # ログから消えた変更がある場合は、このバッファを保持しない
+            if len(missed) < self._sequence - sequence:
+                return window
+            for _, op, value in missed:
+                _apply(window, key, op, value)
+            self._windows[key] = window
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_projects + 1:
+                oldest = next(project_id for project_id in self._windows if project_id != _GLOBAL)
+                del self._windows[oldest]
+        return window
+    
+    def apply(self, changes: List[Tuple[str, Any]]) -> None:
+        """コミットされた変更をバッファに反映"""
+        with self._lock:
+            for op, value in changes:
+                self._sequence += 1
+                self._log.append((self._sequence, op, value))
+                if op == "reset":
+                    self._windows.clear()
+                    continue
+                for key, window in self._windows.items():
+                    _apply(window, key, op, value)
+    
+    def clear(self) -> None:
+        """すべてのバッファを捨てる"""
+        with self._lock:
+            self._windows.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """設定と保持しているバッファの数・ヒット率などの統計情報を返す"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": self.size,
+                "ttl_seconds": self.ttl,
+                "windows": len(self._windows),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _apply(window: _Window, key: Any, op: str, value: Any) -> None:
+    if op == "reset":
+        window.rows, window.keys, window.complete = [], [], False
+        return
+    # 更新は、いったん取り除いてから条件に合えば追加し直す（削除の取り消しやプロジェクトの変更を含む）
+    if op in ("deleted", "updated"):
+        window.remove(value if op == "deleted" else value["id"])
+    if op in ("created", "updated"):
+        if not value["is_deleted"] and (key == _GLOBAL or value["project_id"] == key):
+            window.add(value)
+
+
+# アプリケーション全体で共有するバッファ
+recent_messages = RecentMessages()
+
+
+def _record(db: Session, op: str, value: Any) -> None:
+    if recent_messages.enabled:
+        db.info.setdefault(_PENDING_KEY, []).append((op, value))
+
+
+def _row(message: Message) -> Dict[str, Any]:
+    return {name: getattr(message, name) for name in RECENT_FIELDS}
+
+
+def record_created(db: Session, *messages: Message) -> None:
+    """作成したメッセージを、コミット後にバッファへ追加"""
+    for message in messages:
+        _record(db, "created", _row(message))
+
+
+def record_updated(db: Session, message: Message) -> None:
+    """更新したメッセージ（削除の取り消しを含む）を、コミット後にバッファへ反映"""
+    _record(db, "updated", _row(message))
+
+
+def record_deleted(db: Session, message_id: int) -> None:
+    """論理削除したメッセージを、コミット後にバッファから取り除く"""
+    _record(db, "deleted", message_id)
+
+
+def record_reset(db: Session) -> None:
+    """多数のメッセージをまとめて変更した場合に、コミット後にすべてのバッファを捨てる"""
+    _record(db, "reset", None)
+
+
+# app.crud.cache の世代番号の更新より先に実行する（insert=True）。
+# 先に世代番号が進むと、その間に描画された古いバッファの内容が新しい世代番号でキャッシュされる
+@event.listens_for(Session, "after_commit", insert=True)
+def _apply_after_commit(session: Session) -> None:
+    # SAVEPOINTの解放（begin_nested() のコミット）では、外側のトランザクションのコミットまで待つ
+    if session.in_nested_transaction():
+        return
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        recent_messages.apply(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_KEY, None)
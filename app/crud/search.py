@@ -0,0 +1,138 @@
+"""
+メッセージの全文検索
+
+SQLiteではtrigramトークナイザーのFTS5テーブル（messages_fts）、
+PostgreSQLではpg_trgm / tsvector のGINインデックスを使用します。
+インデックスの定義は app.db.search_index を参照してください。
+
+結果はスコアの昇順（小さいほど関連度が高い）に並び、
+(score, id) のカーソルでページ送りできます。
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Row, column, func, literal, literal_column, select, table, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.message import Message
+from app.crud.dialect import dialect_name
+from app.crud.pagination import decode_score_cursor
+
+
+# trigramトークナイザーで索引を引ける最小の文字数
+MIN_TRIGRAM_LENGTH = 3
+
+# スニペットに含めるトークン数
+SNIPPET_TOKENS = 12
+
+_messages_fts = table("messages_fts", column("rowid"), column("rank"))
+
+
+def _split_terms(query: str) -> List[str]:
+    """検索文字列を空白で区切って検索語のリストにする"""
+    terms = query.split()
+    if not terms:
+        raise ValueError("Search query is required")
+    return terms
+
+
+def _fts5_phrase(term: str) -> str:
+    """検索語をFTS5のフレーズとしてエスケープ"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _sqlite_search(terms: List[str]):
+    """SQLite用の検索クエリ（FTS5 + bm25ランキング）"""
+    indexed = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+    short = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH]
+    
+    if not indexed:
+        # 3文字未満の語のみの場合は索引を使えないため、新しい順の部分一致検索にする
+        score = -Message.id
+        stmt = select(
+            Message,
+            func.substr(Message.content, 1, 100).label("snippet"),
+            score.label("score"),
+        )
+    else:
+        score = _messages_fts.c.rank
+        snippet = func.snippet(literal_column("messages_fts"), 0, "[", "]", "…", SNIPPET_TOKENS)
+        stmt = (
+            select(Message, snippet.label("snippet"), score.label("score"))
+            .join_from(_messages_fts, Message, Message.id == _messages_fts.c.rowid)
+            .where(
+                text("messages_fts MATCH :fts_query").bindparams(
+                    fts_query=" ".join(_fts5_phrase(term) for term in indexed)
+                )
+            )
+        )
+    
+    for term in short:
+        stmt = stmt.where(Message.content.contains(term, autoescape=True))
+    return stmt, score
+
+
+def _postgresql_search(terms: List[str]):
+    """PostgreSQL用の検索クエリ（pg_trgm + tsvector ランキング）"""
+    query = " ".join(terms)
+    tsquery = func.plainto_tsquery("simple", query)
+    score = -func.greatest(
+        func.word_similarity(query, Message.content),
+        func.ts_rank(func.to_tsvector("simple", Message.content), tsquery),
+    )
+    snippet = func.ts_headline(
+        "simple", Message.content, tsquery,
+        literal("StartSel=[, StopSel=], MaxFragments=1, MaxWords=20, MinWords=5"),
+    )
+    stmt = select(Message, snippet.label("snippet"), score.label("score"))
+    for term in terms:
+        stmt = stmt.where(Message.content.icontains(term, autoescape=True))
+    return stmt, score
+
+
+def search_messages(
+    db: Session,
+    query: str,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> List[Row]:
+    """
+    メッセージの全文検索
+    
+    空白で区切られた全ての語を含む、削除されていないメッセージを返します。
+    
+    Returns:
+        (Message, snippet, score) の行のリスト
+    
+    Raises:
+        ValueError: 検索文字列が空、またはカーソルが不正な場合
+    """
+    terms = _split_terms(query)
+    
+    name = dialect_name(db)
+    if name == "sqlite":
+        stmt, score = _sqlite_search(terms)
+    elif name == "postgresql":
+        stmt, score = _postgresql_search(terms)
+    else:
+        raise NotImplementedError(f"Message search is not supported on {name}")
+    
+    stmt = stmt.where(Message.is_deleted == False)
+    
+    if project_id is not None:
+        stmt = stmt.where(Message.project_id == project_id)
+    
+    if task_id is not None:
+        stmt = stmt.where(Message.task_id == task_id)
+    
+    if since is not None:
+        stmt = stmt.where(Message.created_at >= since)
+    
+    if cursor:
+        last_score, last_id = decode_score_cursor(cursor)
+        stmt = stmt.where(tuple_(score, Message.id) > tuple_(last_score, last_id))
+    
+    return db.execute(stmt.order_by(score, Message.id).limit(limit)).all()
@@ -0,0 +1,162 @@
+"""
+作成・更新処理の共通ヘルパー
+
+INSERT / UPDATE ... RETURNING で返された行をそのままインスタンスとして使い、
+事前のSELECTやコミット後の db.refresh() によるSELECTを省きます。
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+T = TypeVar("T")
+
+
+def insert_returning(db: Session, model: Type[T], values: Dict[str, Any]) -> T:
+    """
+    1行をINSERTし、作成されたインスタンスを返す
+    
+    RETURNINGに対応したDB（SQLite 3.35+ / PostgreSQL）では INSERT ... RETURNING の
+    1文で作成し、返された行からインスタンスを読み込みます。
+    非対応のDBでは db.add() と flush で作成します。
+    
+    Args:
+        db: セッション
+        model: モデルクラス
+        values: 列の値
+    
+    Returns:
+        セッションに属する作成済みのインスタンス
+    
+    Raises:
+        IntegrityError: 一意制約などに違反した場合
+    """
+    if db.get_bind().dialect.insert_returning:
+        return db.scalars(insert(model).returning(model), [values]).one()
+    
+    instance = model(**values)
+    db.add(instance)
+    db.flush()
+    return instance
+
+
+def insert_many_returning(db: Session, model: Type[T], rows: List[Dict[str, Any]]) -> List[T]:
+    """
+    複数行をまとめてINSERTし、作成されたインスタンスを入力と同じ順序で返す
+    
+    RETURNINGに対応したDBでは、executemany形式の INSERT ... RETURNING を
+    SQLAlchemyの insertmanyvalues で複数行のVALUESにまとめて実行します。
+    非対応のDBでは db.add_all() と flush で作成します。
+    
+    RETURNINGの行の順序は保証されないため、入力と対応付けて返します。
+    SQLiteでは自動採番のIDが行の挿入順に割り当てられるため、IDで並べ替えます
+    （sort_by_parameter_order=True はSQLiteでは1行ずつのINSERTになるため使いません）。
+    PostgreSQLなどでは同時に実行された挿入とIDの採番が交互になることがあるため、
+    sort_by_parameter_order=True でSQLAlchemyに入力の順序で返させます。
+    
+    Args:
+        db: セッション
+        model: 自動採番の id 列を持つモデルクラス
+        rows: 行ごとの列の値
+    
+    Returns:
+        セッションに属する作成済みのインスタンスのリスト
+    
+    Raises:
+        IntegrityError: いずれかの行が制約に違反した場合
+    """
+    if not rows:
+        return []
+    
+    dialect = db.get_bind().dialect
+    if dialect.insert_returning:
+        by_id = dialect.name == "sqlite"
+        # render_nulls: Noneの列も省略せずNULLとして渡し、列の組み合わせが異なる行も1つのINSERTにまとめる
+        instances = db.scalars(
+            insert(model).returning(model, sort_by_parameter_order=not by_id),
+            rows,
+            execution_options={"render_nulls": True}
+        ).all()
+        return sorted(instances, key=lambda instance: instance.id) if by_id else instances
+    
+    instances = [model(**values) for values in rows]
+    db.add_all(instances)
+    db.flush()
+    return instances
+
+
+def update_returning(
+    db: Session,
+    model: Type[T],
+    instance_id: int,
+    values: Dict[str, Any],
+    expected_updated_at: Optional[datetime] = None
+) -> Optional[T]:
+    """
+    IDで指定した1行を UPDATE ... WHERE id = :id RETURNING で更新する
+    
+    存在確認のSELECTは行わず、更新件数が0件かどうかで存在しないことを検出します。
+    expected_updated_at を指定すると、updated_at が一致する場合だけ更新します
+    （行ロックを使わない楽観的排他制御）。
+    
+    Args:
+        db: セッション
+        model: id / updated_at 列を持つモデルクラス
+        instance_id: 更新する行のID
+        values: 更新する列の値（updated_at は自動で更新されます）
+        expected_updated_at: 更新前の updated_at の期待値（省略可）
+    
+    Returns:
+        更新後のインスタンス（存在しない場合はNone）
+    
+    Raises:
+        StaleDataError: expected_updated_at が現在の値と一致しない場合
+    """
+    condition = model.id == instance_id
+    if expected_updated_at is not None:
+        condition = condition & (model.updated_at == expected_updated_at)
+    
+    if not values:
+        # 更新する列がない場合は updated_at も変更しない
+        instance = db.scalars(select(model).where(condition)).one_or_none()
+    elif db.get_bind().dialect.update_returning:
+        instance = db.scalars(
+            update(model).where(condition).values(**values).returning(model),
+            execution_options={"populate_existing": True},
+        ).one_or_none()
+    else:
+        result = db.execute(
+            update(model).where(condition).values(**values),
+            execution_options={"synchronize_session": False},
+        )
+        instance = db.get(model, instance_id, populate_existing=True) if result.rowcount else None
+    
+    if instance is None:
+        # 何も更新していないため、呼び出し元のトランザクションはそのまま残す
+        # 失敗した場合だけ、存在しないのか競合したのかを確認する
+        if expected_updated_at is not None and db.scalar(select(exists().where(model.id == instance_id))):
+            raise StaleDataError(
+                f"{model.__name__} {instance_id} has been modified since {expected_updated_at.isoformat()}"
+            )
+        return None
+    return instance
+
+
+def commit_new(db: Session, *instances: Any) -> None:
+    """
+    作成・更新したインスタンスを失効させずにコミットする
+    
+    コミット中だけセッションから外すことで、コミット後に属性へアクセスしても
+    再読み込みのSELECTが発生しないようにします。コミット後はセッションに戻します。
+    
+    Args:
+        db: セッション
+        *instances: insert_returning() / update_returning() で取得したインスタンス
+    """
+    for instance in instances:
+        db.expunge(instance)
+    db.commit()
+    for instance in instances:
+        db.add(instance)
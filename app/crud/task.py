@@ -1,16 +1,41 @@
 """
 タスクのCRUD操作
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
 
+from app.models.message import Message
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.message import MessageCreate
+from app.schemas.task import TaskBulkUpdate, TaskCreate, TaskUpdate
+from app.crud import recent, unread_counter
+from app.crud.cache import cached_get, invalidate
+from app.crud.dialect import set_local_lock_timeout
+from app.crud.pagination import decode_id_cursor
+from app.crud.projection import apply_fields
+from app.crud.session import commit_new, insert_returning, update_returning
 
+# 一括更新で1回のUPDATEが対象にする最大件数
+BULK_UPDATE_CHUNK_SIZE = 500
 
-def get_task(db: Session, task_id: int) -> Optional[Task]:
-    """IDによるタスクの取得"""
-    return db.query(Task).filter(Task.id == task_id).first()
+# 一括更新で行ロックを待つ時間の上限（ミリ秒、PostgreSQLのみ）
+BULK_LOCK_TIMEOUT_MS = 5000
+
+
+def get_task(db: Session, task_id: int, fields: Optional[List[str]] = None) -> Optional[Task]:
+    """
+    IDによるタスクの取得
+    
+    キャッシュ（app.crud.cache）にある場合はDBに問い合わせません。
+    fieldsを指定した場合は、その列（とID）だけを読み込みます。
+    """
+    return cached_get(
+        db, Task, "id", task_id,
+        lambda: apply_fields(db.query(Task), Task, fields).filter(Task.id == task_id).first(),
+        partial=fields is not None
+    )
 
 
 def get_tasks(
@@ -19,10 +44,17 @@ def get_tasks(
     limit: int = 100,
     project_id: Optional[int] = None,
     assignee_id: Optional[int] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
 ) -> List[Task]:
-    """タスクリストの取得"""
-    query = db.query(Task)
+    """
+    タスクリストの取得
+    
+    ID順に返します。cursorを指定した場合は、そのカーソルが指すタスクの次から返します。
+    fieldsを指定した場合は、その列（とID）だけを読み込みます。
+    """
+    query = apply_fields(db.query(Task), Task, fields)
     
     if project_id is not None:
         query = query.filter(Task.project_id == project_id)
@@ -33,42 +65,171 @@ def get_tasks(
     if status is not None:
         query = query.filter(Task.status == status)
     
-    return query.offset(skip).limit(limit).all()
+    if cursor:
+        query = query.filter(Task.id > decode_id_cursor(cursor))
+    
+    return query.order_by(Task.id).offset(skip).limit(limit).all()
+
+
+def count_tasks(db: Session, project_id: int) -> int:
+    """プロジェクトのタスク数（タスクを読み込まずに SELECT count(*) で数える）"""
+    return db.scalar(select(func.count()).select_from(Task).where(Task.project_id == project_id))
 
 
 def create_task(db: Session, task: TaskCreate) -> Task:
-    """タスクの作成"""
-    db_task = Task(**task.model_dump())
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    """タスクの作成（INSERT ... RETURNING の1往復）"""
+    db_task = insert_returning(db, Task, task.model_dump())
+    invalidate(db, Task, db_task.id)
+    commit_new(db, db_task)
     return db_task
 
 
 def update_task(
-    db: Session, task_id: int, task: TaskUpdate
+    db: Session,
+    task_id: int,
+    task: TaskUpdate,
+    expected_updated_at: Optional[datetime] = None
 ) -> Optional[Task]:
-    """タスクの更新"""
-    db_task = get_task(db, task_id=task_id)
+    """
+    タスクの更新（UPDATE ... RETURNING の1往復）
+    
+    Args:
+        expected_updated_at: 指定した場合、updated_at が一致するときだけ更新する
+    
+    Returns:
+        更新後のタスク（存在しない場合はNone）
+    
+    Raises:
+        StaleDataError: expected_updated_at が現在の値と一致しない場合
+    """
+    db_task = update_returning(
+        db, Task, task_id, task.model_dump(exclude_unset=True), expected_updated_at
+    )
     if db_task is None:
         return None
+    invalidate(db, Task, task_id)
+    commit_new(db, db_task)
+    return db_task
+
+
+def bulk_update_tasks(
+    db: Session,
+    changes: TaskBulkUpdate,
+    task_ids: Optional[List[int]] = None,
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    status: Optional[str] = None,
+    summary: Optional[MessageCreate] = None,
+    chunk_size: int = BULK_UPDATE_CHUNK_SIZE
+) -> Tuple[int, Optional[Message]]:
+    """
+    条件に一致するタスクをまとめて更新（1トランザクション）
     
-    update_data = task.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_task, field, value)
+    IDのリストと絞り込み条件（プロジェクト・担当者・ステータス）の両方に一致する
+    タスクを、chunk_size 件ずつのUPDATEで更新します。1文あたりの処理時間と
+    ロックの待ち時間（BULK_LOCK_TIMEOUT_MS）を抑えつつ、全件を1回のコミットで確定します。
+    project_id を変更する場合は、移動したタスクのメッセージの project_id も同じ
+    トランザクションで移動先に変更します。
     
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
-    return db_task
+    Args:
+        changes: 設定する値（指定したフィールドのみ更新）
+        task_ids: 対象のタスクID（省略可）
+        project_id / assignee_id / status: 絞り込み条件（省略可）
+        summary: 指定した場合、1件以上更新したときに同じトランザクションで投稿するメッセージ
+        chunk_size: 1回のUPDATEで更新する最大件数
+    
+    Returns:
+        (更新したタスク数, 投稿したメッセージ（投稿しなかった場合はNone）)
+    
+    Raises:
+        ValueError: 対象または設定する値が指定されていない場合
+        OperationalError: ロックの待ち時間が上限を超えた場合（全件ロールバック）
+    """
+    values = changes.model_dump(exclude_unset=True)
+    if not values:
+        raise ValueError("No fields to update")
+    
+    conditions = []
+    if project_id is not None:
+        conditions.append(Task.project_id == project_id)
+    if assignee_id is not None:
+        conditions.append(Task.assignee_id == assignee_id)
+    if status is not None:
+        conditions.append(Task.status == status)
+    if task_ids is None and not conditions:
+        raise ValueError("Either task IDs or a filter is required")
+    
+    set_local_lock_timeout(db, BULK_LOCK_TIMEOUT_MS)
+    updated = 0
+    try:
+        if task_ids is not None:
+            ids = sorted(set(task_ids))
+            chunks = (ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size))
+        else:
+            chunks = _id_chunks(db, conditions, chunk_size)
+        
+        for chunk in chunks:
+            result = db.execute(
+                update(Task).where(Task.id.in_(chunk), *conditions).values(**values),
+                execution_options={"synchronize_session": False},
+            )
+            updated += result.rowcount
+            invalidate(db, Task, *chunk)
+            if "project_id" in values:
+                # プロジェクトのメッセージ一覧・会話一覧・最新メッセージは Message.project_id で
+                # 絞り込むため、タスクのメッセージも移動先のプロジェクトに移す
+                moved = select(Task.id).where(Task.id.in_(chunk), Task.project_id == values["project_id"])
+                db.execute(
+                    update(Message)
+                    .where(Message.task_id.in_(moved))
+                    .values(project_id=values["project_id"], updated_at=Message.updated_at),
+                    execution_options={"synchronize_session": False},
+                )
+        
+        if "project_id" in values and updated:
+            invalidate(db, Message)
+            recent.record_reset(db)
+        
+        message = None
+        if summary is not None and updated:
+            message = insert_returning(db, Message, summary.model_dump())
+            unread_counter.record_message_created(db, message)
+            invalidate(db, Message, message.id)
+            recent.record_created(db, message)
+    except Exception:
+        db.rollback()
+        raise
+    
+    if message is not None:
+        commit_new(db, message)
+    else:
+        db.commit()
+    return updated, message
+
+
+def _id_chunks(db: Session, conditions: list, chunk_size: int) -> Iterator[List[int]]:
+    """条件に一致するタスクIDを、ID順のキーセットで chunk_size 件ずつ返す"""
+    last_id = 0
+    while True:
+        ids = db.scalars(
+            select(Task.id).where(Task.id > last_id, *conditions).order_by(Task.id).limit(chunk_size)
+        ).all()
+        if not ids:
+            return
+        yield ids
+        if len(ids) < chunk_size:
+            return
+        last_id = ids[-1]
 
 
 def delete_task(db: Session, task_id: int) -> bool:
-    """タスクの削除"""
-    db_task = get_task(db, task_id=task_id)
-    if db_task is None:
+    """タスクの削除（存在確認のSELECTを行わず、削除件数で判定）"""
+    result = db.execute(
+        delete(Task).where(Task.id == task_id),
+        execution_options={"synchronize_session": False},
+    )
+    if result.rowcount == 0:
         return False
-    
-    db.delete(db_task)
+    invalidate(db, Task, task_id)
     db.commit()
-    return True 
\ No newline at end of file
+    return True
@@ -0,0 +1,282 @@
+"""
+未読カウンターのCRUD操作
+
+未読数はメッセージの書き込みと同じトランザクションで増減させます。
+record_* 関数はコミットしないため、呼び出し側のコミットでまとめて確定されます。
+
+チャンネルごとの未読の定義:
+- DM: 相手から受信した is_read が偽のメッセージ数
+- プロジェクト / タスク: 既読カーソルより新しい、他のユーザーのメッセージ数
+  （既読カーソルを持つユーザー、つまりチャンネルを読んだか投稿したユーザーが対象）
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.message import Message
+from app.models.read_cursor import ReadCursor
+from app.models.unread_counter import UnreadCounter
+from app.schemas.read_cursor import ChannelType
+from app.crud.dialect import greatest, upsert
+from app.crud.read_cursor import (
+    advance_read_cursor,
+    channel_condition,
+    last_read_position,
+    message_channel,
+)
+
+
+def _upsert_counter(db: Session, user_id: int, channel_type: str, channel_id: int, value, on_conflict) -> int:
+    """カウンターを1回のUPSERTで設定し、設定後の未読数を返す"""
+    stmt = upsert(db, UnreadCounter).values(
+        user_id=user_id,
+        channel_type=channel_type,
+        channel_id=channel_id,
+        unread_count=value,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UnreadCounter.user_id, UnreadCounter.channel_type, UnreadCounter.channel_id],
+        set_={"unread_count": on_conflict, "updated_at": stmt.excluded.updated_at},
+    )
+    return db.execute(stmt.returning(UnreadCounter.unread_count)).scalar_one()
+
+
+def _channel_members_with_unread(channel_type: str, channel_id: int, message_id: int):
+    """指定メッセージをまだ読んでいないチャンネル参加者のユーザーIDを返すサブクエリ"""
+    return select(ReadCursor.user_id).where(
+        ReadCursor.channel_type == channel_type,
+        ReadCursor.channel_id == channel_id,
+        ReadCursor.last_read_message_id < message_id,
+    )
+
+
+def record_message_created(db: Session, message: Message) -> None:
+    """
+    メッセージ作成時にカウンターを更新
+    
+    DMは受信者のカウンターを加算します。プロジェクト / タスクでは他の参加者の
+    カウンターを加算し、投稿者自身はそのメッセージまで既読になります。
+    """
+    channel = message_channel(message, message.user_id)
+    if channel is None:
+        return
+    channel_type, channel_id = channel
+    
+    if channel_type == ChannelType.DM.value:
+        _upsert_counter(
+            db, message.recipient_id, ChannelType.DM.value, message.user_id,
+            value=1, on_conflict=UnreadCounter.unread_count + 1,
+        )
+        return
+    
+    db.execute(
+        update(UnreadCounter)
+        .where(
+            UnreadCounter.channel_type == channel_type,
+            UnreadCounter.channel_id == channel_id,
+            UnreadCounter.user_id != message.user_id,
+        )
+        .values(unread_count=UnreadCounter.unread_count + 1)
+    )
+    advance_read_cursor(db, message.user_id, channel_type, channel_id, message.id)
+    _upsert_counter(db, message.user_id, channel_type, channel_id, value=0, on_conflict=0)
+
+
+def record_messages_created(db: Session, messages: List[Message]) -> None:
+    """
+    複数メッセージの作成時にカウンターをまとめて更新
+    
+    DMは送信者と受信者の組ごとに1回の加算で済ませます。プロジェクト / タスクでは、
+    チャンネル内の投稿者が1人だけ（ボットによる一括投稿など）ならチャンネルごとに
+    1回の加算とし、投稿者が混在するチャンネルは record_message_created() を
+    ID順に1件ずつ呼び出します。
+    """
+    dm_counts: Dict[Tuple[int, int], int] = defaultdict(int)
+    channels: Dict[Tuple[str, int], List[Message]] = defaultdict(list)
+    for message in sorted(messages, key=lambda m: m.id):
+        channel = message_channel(message, message.user_id)
+        if channel is None:
+            continue
+        if channel[0] == ChannelType.DM.value:
+            dm_counts[(message.recipient_id, message.user_id)] += 1
+        else:
+            channels[channel].append(message)
+    
+    for (recipient_id, sender_id), count in dm_counts.items():
+        _upsert_counter(
+            db, recipient_id, ChannelType.DM.value, sender_id,
+            value=count, on_conflict=UnreadCounter.unread_count + count,
+        )
+    
+    for (channel_type, channel_id), posted in channels.items():
+        authors = {message.user_id for message in posted}
+        if len(authors) > 1:
+            for message in posted:
+                record_message_created(db, message)
+            continue
+        
+        author_id = authors.pop()
+        db.execute(
+            update(UnreadCounter)
+            .where(
+                UnreadCounter.channel_type == channel_type,
+                UnreadCounter.channel_id == channel_id,
+                UnreadCounter.user_id != author_id,
+            )
+            .values(unread_count=UnreadCounter.unread_count + len(posted))
+        )
+        advance_read_cursor(db, author_id, channel_type, channel_id, posted[-1].id)
+        _upsert_counter(db, author_id, channel_type, channel_id, value=0, on_conflict=0)
+
+
+def record_message_read(db: Session, message: Message) -> None:
+    """未読だったDMが既読になった時に受信者のカウンターを減算"""
+    if message.recipient_id is None or message.is_deleted:
+        return
+    db.execute(
+        update(UnreadCounter)
+        .where(
+            UnreadCounter.user_id == message.recipient_id,
+            UnreadCounter.channel_type == ChannelType.DM.value,
+            UnreadCounter.channel_id == message.user_id,
+        )
+        .values(unread_count=greatest(db, UnreadCounter.unread_count - 1, 0))
+    )
+
+
+def record_messages_read(db: Session, messages: Iterable[Message]) -> None:
+    """
+    未読だった複数のDMが既読になった時に受信者のカウンターを減算
+    
+    送信者と受信者の組ごとに1回のUPDATEにまとめます。messages には
+    user_id / recipient_id / is_deleted を持つ行（RETURNINGの結果など）も渡せます。
+    """
+    counts: Dict[Tuple[int, int], int] = defaultdict(int)
+    for message in messages:
+        if message.recipient_id is None or message.is_deleted:
+            continue
+        counts[(message.recipient_id, message.user_id)] += 1
+    
+    for (recipient_id, sender_id), count in counts.items():
+        db.execute(
+            update(UnreadCounter)
+            .where(
+                UnreadCounter.user_id == recipient_id,
+                UnreadCounter.channel_type == ChannelType.DM.value,
+                UnreadCounter.channel_id == sender_id,
+            )
+            .values(unread_count=greatest(db, UnreadCounter.unread_count - count, 0))
+        )
+
+
+def record_message_deleted(db: Session, message: Message) -> None:
+    """論理削除されたメッセージを未読として数えていたカウンターを減算"""
+    channel = message_channel(message, message.user_id)
+    if channel is None:
+        return
+    channel_type, channel_id = channel
+    
+    if channel_type == ChannelType.DM.value:
+        if not message.is_read:
+            record_message_read(db, message)
+        return
+    
+    db.execute(
+        update(UnreadCounter)
+        .where(
+            UnreadCounter.channel_type == channel_type,
+            UnreadCounter.channel_id == channel_id,
+            UnreadCounter.user_id != message.user_id,
+            UnreadCounter.user_id.in_(_channel_members_with_unread(channel_type, channel_id, message.id)),
+        )
+        .values(unread_count=greatest(db, UnreadCounter.unread_count - 1, 0))
+    )
+
+
+def record_message_flags_changed(db: Session, message: Message, is_read: bool, is_deleted: bool) -> None:
+    """
+    is_read / is_deleted の変更時にカウンターを更新（message には変更前のメッセージを渡す）
+    
+    DMは未読として数える状態（未読かつ削除されていない）が変わった場合に受信者の
+    カウンターを増減します。プロジェクト / タスクは論理削除とその取り消しで、
+    まだ読んでいない参加者のカウンターを増減します。
+    """
+    channel = message_channel(message, message.user_id)
+    if channel is None:
+        return
+    channel_type, channel_id = channel
+    
+    if channel_type == ChannelType.DM.value:
+        was_unread = not message.is_read and not message.is_deleted
+        is_unread = not is_read and not is_deleted
+        if was_unread and not is_unread:
+            record_message_read(db, message)
+        elif is_unread and not was_unread:
+            _upsert_counter(
+                db, message.recipient_id, ChannelType.DM.value, message.user_id,
+                value=1, on_conflict=UnreadCounter.unread_count + 1,
+            )
+        return
+    
+    if is_deleted == message.is_deleted:
+        return
+    if is_deleted:
+        record_message_deleted(db, message)
+        return
+    
+    db.execute(
+        update(UnreadCounter)
+        .where(
+            UnreadCounter.channel_type == channel_type,
+            UnreadCounter.channel_id == channel_id,
+            UnreadCounter.user_id != message.user_id,
+            UnreadCounter.user_id.in_(_channel_members_with_unread(channel_type, channel_id, message.id)),
+        )
+        .values(unread_count=UnreadCounter.unread_count + 1)
+    )
+
+
+def refresh_counter(db: Session, user_id: int, channel_type: str, channel_id: int) -> int:
+    """
+    チャンネルの未読数を数え直して設定し、設定後の未読数を返す
+    
+    既読カーソルを動かした後に呼び出します。
+    """
+    if channel_type == ChannelType.DM.value:
+        condition = [
+            Message.user_id == channel_id,
+            Message.recipient_id == user_id,
+            Message.is_read == False,
+        ]
+    else:
+        condition = [
+            channel_condition(channel_type, channel_id, user_id),
+            Message.user_id != user_id,
+            Message.id > last_read_position(user_id, channel_type, channel_id),
+        ]
+    
+    count = (
+        select(func.count(Message.id))
+        .where(*condition, Message.is_deleted == False)
+        .scalar_subquery()
+    )
+    return _upsert_counter(db, user_id, channel_type, channel_id, value=count, on_conflict=count)
+
+
+def reset_counter(db: Session, user_id: int, channel_type: str, channel_id: int) -> None:
+    """チャンネルの未読数を0にする"""
+    _upsert_counter(db, user_id, channel_type, channel_id, value=0, on_conflict=0)
+
+
+def get_unread_counts(db: Session, user_id: int) -> List[UnreadCounter]:
+    """
+    未読のあるチャンネルのカウンターを取得
+    
+    unread_countersのみを参照し、messagesテーブルには触れません。
+    """
+    return db.query(UnreadCounter).filter(
+        UnreadCounter.user_id == user_id,
+        UnreadCounter.unread_count > 0
+    ).order_by(UnreadCounter.channel_type, UnreadCounter.channel_id).all()
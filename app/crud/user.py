@@ -2,15 +2,29 @@
 ユーザーのCRUD操作
 """
 from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.crud.cache import cached_get, invalidate
+from app.crud.pagination import decode_id_cursor
+from app.crud.projection import apply_fields
+from app.crud.session import commit_new, insert_returning
 
 
-def get_user(db: Session, user_id: int) -> Optional[User]:
-    """IDによるユーザーの取得"""
-    return db.query(User).filter(User.id == user_id).first()
+def get_user(db: Session, user_id: int, fields: Optional[List[str]] = None) -> Optional[User]:
+    """
+    IDによるユーザーの取得
+    
+    キャッシュ（app.crud.cache）にある場合はDBに問い合わせません。
+    fieldsを指定した場合は、その列（とID）だけを読み込みます。
+    """
+    return cached_get(
+        db, User, "id", user_id,
+        lambda: apply_fields(db.query(User), User, fields).filter(User.id == user_id).first(),
+        partial=fields is not None
+    )
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -18,9 +32,18 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
-def get_user_by_username(db: Session, username: str) -> Optional[User]:
-    """ユーザー名によるユーザーの取得"""
-    return db.query(User).filter(User.username == username).first()
+def get_user_by_username(db: Session, username: str, fields: Optional[List[str]] = None) -> Optional[User]:
+    """
+    ユーザー名によるユーザーの取得
+    
+    キャッシュ（app.crud.cache）にある場合はDBに問い合わせません。
+    fieldsを指定した場合は、その列（とID）だけを読み込みます。
+    """
+    return cached_get(
+        db, User, "username", username,
+        lambda: apply_fields(db.query(User), User, fields).filter(User.username == username).first(),
+        partial=fields is not None
+    )
 
 
 def get_users(
@@ -28,10 +51,17 @@ def get_users(
     skip: int = 0,
     limit: int = 100,
     username: Optional[str] = None,
-    email: Optional[str] = None
+    email: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
 ) -> List[User]:
-    """ユーザーリストの取得"""
-    query = db.query(User)
+    """
+    ユーザーリストの取得
+    
+    ID順に返します。cursorを指定した場合は、そのカーソルが指すユーザーの次から返します。
+    fieldsを指定した場合は、その列（とID）だけを読み込みます。
+    """
+    query = apply_fields(db.query(User), User, fields)
     
     if username is not None:
         query = query.filter(User.username == username)
@@ -39,19 +69,28 @@ def get_users(
     if email is not None:
         query = query.filter(User.email == email)
     
-    return query.offset(skip).limit(limit).all()
+    if cursor:
+        query = query.filter(User.id > decode_id_cursor(cursor))
+    
+    return query.order_by(User.id).offset(skip).limit(limit).all()
 
 
 def create_user(db: Session, user: UserCreate) -> Optional[User]:
-    """ユーザーの作成"""
-    # 重複チェック
-    if get_user_by_email(db, email=user.email):
-        return None
-    if get_user_by_username(db, username=user.username):
-        return None
+    """
+    ユーザーの作成
     
-    db_user = User(**user.model_dump())
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    ユーザー名・メールアドレスの重複は事前のSELECTではなく一意制約で検出します。
+    INSERTはSAVEPOINTの中で行うため、重複していた場合も呼び出し元の
+    未コミットの変更はそのまま残ります。
+    
+    Returns:
+        作成したユーザー（重複している場合はNone）
+    """
+    try:
+        with db.begin_nested():
+            db_user = insert_returning(db, User, user.model_dump())
+    except IntegrityError:
+        return None
+    invalidate(db, User, db_user.id)
+    commit_new(db, db_user)
     return db_user 
\ No newline at end of file
@@ -5,11 +5,18 @@
 環境変数からデータベースURLを読み込み、適切なエンジンとセッションを設定します。
 """
 import os
-from typing import Generator
-from sqlalchemy import create_engine, Engine
+import re
+from typing import Any, Callable, Dict, Generator, AsyncGenerator, Optional, TypeVar
+from sqlalchemy import create_engine, event, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
+from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
 
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine, pool_status
+
+T = TypeVar("T")
+
 # .envファイルから環境変数を読み込む
 load_dotenv()
 
@@ -26,14 +33,183 @@ if "sqlite" in SQLALCHEMY_DATABASE_URL:
     # FastAPIは非同期で動作するため、この設定が必要
     connect_args = {"check_same_thread": False}
 
+# SQLiteの接続ごとに適用するPRAGMA設定
+# DEVLOG_SQLITE_<名前> 環境変数で上書きでき、空文字を指定するとそのPRAGMAは適用しない
+SQLITE_PRAGMAS: Dict[str, str] = {
+    # WALモードでは読み取りが書き込みにブロックされない
+    "journal_mode": os.getenv("DEVLOG_SQLITE_JOURNAL_MODE", "WAL"),
+    # WALモードではNORMALでもデータベースの整合性は保たれる
+    "synchronous": os.getenv("DEVLOG_SQLITE_SYNCHRONOUS", "NORMAL"),
+    # 負の値はKiB単位（約64MB）
+    "cache_size": os.getenv("DEVLOG_SQLITE_CACHE_SIZE", "-64000"),
+    # 256MB
+    "mmap_size": os.getenv("DEVLOG_SQLITE_MMAP_SIZE", "268435456"),
+    "temp_store": os.getenv("DEVLOG_SQLITE_TEMP_STORE", "MEMORY"),
+    # ロック解放を待つ時間（ミリ秒）
+    "busy_timeout": os.getenv("DEVLOG_SQLITE_BUSY_TIMEOUT", "5000"),
+    # 既存の削除処理は外部キー制約を前提としていないため、デフォルトは無効
+    "foreign_keys": os.getenv("DEVLOG_SQLITE_FOREIGN_KEYS", "OFF"),
+}
+
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def apply_sqlite_pragmas(dbapi_connection: Any, pragmas: Optional[Dict[str, str]] = None) -> None:
+    """
+    SQLiteのDBAPI接続にPRAGMA設定を適用する
+    
+    Args:
+        dbapi_connection: sqlite3の接続
+        pragmas: PRAGMA名と値の辞書（省略時はSQLITE_PRAGMAS）
+    
+    Raises:
+        ValueError: PRAGMAの値が不正な場合
+    """
+    if pragmas is None:
+        pragmas = SQLITE_PRAGMAS
+    
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if value is None or value == "":
+                continue
+            if not _PRAGMA_VALUE.match(str(value)):
+                raise ValueError(f"Invalid value for SQLite pragma {name}: {value}")
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite_engine(target: Engine, pragmas: Optional[Dict[str, str]] = None) -> None:
+    """
+    SQLiteエンジンの新しい接続ごとにPRAGMA設定を適用するよう登録する
+    
+    Args:
+        target: SQLiteのエンジン
+        pragmas: PRAGMA名と値の辞書（省略時はSQLITE_PRAGMAS）
+    """
+    @event.listens_for(target, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+# SQLiteのファイルデータベースでは、書き込みを専用の接続（app.db.writer）に集めてグループコミットする
+# 有効な場合、非同期エンジンは読み取り専用（PRAGMA query_only）の接続プールになる
+SQLITE_WRITER: bool = (
+    os.getenv("DEVLOG_SQLITE_WRITER", "true").lower() in ("1", "true", "yes", "on")
+    and SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+    and ":memory:" not in SQLALCHEMY_DATABASE_URL
+    and not SQLALCHEMY_DATABASE_URL.endswith("://")
+)
+
+# 読み取り専用の接続に適用するPRAGMA設定（query_only は他の設定の後に適用する）
+SQLITE_READER_PRAGMAS: Dict[str, str] = {**SQLITE_PRAGMAS, "query_only": "ON"}
+
+# コネクションプールの設定
+# "queue": アプリケーション側でプールする（デフォルト）
+# "transaction": PgBouncerのトランザクションプーリング向けに、アプリケーション側ではプールしない
+DB_POOL_MODE: str = os.getenv("DEVLOG_DB_POOL_MODE", "queue").lower()
+DB_POOL_SIZE: int = int(os.getenv("DEVLOG_DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DEVLOG_DB_MAX_OVERFLOW", "10"))
+# 接続を再作成するまでの秒数（-1で無効）
+DB_POOL_RECYCLE: int = int(os.getenv("DEVLOG_DB_POOL_RECYCLE", "1800"))
+# プールに空きがない場合に待つ秒数
+DB_POOL_TIMEOUT: float = float(os.getenv("DEVLOG_DB_POOL_TIMEOUT", "30"))
+# チェックアウト時に接続が生きているか確認する（フェイルオーバー後の切断対策）
+DB_POOL_PRE_PING: bool = os.getenv("DEVLOG_DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes", "on")
+
+
+def pool_options(database_url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    create_engine() に渡すコネクションプールの設定を返す
+    
+    Args:
+        database_url: データベースURL
+        is_async: 非同期エンジン用の設定を返す場合はTrue
+    
+    Returns:
+        create_engine() のキーワード引数
+    
+    Raises:
+        ValueError: DEVLOG_DB_POOL_MODE が不正な場合
+    """
+    if DB_POOL_MODE not in ("queue", "transaction"):
+        raise ValueError(f"Invalid DEVLOG_DB_POOL_MODE: {DB_POOL_MODE}")
+    
+    # インメモリのSQLiteは接続ごとに別のデータベースになるため、デフォルトのプールを使う
+    if database_url.startswith("sqlite") and (":memory:" in database_url or database_url.endswith("://")):
+        return {}
+    
+    if DB_POOL_MODE == "transaction":
+        return {"poolclass": NullPool, "pool_pre_ping": DB_POOL_PRE_PING}
+    
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
 # SQLAlchemyエンジンの作成
 engine: Engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args=connect_args,
     # 開発環境ではSQLログを出力（本番環境では無効化すること）
-    echo=bool(os.getenv("DEVLOG_DEBUG", False))
+    echo=bool(os.getenv("DEVLOG_DEBUG", False)),
+    **pool_options(SQLALCHEMY_DATABASE_URL)
+)
+
+if engine.dialect.name == "sqlite":
+    configure_sqlite_engine(engine)
+
+# コネクションプールの統計情報
+pool_stats = instrument_engine(engine)
+
+
+def async_database_url(database_url: str) -> str:
+    """
+    同期ドライバのデータベースURLを非同期ドライバのURLに変換する
+    
+    sqlite は aiosqlite、postgresql は asyncpg を使用します。
+    既にドライバが指定されている非同期URLはそのまま返します。
+    
+    Args:
+        database_url: データベースURL
+    
+    Returns:
+        非同期ドライバのデータベースURL
+    """
+    scheme, sep, rest = database_url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect == "sqlite" and scheme != "sqlite+aiosqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if dialect in ("postgresql", "postgres") and scheme != "postgresql+asyncpg":
+        return f"postgresql+asyncpg{sep}{rest}"
+    return database_url
+
+
+# 非同期エンジンのデータベースURL（DEVLOG_ASYNC_DATABASE_URL で個別に指定可能）
+SQLALCHEMY_ASYNC_DATABASE_URL: str = os.getenv(
+    "DEVLOG_ASYNC_DATABASE_URL",
+    async_database_url(SQLALCHEMY_DATABASE_URL)
 )
 
+# 非同期エンジンの作成
+# MCPツールはイベントループ上で動作するため、クエリの待ち時間に他のクライアントの処理を進められる
+async_engine: AsyncEngine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    connect_args=connect_args,
+    echo=bool(os.getenv("DEVLOG_DEBUG", False)),
+    **pool_options(SQLALCHEMY_ASYNC_DATABASE_URL, is_async=True)
+)
+
+if async_engine.dialect.name == "sqlite":
+    configure_sqlite_engine(async_engine.sync_engine, SQLITE_READER_PRAGMAS if SQLITE_WRITER else None)
+
+async_pool_stats = instrument_engine(async_engine.sync_engine)
+
 # セッションファクトリの作成
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -41,6 +217,35 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# 非同期セッションファクトリの作成
+# コミット後に属性を遅延ロードするとイベントループ外でI/Oが発生するため、expire_on_commitは無効にする
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession
+)
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """
+    アプリケーションのエンジンのコネクションプールの状態を返す
+    
+    Returns:
+        プールのモード、使用中・オーバーフローの接続数、取得待ち時間などの統計情報
+    """
+    return {"mode": DB_POOL_MODE, **pool_status(engine.pool, pool_stats)}
+
+
+def get_async_pool_status() -> Dict[str, Any]:
+    """
+    非同期エンジンのコネクションプールの状態を返す
+    
+    Returns:
+        get_pool_status() と同じ形式の統計情報
+    """
+    return {"mode": DB_POOL_MODE, **pool_status(async_engine.pool, async_pool_stats)}
+
 
 class Base(DeclarativeBase):
     """
@@ -77,6 +282,43 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    非同期データベースセッションを取得する依存関数
+    
+    get_db() の非同期版です。
+    
+    Yields:
+        AsyncSession: 非同期データベースセッション
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_async_session(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    非同期セッション上で、Sessionを第一引数に取る同期関数を実行する
+    
+    AsyncSession.run_sync() により、同期のCRUD関数をそのまま非同期ドライバで
+    実行します。DBの待ち時間中はイベントループをブロックしません。
+    
+    Args:
+        fn: Sessionを第一引数に取る関数
+        *args: fnに渡す位置引数
+        **kwargs: fnに渡すキーワード引数
+    
+    Returns:
+        fnの戻り値
+    
+    Example:
+        ```python
+        project = await run_async_session(crud.project.get_project, project_id=1)
+        ```
+    """
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(fn, *args, **kwargs)
+
+
 def init_db() -> None:
     """
     データベースの初期化
@@ -88,5 +330,5 @@ def init_db() -> None:
         本番環境では、Alembicマイグレーションを使用することを推奨します。
         この関数は開発環境やテスト環境での利用を想定しています。
     """
-    from app.models import project, task, user, message  # Import all models
+    from app.models import project, task, user, message, read_cursor, unread_counter, cache_event  # Import all models
     Base.metadata.create_all(bind=engine) 
\ No newline at end of file
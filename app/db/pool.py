@@ -0,0 +1,145 @@
+"""
+コネクションプールの計測
+
+チェックアウト・チェックインの件数と、プールから接続を取得するまでの
+待ち時間を記録し、診断ツールから参照できるようにします。
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolStats:
+    """
+    コネクションプールの統計情報
+
+    複数スレッドから更新されるため、ロックで保護します。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_connect(self) -> None:
+        """新しいDBAPI接続の作成を記録"""
+        with self._lock:
+            self.connects += 1
+
+    def record_checkout(self) -> None:
+        """接続のチェックアウトを記録"""
+        with self._lock:
+            self.checkouts += 1
+
+    def record_checkin(self) -> None:
+        """接続のチェックインを記録"""
+        with self._lock:
+            self.checkins += 1
+
+    def record_wait(self, seconds: float) -> None:
+        """接続の取得にかかった時間を記録"""
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """現在の統計情報を辞書で返す"""
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "wait_count": self.waits,
+                "wait_time_total_ms": round(self.wait_total * 1000, 3),
+                "wait_time_max_ms": round(self.wait_max * 1000, 3),
+                "wait_time_avg_ms": round(self.wait_total * 1000 / self.waits, 3) if self.waits else 0.0,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """
+    接続の取得待ち時間を計測するQueuePool用のミックスイン
+
+    空きがない場合のpool_timeoutまでの待機や、オーバーフロー接続の
+    作成にかかった時間も含めて記録します。
+    """
+
+    stats: Optional[PoolStats] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.stats is not None:
+                self.stats.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() などでプールが作り直されても統計を引き継ぐ
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """取得待ち時間を計測するQueuePool"""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """取得待ち時間を計測する非同期エンジン用のQueuePool"""
+
+
+def instrument_engine(engine: Engine) -> PoolStats:
+    """
+    エンジンのコネクションプールに統計情報の記録を登録する
+
+    Args:
+        engine: 対象のエンジン
+
+    Returns:
+        記録先の統計情報
+    """
+    stats = PoolStats()
+    if isinstance(engine.pool, _InstrumentedPoolMixin):
+        engine.pool.stats = stats
+
+    event.listen(engine, "connect", lambda dbapi_connection, record: stats.record_connect())
+    event.listen(engine, "checkout", lambda dbapi_connection, record, proxy: stats.record_checkout())
+    event.listen(engine, "checkin", lambda dbapi_connection, record: stats.record_checkin())
+    return stats
+
+
+def pool_status(pool: Pool, stats: PoolStats) -> Dict[str, Any]:
+    """
+    コネクションプールの現在の状態と統計情報を返す
+
+    Args:
+        pool: 対象のプール
+        stats: instrument_engine() で登録した統計情報
+
+    Returns:
+        プールの種類、サイズ、使用中・オーバーフローの接続数と統計情報
+    """
+    counters = stats.snapshot()
+    status: Dict[str, Any] = {
+        "pool_class": type(pool).__name__,
+        "checked_out": counters["checkouts"] - counters["checkins"],
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "timeout": pool.timeout(),
+        })
+    status.update(counters)
+    return status
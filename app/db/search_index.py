@@ -0,0 +1,84 @@
+"""
+メッセージ全文検索インデックスの定義
+
+SQLiteではtrigramトークナイザーのFTS5仮想テーブルをトリガーで同期し、
+PostgreSQLではpg_trgm / tsvector のGINインデックスを使用します。
+どちらもスペースで区切られない日本語の部分一致検索に対応します。
+
+messagesテーブルの作成・削除に合わせてDDLを実行するため、
+init_db() やテストの create_all() でも自動的に作成されます。
+"""
+from sqlalchemy import DDL, Table, event
+
+
+# SQLite: 外部コンテンツ型のFTS5テーブルと同期用トリガー
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        content, content='messages', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF content ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+]
+
+SQLITE_SEARCH_DROP_DDL = [
+    "DROP TABLE IF EXISTS messages_fts",
+]
+
+# PostgreSQL: 式インデックスのため同期処理は不要
+POSTGRESQL_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX IF NOT EXISTS ix_messages_content_trgm
+    ON messages USING gin (content gin_trgm_ops) WHERE is_deleted = false
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_messages_content_tsv
+    ON messages USING gin (to_tsvector('simple', content)) WHERE is_deleted = false
+    """,
+]
+
+
+# モデルに定義されていない全文検索用のテーブル・インデックス。
+# FTS5は messages_fts_data などのシャドウテーブルも作成する
+SQLITE_SEARCH_TABLE = "messages_fts"
+POSTGRESQL_SEARCH_INDEXES = {"ix_messages_content_trgm", "ix_messages_content_tsv"}
+
+
+def is_search_index_object(name: str, type_: str) -> bool:
+    """
+    全文検索用のDDLで作成したオブジェクトかどうか
+    
+    alembic の include_object から呼び出し、自動生成（--autogenerate）で
+    削除対象として検出されないようにします。
+    """
+    if type_ == "table":
+        return name == SQLITE_SEARCH_TABLE or name.startswith(f"{SQLITE_SEARCH_TABLE}_")
+    if type_ == "index":
+        return name in POSTGRESQL_SEARCH_INDEXES
+    return False
+
+
+def register_search_index(table: Table) -> None:
+    """messagesテーブルの作成・削除時に全文検索用のDDLを実行するよう登録"""
+    for statement in SQLITE_SEARCH_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in SQLITE_SEARCH_DROP_DDL:
+        event.listen(table, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in POSTGRESQL_SEARCH_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
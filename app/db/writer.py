@@ -0,0 +1,304 @@
+"""
+SQLiteの書き込み専用スレッドとグループコミット
+
+SQLiteでは、ツールの呼び出しごとに別々の接続で書き込みトランザクションを
+コミットすると、同時に届いた書き込みが書き込みロックを奪い合い、それぞれが
+コミットの同期書き込みのコストを払います。
+
+このモジュールは、1本の専用接続を持つ書き込みスレッドにキューで書き込みを集め、
+同時に届いた書き込みを1つのトランザクションにまとめてコミットします。
+
+- キューの先頭の書き込みから WRITER_BATCH_WINDOW 秒待つか、WRITER_BATCH_SIZE 件
+  集まった時点で、まとめて実行してコミットします。
+- 書き込みごとに SAVEPOINT を作ったセッションで実行します。失敗した書き込みは
+  自分の SAVEPOINT までロールバックされ、呼び出し元に例外が返ります。
+  ほかの書き込みには影響しません。
+- crud 関数の commit() はフラッシュだけ行い、実際のコミットはまとめて1回行います。
+  before_commit のイベントは書き込みごとに SAVEPOINT の中で、after_commit のイベント
+  （キャッシュの無効化など）は実際のコミットの後に発火します。
+- まとめたコミット自体が失敗した場合は、1件ずつ実行し直します。
+
+読み取りは非同期エンジン（SQLITE_WRITER が有効な場合は読み取り専用）で行います。
+PostgreSQLでは使用しません（同時の書き込みとグループコミットはサーバーが行います）。
+"""
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.db.database import (
+    SQLALCHEMY_DATABASE_URL,
+    SQLITE_WRITER,
+    configure_sqlite_engine,
+    connect_args,
+    run_async_session,
+)
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# 1回のコミットにまとめる最大件数
+WRITER_BATCH_SIZE: int = int(os.getenv("DEVLOG_WRITER_BATCH_SIZE", "64"))
+
+# 最初の書き込みが届いてから、ほかの書き込みを待つ時間（秒）
+WRITER_BATCH_WINDOW: float = float(os.getenv("DEVLOG_WRITER_BATCH_WINDOW_MS", "2")) / 1000
+
+
+def create_writer_engine(database_url: str) -> Engine:
+    """
+    書き込みスレッド用のSQLiteエンジンを作成
+    
+    pysqlite の暗黙のトランザクション管理を無効にし、トランザクションを
+    BEGIN IMMEDIATE で開始します。書き込みロックを最初に取得するため、
+    読み取りから書き込みへのロックの昇格で失敗することがなく、SAVEPOINT も正しく動作します。
+    """
+    writer_engine = create_engine(
+        database_url,
+        connect_args={**connect_args, "isolation_level": None},
+        poolclass=NullPool,
+    )
+    configure_sqlite_engine(writer_engine)
+    
+    @event.listens_for(writer_engine, "begin")
+    def _begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    
+    return writer_engine
+
+
+class _GroupSession(Session):
+    """commit() でフラッシュだけ行い、グループコミットまで SAVEPOINT を保持するセッション"""
+    
+    def commit(self) -> None:
+        self.flush()
+
+
+@dataclass
+class _Job:
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    future: Future = field(default_factory=Future)
+
+
+class GroupCommitWriter:
+    """
+    書き込み専用スレッドでの書き込みのグループコミット
+    
+    スレッドは最初の書き込みで起動します。
+    """
+    
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = WRITER_BATCH_SIZE,
+        batch_window: float = WRITER_BATCH_WINDOW
+    ) -> None:
+        self.engine = engine
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._connection = None
+        self.batches = 0
+        self.jobs = 0
+        self.failed_jobs = 0
+        self.max_batch = 0
+        self.retried_batches = 0
+        self.commit_time = 0.0
+    
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """
+        Sessionを第一引数に取る関数を書き込みスレッドで実行する
+        
+        Returns:
+            コミット後に fn の戻り値（失敗した場合は例外）が設定される Future
+        """
+        job = _Job(fn, args, kwargs)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="devlog-writer", daemon=True)
+                self._thread.start()
+            self._queue.put(job)
+        return job.future
+    
+    def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """submit() してコミットを待ち、fn の戻り値を返す"""
+        return self.submit(fn, *args, **kwargs).result()
+    
+    async def run_async(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """run() の非同期版（コミットを待つ間イベントループをブロックしない）"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+    
+    def close(self) -> None:
+        """キューに残った書き込みをコミットしてからスレッドを止める"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join()
+    
+    def stats(self) -> Dict[str, Any]:
+        """コミット回数・まとめた件数などの統計情報を返す"""
+        return {
+            "enabled": True,
+            "batch_size": self.batch_size,
+            "batch_window_ms": self.batch_window * 1000,
+            "queued": self._queue.qsize(),
+            "batches": self.batches,
+            "jobs": self.jobs,
+            "failed_jobs": self.failed_jobs,
+            "retried_batches": self.retried_batches,
+            "max_batch": self.max_batch,
+            "avg_batch": round(self.jobs / self.batches, 2) if self.batches else 0.0,
+            "avg_commit_ms": round(self.commit_time * 1000 / self.batches, 3) if self.batches else 0.0,
+        }
+    
+    def _run(self) -> None:
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    return
+                batch, stop = self._collect(job)
+                self._execute(batch)
+                if stop:
+                    return
+        finally:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def _collect(self, first: _Job) -> Tuple[List[_Job], bool]:
+        # 最初の書き込みから batch_window 秒の間に届いた書き込みを、batch_size 件までまとめる
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return batch, True
+            batch.append(job)
+        return batch, False
+    
+    def _execute(self, batch: List[_Job]) -> None:
+        batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            self._commit(batch)
+        except Exception as e:
+            self._reset_connection()
+            if len(batch) == 1:
+                self.failed_jobs += 1
+                batch[0].future.set_exception(e)
+                return
+            # まとめたコミットが失敗した場合、原因の書き込みを特定するため1件ずつ実行し直す
+            logger.warning("Group commit of %d writes failed, retrying one by one", len(batch), exc_info=True)
+            self.retried_batches += 1
+            for job in batch:
+                try:
+                    self._commit([job])
+                except Exception as job_error:
+                    self._reset_connection()
+                    self.failed_jobs += 1
+                    job.future.set_exception(job_error)
+    
+    def _commit(self, batch: List[_Job]) -> None:
+        if self._connection is None:
+            self._connection = self.engine.connect()
+        connection = self._connection
+        
+        succeeded: List[Tuple[_Job, Session, Any]] = []
+        failed: List[Tuple[_Job, BaseException]] = []
+        transaction = connection.begin()
+        try:
+            for job in batch:
+                session = _GroupSession(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+                try:
+                    result = job.fn(session, *job.args, **job.kwargs)
+                    # commit() は before_commit を発火しないため、ここで発火する（無効化イベントの発行など）
+                    session.dispatch.before_commit(session)
+                    session.flush()
+                except Exception as e:
+                    # この書き込みの SAVEPOINT までだけ戻す
+                    try:
+                        session.rollback()
+                    finally:
+                        session.close()
+                    failed.append((job, e))
+                    continue
+                succeeded.append((job, session, result))
+            
+            started = time.perf_counter()
+            transaction.commit()
+            self.commit_time += time.perf_counter() - started
+        except BaseException:
+            for _, session, _ in succeeded:
+                session.close()
+            if transaction.is_active:
+                transaction.rollback()
+            raise
+        
+        self.batches += 1
+        self.jobs += len(batch)
+        self.max_batch = max(self.max_batch, len(batch))
+        
+        # コミット済みになってから、各セッションの after_commit（キャッシュの無効化など）を発火する
+        for job, session, result in succeeded:
+            try:
+                session.dispatch.after_commit(session)
+            except Exception:
+                logger.exception("after_commit hook failed for a group-committed write")
+            finally:
+                session.close()
+            job.future.set_result(result)
+        for job, error in failed:
+            self.failed_jobs += 1
+            job.future.set_exception(error)
+    
+    def _reset_connection(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.invalidate()
+                self._connection.close()
+            finally:
+                self._connection = None
+
+
+# アプリケーション全体で共有する書き込みスレッド（SQLITE_WRITER が無効な場合はNone）
+writer: Optional[GroupCommitWriter] = (
+    GroupCommitWriter(create_writer_engine(SQLALCHEMY_DATABASE_URL)) if SQLITE_WRITER else None
+)
+
+
+async def run_write_session(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    書き込みを行う、Sessionを第一引数に取る同期関数を実行する
+    
+    SQLITE_WRITER が有効な場合は書き込みスレッドでグループコミットし、
+    それ以外の場合は run_async_session() と同じく非同期セッションで実行します。
+    
+    Example:
+        ```python
+        message = await run_write_session(crud.message.create_message, message=data)
+        ```
+    """
+    if writer is not None:
+        return await writer.run_async(fn, *args, **kwargs)
+    return await run_async_session(fn, *args, **kwargs)
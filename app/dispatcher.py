@@ -0,0 +1,277 @@
+"""
+Tool dispatcher for DevLog
+
+Runs MCP tool calls in bounded execution lanes so that the event loop is
+never blocked by synchronous database work, and so that one kind of call
+cannot starve the others:
+
+- Each lane has its own thread pool, a concurrency limit and a bounded
+  wait queue. Synchronous tools run on the lane's threads; async tools
+  run on the event loop under the same limits.
+- When a lane's queue is full, the call is rejected immediately with
+  ToolBusyError, which tells the client to retry.
+- Individual tools can have a tighter concurrency limit than their lane.
+
+Lane limits are configured with DEVLOG_LANE_<NAME>_CONCURRENCY and
+DEVLOG_LANE_<NAME>_QUEUE environment variables.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Union
+
+from fastmcp.exceptions import ToolError
+
+
+# Default (concurrency, queue) per lane
+DEFAULT_LANES: Dict[str, tuple] = {
+    # Cheap lookups by ID
+    "fast": (8, 64),
+    # Writes and ordinary list calls
+    "default": (4, 32),
+    # Large lists, searches and whole-thread reads
+    "heavy": (2, 8),
+}
+
+
+class ToolBusyError(ToolError):
+    """Raised when a lane's queue is full; the call can be retried later"""
+
+    retryable = True
+
+    def __init__(self, lane: str, queued: int):
+        self.lane = lane
+        self.queued = queued
+        super().__init__(
+            f"Server busy: the '{lane}' lane has {queued} calls queued. "
+            "This error is retryable; retry after a short delay."
+        )
+
+
+class Lane:
+    """
+    A bounded execution lane
+
+    At most max_concurrency calls run at once and at most max_queue calls
+    wait for a slot; further calls are rejected with ToolBusyError.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        if max_concurrency < 1:
+            raise ValueError(f"Lane {name} needs a concurrency of at least 1")
+        if max_queue < 0:
+            raise ValueError(f"Lane {name} needs a non-negative queue size")
+
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"devlog-{name}")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.queued = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def admit(self) -> None:
+        """Reserve a queue slot, or reject the call if the queue is full"""
+        with self._lock:
+            if self.active + self.queued >= self.max_concurrency + self.max_queue:
+                self.rejected += 1
+                raise ToolBusyError(self.name, self.queued)
+            self.queued += 1
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        kwargs: Dict[str, Any],
+        tool_semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Any:
+        """
+        Run a tool function in this lane
+
+        Args:
+            fn: Sync or async tool function
+            kwargs: Keyword arguments for fn
+            tool_semaphore: Optional per-tool concurrency limit
+
+        Returns:
+            The tool's return value
+
+        Raises:
+            ToolBusyError: If the lane's queue is full
+        """
+        self.admit()
+        enqueued_at = time.perf_counter()
+        started = False
+        try:
+            async with _optional(tool_semaphore), self._semaphore:
+                self._start(time.perf_counter() - enqueued_at)
+                started = True
+                if inspect.iscoroutinefunction(fn):
+                    result = await fn(**kwargs)
+                else:
+                    loop = asyncio.get_running_loop()
+                    context = contextvars.copy_context()
+                    result = await loop.run_in_executor(
+                        self.executor, functools.partial(context.run, fn, **kwargs)
+                    )
+        except BaseException:
+            # Calls that raise and calls cancelled while queued are counted
+            # only as failed; completed counts successful returns
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            with self._lock:
+                if started:
+                    self.active -= 1
+                else:
+                    self.queued -= 1
+
+    def _start(self, waited: float) -> None:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.started += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the lane's current load and wait time statistics
+
+        completed counts calls that returned; failed counts calls that raised
+        or were cancelled, whether they were running or still queued.
+        """
+        with self._lock:
+            started = self.started
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queued": self.queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_time_avg_ms": round(self.wait_total * 1000 / started, 3) if started else 0.0,
+                "wait_time_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class _optional:
+    """Async context manager that acquires a semaphore only if one is given"""
+
+    def __init__(self, semaphore: Optional[asyncio.Semaphore]):
+        self.semaphore = semaphore
+
+    async def __aenter__(self):
+        if self.semaphore is not None:
+            await self.semaphore.acquire()
+
+    async def __aexit__(self, *exc_info):
+        if self.semaphore is not None:
+            self.semaphore.release()
+
+
+class ToolDispatcher:
+    """
+    Routes tool calls to execution lanes
+
+    Example:
+        ```python
+        @mcp.tool()
+        @dispatcher.tool(lane="fast")
+        def get_user(user_id: int) -> dict:
+            return get_user_tool(user_id=user_id)
+        ```
+    """
+
+    def __init__(self, lanes: Dict[str, Lane]):
+        self.lanes = lanes
+        self._tool_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def from_env(cls, defaults: Dict[str, tuple] = DEFAULT_LANES) -> "ToolDispatcher":
+        """Create a dispatcher whose lane limits can be overridden by environment variables"""
+        lanes = {}
+        for name, (concurrency, queue) in defaults.items():
+            prefix = f"DEVLOG_LANE_{name.upper()}"
+            lanes[name] = Lane(
+                name,
+                max_concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", concurrency)),
+                max_queue=int(os.getenv(f"{prefix}_QUEUE", queue)),
+            )
+        return cls(lanes)
+
+    def tool(
+        self,
+        lane: Union[str, Callable[[Dict[str, Any]], str]] = "default",
+        max_concurrency: Optional[int] = None
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Decorate a tool function so that its calls run through a lane
+
+        Args:
+            lane: Lane name, or a function that picks the lane from the
+                call's keyword arguments (e.g. by requested limit)
+            max_concurrency: Per-tool concurrency limit within the lane (optional)
+
+        Returns:
+            Decorator producing an async function with the same signature
+        """
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            if isinstance(lane, str) and lane not in self.lanes:
+                raise ValueError(f"Unknown lane: {lane}")
+
+            tool_semaphore = None
+            if max_concurrency is not None:
+                tool_semaphore = self._tool_limits.setdefault(fn.__name__, asyncio.Semaphore(max_concurrency))
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+                lane_name = lane(arguments) if callable(lane) else lane
+                return await self.lanes[lane_name].run(fn, arguments, tool_semaphore)
+
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-lane queue depth, concurrency and wait time statistics"""
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+
+
+def heavy_if_limit_above(threshold: int, lane: str = "default") -> Callable[[Dict[str, Any]], str]:
+    """
+    Lane selector that sends calls asking for more than threshold rows to the heavy lane
+
+    Args:
+        threshold: Largest limit that stays in the given lane
+        lane: Lane for calls at or below the threshold
+    """
+    def select(arguments: Dict[str, Any]) -> str:
+        limit = arguments.get("limit")
+        return "heavy" if limit is not None and limit > threshold else lane
+    return select
+
+
+# Dispatcher shared by the MCP server
+dispatcher = ToolDispatcher.from_env()
@@ -18,14 +18,22 @@ Environment Variables:
     DEVLOG_DATABASE_URL: Database connection URL
     DEVLOG_DEBUG: Enable debug mode (default: False)
     DEVLOG_LOG_LEVEL: Logging level (default: INFO)
+    DEVLOG_DB_POOL_MODE: "queue" (default) or "transaction" for PgBouncer
+    DEVLOG_DB_POOL_SIZE / DEVLOG_DB_MAX_OVERFLOW / DEVLOG_DB_POOL_RECYCLE /
+    DEVLOG_DB_POOL_TIMEOUT / DEVLOG_DB_POOL_PRE_PING: Connection pool settings
+    DEVLOG_LANE_<FAST|DEFAULT|HEAVY>_CONCURRENCY / _QUEUE: Tool dispatcher lane limits
 """
 
 import logging
 import os
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
+import anyio
 from fastmcp import FastMCP
-from app.db.database import init_db
+from app.db.database import SessionLocal, async_engine, init_db
+from app.db.writer import writer
+from app.dispatcher import dispatcher, heavy_if_limit_above
 
 # Import all tools
 from app.tools import (
@@ -41,30 +49,47 @@ from app.tools import (
     get_task_tool,
     update_task_tool,
     delete_task_tool,
+    bulk_update_tasks_tool,
     # User tools
     create_user_tool,
     get_users_tool,
     get_user_tool,
     # Message tools
-    create_message_tool,
-    create_direct_message_tool,
-    get_messages_tool,
-    get_direct_messages_tool,
-    get_thread_messages_tool,
-    get_unread_messages_tool,
-    get_message_tool,
-    mark_message_as_read_tool,
-    mark_conversation_as_read_tool,
-    delete_message_tool,
+    create_message_tool_async,
+    create_messages_tool_async,
+    create_direct_message_tool_async,
+    get_messages_tool_async,
+    get_direct_messages_tool_async,
+    get_thread_messages_tool_async,
+    get_thread_tree_tool_async,
+    get_unread_messages_tool_async,
+    get_message_tool_async,
+    mark_message_as_read_tool_async,
+    mark_messages_as_read_tool_async,
+    mark_conversation_as_read_tool_async,
+    delete_message_tool_async,
+    mark_channel_read_tool_async,
+    get_channel_unread_messages_tool_async,
+    get_unread_counts_tool_async,
+    search_messages_tool_async,
+    get_conversations_tool_async,
+    # Diagnostics tools
+    get_diagnostics_tool,
 )
 
+from app.tools.serializers import dumps
+
 # Import all resource handlers
 from app.resources import (
     project_resource_handler,
     task_resource_handler,
     user_resource_handler,
     messages_recent_resource_handler,
+    render_cache,
 )
+from app.crud.cache import generations
+from app.crud.invalidation import invalidation_bus
+from app.crud.recent import recent_messages
 
 # Configure logging
 log_level = os.getenv("DEVLOG_LOG_LEVEL", "INFO").upper()
@@ -75,42 +100,93 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """
+    Listen for other processes' writes and load the latest messages on startup;
+    flush queued writes and release connections on shutdown
+    """
+    if invalidation_bus is not None:
+        # Started before seeding so writes committed elsewhere in the meantime are not missed
+        await anyio.to_thread.run_sync(invalidation_bus.start)
+    await anyio.to_thread.run_sync(_seed_recent_messages)
+    try:
+        yield
+    finally:
+        # aiosqlite keeps a worker thread per connection, which would block interpreter exit.
+        # Shielded because the server task group may already be cancelled at this point.
+        with anyio.CancelScope(shield=True):
+            if writer is not None:
+                # Commit the writes still queued for the SQLite writer before exiting
+                await anyio.to_thread.run_sync(writer.close)
+            if invalidation_bus is not None:
+                await anyio.to_thread.run_sync(invalidation_bus.close)
+            await async_engine.dispose()
+
+def _seed_recent_messages() -> None:
+    # messages://recent is then served from memory from the first read (see app.crud.recent).
+    # The buffer also loads on first use, so a failure here must not stop the server.
+    try:
+        with SessionLocal() as db:
+            recent_messages.seed(db)
+    except Exception:
+        logger.warning("Could not load recent messages on startup", exc_info=True)
+
 # Create FastMCP instance
 mcp = FastMCP("DevLog","""
 This tool is designed for developers to share updates on their progress, current tasks, and upcoming work — like a lightweight Slack for team coordination.
-""")
+""", lifespan=lifespan, tool_serializer=dumps)
 
 # Initialize database on startup
 init_db()
 
+# Every tool except get_diagnostics runs through a dispatcher lane: cheap ID
+# lookups use "fast", large lists, searches and whole threads use "heavy"
+
 # Register Project Tools
 @mcp.tool()
+@dispatcher.tool(lane="default")
 def create_project(name: str, description: str = None) -> dict:
     """Create a new project"""
     return create_project_tool(name=name, description=description)
 
 @mcp.tool()
-def get_projects() -> list:
-    """Get all projects"""
-    return get_projects_tool()
+@dispatcher.tool(lane=heavy_if_limit_above(100))
+def get_projects(limit: int = 100, cursor: str = None, fields: list[str] = None) -> list | dict:
+    """Get all projects (pass cursor="" to receive a next_cursor for paging, fields to select columns)"""
+    return get_projects_tool(limit=limit, cursor=cursor, fields=fields)
 
 @mcp.tool()
-def get_project(project_id: int) -> dict:
+@dispatcher.tool(lane="fast")
+def get_project(project_id: int, fields: list[str] = None) -> dict:
     """Get a specific project by ID"""
-    return get_project_tool(project_id=project_id)
+    return get_project_tool(project_id=project_id, fields=fields)
 
 @mcp.tool()
-def update_project(project_id: int, name: str = None, description: str = None) -> dict:
+@dispatcher.tool(lane="default")
+def update_project(
+    project_id: int,
+    name: str = None,
+    description: str = None,
+    expected_updated_at: str = None
+) -> dict:
     """Update a project"""
-    return update_project_tool(project_id=project_id, name=name, description=description)
+    return update_project_tool(
+        project_id=project_id,
+        name=name,
+        description=description,
+        expected_updated_at=expected_updated_at
+    )
 
 @mcp.tool()
+@dispatcher.tool(lane="default")
 def delete_project(project_id: int) -> dict:
     """Delete a project"""
     return delete_project_tool(project_id=project_id)
 
 # Register Task Tools
 @mcp.tool()
+@dispatcher.tool(lane="default")
 def create_task(
     title: str,
     project_id: int,
@@ -128,22 +204,40 @@ def create_task(
     )
 
 @mcp.tool()
-def get_tasks(project_id: int = None, status: str = None, assignee_id: int = None) -> list:
-    """Get tasks with optional filtering"""
-    return get_tasks_tool(project_id=project_id, status=status, assignee_id=assignee_id)
+@dispatcher.tool(lane=heavy_if_limit_above(100))
+def get_tasks(
+    project_id: int = None,
+    status: str = None,
+    assignee_id: int = None,
+    limit: int = 100,
+    cursor: str = None,
+    fields: list[str] = None
+) -> list | dict:
+    """Get tasks with optional filtering (pass cursor="" to receive a next_cursor for paging, fields to select columns)"""
+    return get_tasks_tool(
+        project_id=project_id,
+        status=status,
+        assignee_id=assignee_id,
+        limit=limit,
+        cursor=cursor,
+        fields=fields
+    )
 
 @mcp.tool()
-def get_task(task_id: int) -> dict:
+@dispatcher.tool(lane="fast")
+def get_task(task_id: int, fields: list[str] = None) -> dict:
     """Get a specific task by ID"""
-    return get_task_tool(task_id=task_id)
+    return get_task_tool(task_id=task_id, fields=fields)
 
 @mcp.tool()
+@dispatcher.tool(lane="default")
 def update_task(
     task_id: int,
     title: str = None,
     description: str = None,
     status: str = None,
-    assignee_id: int = None
+    assignee_id: int = None,
+    expected_updated_at: str = None
 ) -> dict:
     """Update a task"""
     return update_task_tool(
@@ -151,33 +245,65 @@ def update_task(
         title=title,
         description=description,
         status=status,
-        assignee_id=assignee_id
+        assignee_id=assignee_id,
+        expected_updated_at=expected_updated_at
     )
 
 @mcp.tool()
+@dispatcher.tool(lane="default")
 def delete_task(task_id: int) -> dict:
     """Delete a task"""
     return delete_task_tool(task_id=task_id)
 
+@mcp.tool()
+@dispatcher.tool(lane="heavy")
+def bulk_update_tasks(
+    task_ids: list[int] = None,
+    project_id: int = None,
+    assignee_id: int = None,
+    status: str = None,
+    set_status: str = None,
+    set_assignee_id: int = None,
+    unassign: bool = False,
+    set_project_id: int = None,
+    summary_user_id: int = None
+) -> dict:
+    """Reassign, change the status of, or move many tasks at once (selected by IDs and/or filters)"""
+    return bulk_update_tasks_tool(
+        task_ids=task_ids,
+        project_id=project_id,
+        assignee_id=assignee_id,
+        status=status,
+        set_status=set_status,
+        set_assignee_id=set_assignee_id,
+        unassign=unassign,
+        set_project_id=set_project_id,
+        summary_user_id=summary_user_id
+    )
+
 # Register User Tools
 @mcp.tool()
+@dispatcher.tool(lane="default")
 def create_user(username: str, email: str) -> dict:
     """Create a new user"""
     return create_user_tool(username=username, email=email)
 
 @mcp.tool()
-def get_users() -> list:
-    """Get all users"""
-    return get_users_tool()
+@dispatcher.tool(lane=heavy_if_limit_above(100))
+def get_users(limit: int = 100, cursor: str = None, fields: list[str] = None) -> list | dict:
+    """Get all users (pass cursor="" to receive a next_cursor for paging, fields to select columns)"""
+    return get_users_tool(limit=limit, cursor=cursor, fields=fields)
 
 @mcp.tool()
-def get_user(user_id: int) -> dict:
+@dispatcher.tool(lane="fast")
+def get_user(user_id: int, fields: list[str] = None) -> dict:
     """Get a specific user by ID"""
-    return get_user_tool(user_id=user_id)
+    return get_user_tool(user_id=user_id, fields=fields)
 
 # Register Message Tools
 @mcp.tool()
-def create_message(
+@dispatcher.tool(lane="default")
+async def create_message(
     content: str,
     user_id: int,
     message_type: str = "comment",
@@ -187,7 +313,7 @@ def create_message(
     recipient_id: int = None
 ) -> dict:
     """Create a new message (including direct messages and threaded replies)"""
-    return create_message_tool(
+    return await create_message_tool_async(
         content=content,
         user_id=user_id,
         message_type=message_type,
@@ -198,14 +324,21 @@ def create_message(
     )
 
 @mcp.tool()
-def create_direct_message(
+@dispatcher.tool(lane="heavy")
+async def create_messages(messages: list[dict], atomic: bool = False) -> dict:
+    """Create many messages in one transaction (e.g. CI status posts), reporting failures per item"""
+    return await create_messages_tool_async(messages=messages, atomic=atomic)
+
+@mcp.tool()
+@dispatcher.tool(lane="default")
+async def create_direct_message(
     content: str,
     user_id: int,
     recipient_id: int,
     parent_id: int = None
 ) -> dict:
     """Create a direct message between two users"""
-    return create_direct_message_tool(
+    return await create_direct_message_tool_async(
         content=content,
         user_id=user_id,
         recipient_id=recipient_id,
@@ -213,7 +346,8 @@ def create_direct_message(
     )
 
 @mcp.tool()
-def get_messages(
+@dispatcher.tool(lane=heavy_if_limit_above(100))
+async def get_messages(
     project_id: int = None,
     task_id: int = None,
     user_id: int = None,
@@ -221,10 +355,12 @@ def get_messages(
     message_type: str = None,
     parent_id: int = None,
     include_deleted: bool = False,
-    limit: int = 100
-) -> list:
-    """Get messages with optional filtering"""
-    return get_messages_tool(
+    limit: int = 100,
+    cursor: str = None,
+    fields: list[str] = None
+) -> list | dict:
+    """Get messages with optional filtering (pass cursor="" to receive a next_cursor for paging, fields to select columns)"""
+    return await get_messages_tool_async(
         project_id=project_id,
         task_id=task_id,
         user_id=user_id,
@@ -232,103 +368,257 @@ def get_messages(
         message_type=message_type,
         parent_id=parent_id,
         include_deleted=include_deleted,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        fields=fields
     )
 
 @mcp.tool()
-def get_direct_messages(
+@dispatcher.tool(lane=heavy_if_limit_above(100))
+async def get_direct_messages(
     user_id: int,
     other_user_id: int,
-    limit: int = 100
+    limit: int = 100,
+    fields: list[str] = None
 ) -> list:
     """Get direct messages between two users"""
-    return get_direct_messages_tool(
+    return await get_direct_messages_tool_async(
         user_id=user_id,
         other_user_id=other_user_id,
-        limit=limit
+        limit=limit,
+        fields=fields
     )
 
 @mcp.tool()
-def get_thread_messages(
+@dispatcher.tool(lane=heavy_if_limit_above(100))
+async def get_thread_messages(
     parent_id: int,
     limit: int = 100
 ) -> list:
     """Get all replies to a specific message (thread)"""
-    return get_thread_messages_tool(
+    return await get_thread_messages_tool_async(
         parent_id=parent_id,
         limit=limit
     )
 
 @mcp.tool()
-def get_unread_messages(
+@dispatcher.tool(lane="heavy")
+async def get_thread_tree(
+    root_id: int,
+    max_depth: int = 10,
+    limit: int = 500
+) -> list:
+    """Get a whole thread with all nested replies, in path order with depth information"""
+    return await get_thread_tree_tool_async(
+        root_id=root_id,
+        max_depth=max_depth,
+        limit=limit
+    )
+
+@mcp.tool()
+@dispatcher.tool(lane="default")
+async def get_unread_messages(
     user_id: int,
     message_type: str = None
 ) -> list:
     """Get unread messages for a user"""
-    return get_unread_messages_tool(
+    return await get_unread_messages_tool_async(
         user_id=user_id,
         message_type=message_type
     )
 
 @mcp.tool()
-def mark_message_as_read(message_id: int) -> dict:
+@dispatcher.tool(lane="default")
+async def mark_message_as_read(message_id: int) -> dict:
     """Mark a specific message as read"""
-    return mark_message_as_read_tool(message_id=message_id)
+    return await mark_message_as_read_tool_async(message_id=message_id)
+
+@mcp.tool()
+@dispatcher.tool(lane="default")
+async def mark_messages_as_read(message_ids: list[int]) -> dict:
+    """Mark many messages as read in one update and return how many were unread"""
+    return await mark_messages_as_read_tool_async(message_ids=message_ids)
 
 @mcp.tool()
-def mark_conversation_as_read(user_id: int, other_user_id: int) -> dict:
+@dispatcher.tool(lane="default")
+async def mark_conversation_as_read(user_id: int, other_user_id: int) -> dict:
     """Mark all messages in a conversation as read"""
-    return mark_conversation_as_read_tool(
+    return await mark_conversation_as_read_tool_async(
         user_id=user_id,
         other_user_id=other_user_id
     )
 
 @mcp.tool()
-def delete_message(message_id: int) -> dict:
+@dispatcher.tool(lane="default")
+async def mark_channel_read(
+    user_id: int,
+    project_id: int = None,
+    task_id: int = None,
+    peer_id: int = None,
+    up_to_message_id: int = None
+) -> dict:
+    """Mark a project, task or direct message channel as read up to a message (default: its latest message)"""
+    return await mark_channel_read_tool_async(
+        user_id=user_id,
+        project_id=project_id,
+        task_id=task_id,
+        peer_id=peer_id,
+        up_to_message_id=up_to_message_id
+    )
+
+@mcp.tool()
+@dispatcher.tool(lane=heavy_if_limit_above(100))
+async def get_channel_unread_messages(
+    user_id: int,
+    project_id: int = None,
+    task_id: int = None,
+    peer_id: int = None,
+    limit: int = 100
+) -> list:
+    """Get messages in a project, task or direct message channel newer than the user's read cursor"""
+    return await get_channel_unread_messages_tool_async(
+        user_id=user_id,
+        project_id=project_id,
+        task_id=task_id,
+        peer_id=peer_id,
+        limit=limit
+    )
+
+@mcp.tool()
+@dispatcher.tool(lane="fast")
+async def get_unread_counts(user_id: int) -> dict:
+    """Get unread message counts per project, task and direct message channel for a user"""
+    return await get_unread_counts_tool_async(user_id=user_id)
+
+@mcp.tool()
+@dispatcher.tool(lane="heavy")
+async def search_messages(
+    query: str,
+    project_id: int = None,
+    task_id: int = None,
+    since: str = None,
+    limit: int = 20,
+    cursor: str = None
+) -> dict:
+    """Full-text search over messages, returning ranked results with highlighted snippets"""
+    return await search_messages_tool_async(
+        query=query,
+        project_id=project_id,
+        task_id=task_id,
+        since=since,
+        limit=limit,
+        cursor=cursor
+    )
+
+@mcp.tool()
+@dispatcher.tool(lane="heavy")
+async def get_conversations(
+    user_id: int,
+    limit: int = 20,
+    cursor: str = None
+) -> dict:
+    """Get a user's conversations with the latest message and unread count for each, most recent first"""
+    return await get_conversations_tool_async(
+        user_id=user_id,
+        limit=limit,
+        cursor=cursor
+    )
+
+@mcp.tool()
+@dispatcher.tool(lane="default")
+async def delete_message(message_id: int) -> dict:
     """Delete a message (soft delete)"""
-    return delete_message_tool(message_id=message_id)
+    return await delete_message_tool_async(message_id=message_id)
 
 @mcp.tool()
-def get_message(message_id: int) -> dict:
+@dispatcher.tool(lane="fast")
+async def get_message(message_id: int, fields: list[str] = None) -> dict:
     """Get a specific message by ID"""
-    return get_message_tool(message_id=message_id)
+    return await get_message_tool_async(message_id=message_id, fields=fields)
+
+# Register Diagnostics Tools
+@mcp.tool()
+def get_diagnostics() -> dict:
+    """Get server diagnostics such as live database connection pool statistics"""
+    return get_diagnostics_tool()
 
 # Register Resources
+# Resource text is cached per resource and reused until a write bumps one of the
+# generations it was rendered at (see app.resources.render_cache).
+def _resource_id(value: str) -> Any:
+    """Normalize a URI id so that "1" and "01" share generations and cache entries"""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
 @mcp.resource("project://{project_id}")
 def project_resource(project_id: str) -> str:
-    """Get project information and optionally related tasks"""
-    result = project_resource_handler(project_id=project_id, include_tasks=True)
-    return f"Project: {result['name']}\nDescription: {result.get('description', 'No description')}\n\nTasks: {len(result.get('tasks', []))} tasks"
+    """Get project information and its number of tasks"""
+    entity_id = _resource_id(project_id)
+    # The task count changes with any task write, so the Task generation is part of the version
+    return render_cache.get_or_render(
+        ("project", entity_id),
+        (generations.entity("Project", entity_id), generations.model("Task")),
+        lambda: _render_project(project_id)
+    )
+
+def _render_project(project_id: str) -> str:
+    result = project_resource_handler(project_id=project_id, include_task_count=True)
+    return f"Project: {result['name']}\nDescription: {result.get('description', 'No description')}\n\nTasks: {result['task_count']} tasks"
 
 @mcp.resource("task://{task_id}")
 def task_resource(task_id: str) -> str:
     """Get task information"""
+    entity_id = _resource_id(task_id)
+    return render_cache.get_or_render(
+        ("task", entity_id),
+        (generations.entity("Task", entity_id),),
+        lambda: _render_task(task_id)
+    )
+
+def _render_task(task_id: str) -> str:
     result = task_resource_handler(task_id=task_id)
     return f"Task: {result['title']}\nStatus: {result['status']}\nDescription: {result.get('description', 'No description')}"
 
 @mcp.resource("user://{user_id}")
 def user_resource(user_id: str) -> str:
     """Get user information"""
-    result = user_resource_handler(user_id=user_id)
+    entity_id = _resource_id(user_id)
+    return render_cache.get_or_render(
+        ("user", entity_id),
+        (generations.entity("User", entity_id),),
+        lambda: _render_user(user_id)
+    )
+
+def _render_user(user_id: str) -> str:
+    result = user_resource_handler(user_identifier=user_id)
     return f"User: {result['username']}\nEmail: {result['email']}"
 
 @mcp.resource("messages://{type}")
 def messages_resource(type: str) -> str:
     """Get messages by type (e.g., recent, all, etc.)"""
     if type == "recent":
-        result = messages_recent_resource_handler(limit=20)
-        messages = result.get('messages', [])
-        
-        if not messages:
-            return "Recent Messages:\n\nNo messages found."
-        
-        messages_text = "\n".join([
-            f"[{msg['created_at']}] {msg['user_id']}: {msg['content']}"
-            for msg in messages
-        ])
-        return f"Recent Messages:\n\n{messages_text}"
+        return render_cache.get_or_render(
+            ("messages", type),
+            (generations.model("Message"),),
+            _render_recent_messages
+        )
     else:
         return f"Message type '{type}' is not supported. Available types: recent"
 
+def _render_recent_messages() -> str:
+    result = messages_recent_resource_handler(limit=20)
+    messages = result.get('messages', [])
+    
+    if not messages:
+        return "Recent Messages:\n\nNo messages found."
+    
+    messages_text = "\n".join([
+        f"[{msg['created_at']}] {msg['user_id']}: {msg['content']}"
+        for msg in messages
+    ])
+    return f"Recent Messages:\n\n{messages_text}"
+
 if __name__ == "__main__":
     mcp.run()
\ No newline at end of file
@@ -7,5 +7,8 @@ from app.models.project import Project
 from app.models.task import Task
 from app.models.user import User
 from app.models.message import Message
+from app.models.read_cursor import ReadCursor
+from app.models.unread_counter import UnreadCounter
+from app.models.cache_event import CacheEvent
 
-__all__ = ["Project", "Task", "User", "Message"]
+__all__ = ["Project", "Task", "User", "Message", "ReadCursor", "UnreadCounter", "CacheEvent"]
@@ -0,0 +1,34 @@
+"""
+キャッシュ無効化イベントモデルの定義
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.database import Base
+
+
+class CacheEvent(Base):
+    """
+    キャッシュ無効化イベントモデル
+    
+    SQLiteを共有する複数のプロセス間で、プロセス内キャッシュの無効化を伝えるためのログです。
+    書き込みと同じトランザクションで追加され、他のプロセスは PRAGMA data_version の
+    変化を検知したときに、前回より大きいIDのイベントを読み込みます（app.crud.invalidation）。
+    IDは再利用されないよう AUTOINCREMENT にしています（古いイベントは定期的に削除されます）。
+    """
+    __tablename__ = "cache_events"
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True)
+    origin = Column(String(64), nullable=False)  # 書き込んだプロセスの識別子
+    model = Column(String(50), nullable=False)  # User, Project, Task, Message
+    entity_id = Column(Integer, nullable=True)  # NULLはモデルのすべてのエンティティ
+    generation = Column(Integer, nullable=False)  # 書き込んだプロセスでの世代番号
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    
+    def __str__(self):
+        """文字列表現"""
+        return f"<CacheEvent(id={self.id}, model='{self.model}', entity_id={self.entity_id}, origin='{self.origin}')>"
+    
+    def __repr__(self):
+        """開発者向けの文字列表現"""
+        return self.__str__()
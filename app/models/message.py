@@ -2,9 +2,10 @@
 メッセージモデルの定義
 """
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.db.search_index import register_search_index
 
 
 class Message(Base):
@@ -24,6 +25,37 @@ class Message(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
     
+    # スレッドの集計値（返信の作成・論理削除時に crud.message で更新される非正規化カラム）
+    reply_count = Column(Integer, default=0, nullable=False)  # 削除されていない直接の返信数
+    last_reply_at = Column(DateTime, nullable=True)  # 最新の返信の作成日時
+    last_reply_id = Column(Integer, nullable=True)  # 最新の返信のID
+    participant_count = Column(Integer, default=0, nullable=False)  # 返信したユーザー数
+    
+    # よく使われる絞り込みに対応する複合インデックス
+    # 論理削除済みの行は対象外とする部分インデックス（SQLite / PostgreSQL）
+    __table_args__ = (
+        Index(
+            "ix_messages_project_id_created_at", project_id, created_at,
+            sqlite_where=is_deleted == False, postgresql_where=is_deleted == False,
+        ),
+        Index(
+            "ix_messages_task_id_created_at", task_id, created_at,
+            sqlite_where=is_deleted == False, postgresql_where=is_deleted == False,
+        ),
+        Index(
+            "ix_messages_recipient_id_is_read", recipient_id, is_read,
+            sqlite_where=is_deleted == False, postgresql_where=is_deleted == False,
+        ),
+        Index(
+            "ix_messages_parent_id_created_at", parent_id, created_at,
+            sqlite_where=is_deleted == False, postgresql_where=is_deleted == False,
+        ),
+        Index(
+            "ix_messages_user_id_recipient_id_created_at", user_id, recipient_id, created_at,
+            sqlite_where=is_deleted == False, postgresql_where=is_deleted == False,
+        ),
+    )
+    
     # リレーションシップ
     user = relationship("User", back_populates="messages", foreign_keys=[user_id])
     recipient = relationship("User", foreign_keys=[recipient_id])
@@ -57,4 +89,8 @@ class Message(Base):
     @property
     def is_task_message(self) -> bool:
         """タスクメッセージかどうかを判定"""
-        return self.task_id is not None 
\ No newline at end of file
+        return self.task_id is not None
+
+
+# 全文検索インデックス（SQLite FTS5 / PostgreSQL GIN）を登録
+register_search_index(Message.__table__)
@@ -0,0 +1,30 @@
+"""
+既読カーソルモデルの定義
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from app.db.database import Base
+
+
+class ReadCursor(Base):
+    """
+    既読カーソルモデル
+    
+    ユーザーごと・チャンネルごとに最後に読んだメッセージIDを保持します。
+    チャンネル内でこのIDより大きいメッセージが未読として扱われます。
+    """
+    __tablename__ = "read_cursors"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    channel_type = Column(String(20), primary_key=True)  # project, task, dm
+    channel_id = Column(Integer, primary_key=True)  # プロジェクトID / タスクID / DM相手のユーザーID
+    last_read_message_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    
+    def __str__(self):
+        """文字列表現"""
+        return f"<ReadCursor(user_id={self.user_id}, channel='{self.channel_type}:{self.channel_id}', last_read_message_id={self.last_read_message_id})>"
+    
+    def __repr__(self):
+        """開発者向けの文字列表現"""
+        return self.__str__()
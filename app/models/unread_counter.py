@@ -0,0 +1,31 @@
+"""
+未読カウンターモデルの定義
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from app.db.database import Base
+
+
+class UnreadCounter(Base):
+    """
+    未読カウンターモデル
+    
+    ユーザーごと・チャンネルごとの未読メッセージ数を保持します。
+    メッセージの作成・既読化・削除と同じトランザクションで更新されるため、
+    未読数の取得でmessagesテーブルを参照する必要がありません。
+    """
+    __tablename__ = "unread_counters"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    channel_type = Column(String(20), primary_key=True)  # project, task, dm
+    channel_id = Column(Integer, primary_key=True)  # プロジェクトID / タスクID / DM相手のユーザーID
+    unread_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    
+    def __str__(self):
+        """文字列表現"""
+        return f"<UnreadCounter(user_id={self.user_id}, channel='{self.channel_type}:{self.channel_id}', unread_count={self.unread_count})>"
+    
+    def __repr__(self):
+        """開発者向けの文字列表現"""
+        return self.__str__()
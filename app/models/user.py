@@ -19,7 +19,7 @@ class User(Base):
     
     # リレーションシップ
     assigned_tasks = relationship("Task", back_populates="assignee")
-    messages = relationship("Message", back_populates="user")
+    messages = relationship("Message", back_populates="user", foreign_keys="Message.user_id")
     
     def __str__(self):
         """文字列表現"""
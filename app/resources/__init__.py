@@ -8,10 +8,12 @@ from .project_resources import project_resource_handler
 from .task_resources import task_resource_handler
 from .user_resources import user_resource_handler
 from .message_resources import messages_recent_resource_handler
+from .render_cache import render_cache
 
 __all__ = [
     "project_resource_handler",
     "task_resource_handler", 
     "user_resource_handler",
     "messages_recent_resource_handler",
+    "render_cache",
 ] 
\ No newline at end of file
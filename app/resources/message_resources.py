@@ -12,6 +12,8 @@ from typing import Dict, Any, Optional, List
 from app.db.database import SessionLocal
 from app.models.message import Message as MessageModel
 from app import crud
+from app.models.user import User as UserModel
+from app.tools.serializers import serializer
 
 
 def messages_recent_resource_handler(
@@ -32,45 +34,51 @@ def messages_recent_resource_handler(
         user_id: Filter by user ID (optional)
         message_type: Filter by message type (optional)
         include_user_info: Whether to include user information for each message
-        
+    
     Returns:
         Recent messages information as dictionary
     """
+    serialize_message = serializer(MessageModel, "summary")
+    serialize_user = serializer(UserModel, "ref")
+    
     db = SessionLocal()
     try:
-        # Get messages with filters
-        messages = crud.message.get_messages(
-            db=db,
-            project_id=project_id,
-            task_id=task_id,
-            user_id=user_id,
-            message_type=message_type,
-            limit=limit
-        )
+        # The latest messages overall or per project are kept in memory (crud.recent);
+        # other filters, or more messages than it holds, go to the database
+        messages = None
+        if task_id is None and user_id is None and message_type is None:
+            messages = crud.recent.recent_messages.latest(db=db, limit=limit, project_id=project_id)
+        
+        if messages is None:
+            # Get messages with filters as plain rows (no ORM instances)
+            messages = crud.read.select_messages(
+                db=db,
+                project_id=project_id,
+                task_id=task_id,
+                user_id=user_id,
+                message_type=message_type,
+                limit=limit,
+                fields=list(serialize_message.fields)
+            )
+        
+        # Load the authors of all messages with one query
+        users = {}
+        if include_user_info:
+            users = crud.read.select_users_by_id(
+                db=db,
+                user_ids=[message["user_id"] for message in messages if message["user_id"]],
+                fields=list(serialize_user.fields)
+            )
         
         # Build messages response
         message_list = []
         for message in messages:
-            message_dict = {
-                "id": message.id,
-                "content": message.content,
-                "message_type": message.message_type,
-                "user_id": message.user_id,
-                "project_id": message.project_id,
-                "task_id": message.task_id,
-                "parent_id": message.parent_id,
-                "created_at": message.created_at.isoformat() if message.created_at else None
-            }
+            message_dict = serialize_message(message)
             
             # Include user information if requested
-            if include_user_info and message.user_id:
-                user = crud.user.get_user(db=db, user_id=message.user_id)
-                if user:
-                    message_dict["user"] = {
-                        "id": user.id,
-                        "username": user.username,
-                        "email": user.email
-                    }
+            user = users.get(message["user_id"])
+            if user:
+                message_dict["user"] = serialize_user(user)
             
             message_list.append(message_dict)
         
@@ -11,12 +11,15 @@ from typing import Dict, Any, Optional, List
 
 from app.db.database import SessionLocal
 from app.models.project import Project as ProjectModel
+from app.models.task import Task as TaskModel
 from app import crud
+from app.tools.serializers import serializer
 
 
 def project_resource_handler(
     project_id: Any,
-    include_tasks: bool = False
+    include_tasks: bool = False,
+    include_task_count: bool = False
 ) -> Dict[str, Any]:
     """
     Handle project resource requests
@@ -24,10 +27,12 @@ def project_resource_handler(
     Args:
         project_id: Project ID to retrieve
         include_tasks: Whether to include related tasks (optional)
-        
+        include_task_count: Whether to include the number of related tasks,
+            counted in the database without loading them (optional)
+    
     Returns:
         Project information as dictionary
-        
+    
     Raises:
         ValueError: If project ID is invalid or project not found
     """
@@ -46,29 +51,15 @@ def project_resource_handler(
             raise ValueError(f"Project not found: {project_id}")
         
         # Build response
-        result = {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "created_at": project.created_at.isoformat() if project.created_at else None,
-            "updated_at": project.updated_at.isoformat() if project.updated_at else None
-        }
+        result = serializer(ProjectModel)(project)
         
         # Include tasks if requested
         if include_tasks:
             tasks = crud.task.get_tasks(db=db, project_id=project_id)
-            result["tasks"] = [
-                {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "status": task.status,
-                    "assignee_id": task.assignee_id,
-                    "created_at": task.created_at.isoformat() if task.created_at else None,
-                    "updated_at": task.updated_at.isoformat() if task.updated_at else None
-                }
-                for task in tasks
-            ]
+            result["tasks"] = serializer(TaskModel).many(tasks)
+        
+        if include_task_count:
+            result["task_count"] = crud.task.count_tasks(db=db, project_id=project_id)
         
         return result
     finally:
@@ -0,0 +1,114 @@
+"""
+Versioned cache for rendered MCP resource text
+
+Resources such as project://{id} are read far more often than the rows
+behind them change. The rendered text is kept per resource together with
+the version it was rendered at: a tuple of generation numbers from
+app.crud.cache.generations, which the crud layer bumps on every write
+(in place and again after commit). Checking the version costs a few dict
+lookups, so an unchanged resource is served without touching the database.
+
+Writes from other DevLog processes sharing the database bump the
+generations too, when their invalidation events arrive (see
+app.crud.invalidation). Direct SQL changes are picked up when the entry
+expires (DEVLOG_CACHE_TTL); DEVLOG_CACHE_SIZE=0 disables the cache, as
+it does the entity cache.
+
+Example:
+    ```python
+    text = render_cache.get_or_render(
+        ("task", task_id),
+        (generations.entity("Task", task_id),),
+        lambda: render_task(task_id),
+    )
+    ```
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from app.crud.cache import CACHE_SIZE, CACHE_TTL
+
+
+class RenderCache:
+    """
+    LRU cache of rendered resource text, keyed by resource and checked by version
+    
+    An entry is reused only while its version equals the caller's current
+    version and it has not expired. The version is taken before rendering,
+    so a write that lands while the text is being rendered makes the stored
+    entry stale rather than hiding the write.
+    """
+    
+    def __init__(self, max_size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+    
+    def get_or_render(self, key: Hashable, version: Hashable, render: Callable[[], str]) -> str:
+        """
+        Return the cached text for key if it was rendered at version, otherwise render it
+        
+        Args:
+            key: Resource identity, e.g. ("project", 1)
+            version: Current version of everything the text depends on
+            render: Builds the text; exceptions propagate and nothing is cached
+        
+        Returns:
+            Rendered text
+        """
+        if not self.enabled:
+            return render()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                cached_version, expires_at, text = entry
+                if cached_version == version and expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return text
+                self.stale += 1
+            self.misses += 1
+        
+        text = render()
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return text
+    
+    def clear(self) -> None:
+        """Drop every rendered entry"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Settings plus size, hit and stale-version counts"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stale": self.stale,
+            }
+
+
+# Shared by all resources of the server
+render_cache = RenderCache()
@@ -10,8 +10,11 @@ This module provides read-only access to task information including:
 from typing import Dict, Any, Optional
 
 from app.db.database import SessionLocal
+from app.models.message import Message as MessageModel
+from app.models.project import Project as ProjectModel
 from app.models.task import Task as TaskModel
 from app import crud
+from app.tools.serializers import serializer
 
 
 def task_resource_handler(
@@ -48,40 +51,18 @@ def task_resource_handler(
             raise ValueError(f"Task not found: {task_id}")
         
         # Build response
-        result = {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "status": task.status,
-            "project_id": task.project_id,
-            "assignee_id": task.assignee_id,
-            "created_at": task.created_at.isoformat() if task.created_at else None,
-            "updated_at": task.updated_at.isoformat() if task.updated_at else None
-        }
+        result = serializer(TaskModel)(task)
         
         # Include messages if requested
         if include_messages:
             messages = crud.message.get_messages(db=db, task_id=task_id)
-            result["messages"] = [
-                {
-                    "id": message.id,
-                    "content": message.content,
-                    "message_type": message.message_type,
-                    "user_id": message.user_id,
-                    "created_at": message.created_at.isoformat() if message.created_at else None
-                }
-                for message in messages
-            ]
+            result["messages"] = serializer(MessageModel, "summary").many(messages)
         
         # Include project information if requested
         if include_project and task.project_id:
             project = crud.project.get_project(db=db, project_id=task.project_id)
             if project:
-                result["project"] = {
-                    "id": project.id,
-                    "name": project.name,
-                    "description": project.description
-                }
+                result["project"] = serializer(ProjectModel)(project)
         
         return result
     finally:
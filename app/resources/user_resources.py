@@ -10,8 +10,11 @@ This module provides read-only access to user information including:
 from typing import Dict, Any, Optional, Union
 
 from app.db.database import SessionLocal
+from app.models.message import Message as MessageModel
+from app.models.task import Task as TaskModel
 from app.models.user import User as UserModel
 from app import crud
+from app.tools.serializers import serializer
 
 
 def user_resource_handler(
@@ -55,41 +58,17 @@ def user_resource_handler(
             raise ValueError(f"User not found: {identifier_type} {user_identifier}")
         
         # Build response
-        result = {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "created_at": user.created_at.isoformat() if user.created_at else None
-        }
+        result = serializer(UserModel)(user)
         
         # Include tasks if requested
         if include_tasks:
             tasks = crud.task.get_tasks(db=db, assignee_id=user.id)
-            result["tasks"] = [
-                {
-                    "id": task.id,
-                    "title": task.title,
-                    "status": task.status,
-                    "project_id": task.project_id,
-                    "created_at": task.created_at.isoformat() if task.created_at else None
-                }
-                for task in tasks
-            ]
+            result["tasks"] = serializer(TaskModel).many(tasks)
         
         # Include messages if requested
         if include_messages:
             messages = crud.message.get_messages(db=db, user_id=user.id, limit=50)
-            result["messages"] = [
-                {
-                    "id": message.id,
-                    "content": message.content,
-                    "message_type": message.message_type,
-                    "project_id": message.project_id,
-                    "task_id": message.task_id,
-                    "created_at": message.created_at.isoformat() if message.created_at else None
-                }
-                for message in messages
-            ]
+            result["messages"] = serializer(MessageModel, "summary").many(messages)
         
         return result
     finally:
@@ -9,7 +9,7 @@ Pydanticスキーマが含まれています。
 from .project import ProjectBase, ProjectCreate, ProjectUpdate, Project
 
 # タスク関連スキーマ
-from .task import TaskBase, TaskCreate, TaskUpdate, Task, TaskStatus
+from .task import TaskBase, TaskCreate, TaskUpdate, TaskBulkUpdate, Task, TaskStatus
 
 # ユーザー関連スキーマ
 from .user import UserBase, UserCreate, User
@@ -17,6 +17,9 @@ from .user import UserBase, UserCreate, User
 # メッセージ関連スキーマ
 from .message import MessageBase, MessageCreate, Message, MessageType
 
+# 既読カーソル関連スキーマ
+from .read_cursor import ChannelType, ReadCursor
+
 __all__ = [
     # Project
     "ProjectBase",
@@ -27,6 +30,7 @@ __all__ = [
     "TaskBase",
     "TaskCreate",
     "TaskUpdate",
+    "TaskBulkUpdate",
     "Task",
     "TaskStatus",
     # User
@@ -38,4 +42,7 @@ __all__ = [
     "MessageCreate",
     "Message",
     "MessageType",
+    # ReadCursor
+    "ChannelType",
+    "ReadCursor",
 ]
@@ -73,6 +73,10 @@ class Message(MessageBase):
     id: int = Field(..., description="メッセージID")
     is_read: bool = Field(default=False, description="既読状態")
     is_deleted: bool = Field(default=False, description="削除状態")
+    reply_count: int = Field(default=0, description="返信数")
+    last_reply_at: Optional[datetime] = Field(None, description="最新の返信の作成日時")
+    last_reply_id: Optional[int] = Field(None, description="最新の返信のID")
+    participant_count: int = Field(default=0, description="返信したユーザー数")
     created_at: datetime = Field(..., description="作成日時")
     updated_at: datetime = Field(..., description="更新日時")
     
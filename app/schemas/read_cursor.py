@@ -0,0 +1,31 @@
+"""
+既読カーソル関連のPydanticスキーマ定義
+
+このモジュールは、チャンネル単位の既読状態で使用される
+スキーマを定義します。
+"""
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class ChannelType(str, Enum):
+    """チャンネルのタイプ定義"""
+    PROJECT = "project"
+    TASK = "task"
+    DM = "dm"
+
+
+class ReadCursor(BaseModel):
+    """
+    既読カーソルのレスポンススキーマ
+    
+    ユーザーがチャンネル内で最後に読んだメッセージIDを返す際に使用されます。
+    """
+    user_id: int = Field(..., description="ユーザーID")
+    channel_type: ChannelType = Field(..., description="チャンネルタイプ")
+    channel_id: int = Field(..., description="プロジェクトID / タスクID / DM相手のユーザーID")
+    last_read_message_id: int = Field(..., description="最後に読んだメッセージID")
+    updated_at: datetime = Field(..., description="更新日時")
+    
+    model_config = ConfigDict(from_attributes=True)
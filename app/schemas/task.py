@@ -52,6 +52,18 @@ class TaskUpdate(BaseModel):
     assignee_id: Optional[int] = Field(None, description="担当者ID")
 
 
+class TaskBulkUpdate(BaseModel):
+    """
+    タスク一括更新時のスキーマ
+    
+    指定したフィールドだけを対象の全タスクに設定します。
+    assignee_id に明示的に None を指定すると担当者を外します。
+    """
+    status: Optional[TaskStatus] = Field(None, description="タスクのステータス")
+    assignee_id: Optional[int] = Field(None, description="担当者ID")
+    project_id: Optional[int] = Field(None, description="移動先のプロジェクトID")
+
+
 class Task(TaskBase):
     """
     タスクのレスポンススキーマ
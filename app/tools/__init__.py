@@ -17,6 +17,7 @@ from .task_tools import (
     get_task_tool,
     update_task_tool,
     delete_task_tool,
+    bulk_update_tasks_tool,
 )
 from .user_tools import (
     create_user_tool,
@@ -25,15 +26,44 @@ from .user_tools import (
 )
 from .message_tools import (
     create_message_tool,
+    create_messages_tool,
     create_direct_message_tool,
     get_messages_tool,
     get_direct_messages_tool,
     get_thread_messages_tool,
+    get_thread_tree_tool,
     get_unread_messages_tool,
     get_message_tool,
     mark_message_as_read_tool,
+    mark_messages_as_read_tool,
     mark_conversation_as_read_tool,
     delete_message_tool,
+    mark_channel_read_tool,
+    get_channel_unread_messages_tool,
+    get_unread_counts_tool,
+    search_messages_tool,
+    get_conversations_tool,
+    create_message_tool_async,
+    create_messages_tool_async,
+    create_direct_message_tool_async,
+    get_messages_tool_async,
+    get_direct_messages_tool_async,
+    get_thread_messages_tool_async,
+    get_thread_tree_tool_async,
+    get_unread_messages_tool_async,
+    get_message_tool_async,
+    mark_message_as_read_tool_async,
+    mark_messages_as_read_tool_async,
+    mark_conversation_as_read_tool_async,
+    delete_message_tool_async,
+    mark_channel_read_tool_async,
+    get_channel_unread_messages_tool_async,
+    get_unread_counts_tool_async,
+    search_messages_tool_async,
+    get_conversations_tool_async,
+)
+from .diagnostics_tools import (
+    get_diagnostics_tool,
 )
 
 __all__ = [
@@ -49,19 +79,48 @@ __all__ = [
     "get_task_tool",
     "update_task_tool",
     "delete_task_tool",
+    "bulk_update_tasks_tool",
     # User tools
     "create_user_tool",
     "get_users_tool",
     "get_user_tool",
     # Message tools
     "create_message_tool",
+    "create_messages_tool",
     "create_direct_message_tool",
     "get_messages_tool",
     "get_direct_messages_tool",
     "get_thread_messages_tool",
+    "get_thread_tree_tool",
     "get_unread_messages_tool",
     "get_message_tool",
     "mark_message_as_read_tool",
+    "mark_messages_as_read_tool",
     "mark_conversation_as_read_tool",
     "delete_message_tool",
+    "mark_channel_read_tool",
+    "get_channel_unread_messages_tool",
+    "get_unread_counts_tool",
+    "search_messages_tool",
+    "get_conversations_tool",
+    "create_message_tool_async",
+    "create_messages_tool_async",
+    "create_direct_message_tool_async",
+    "get_messages_tool_async",
+    "get_direct_messages_tool_async",
+    "get_thread_messages_tool_async",
+    "get_thread_tree_tool_async",
+    "get_unread_messages_tool_async",
+    "get_message_tool_async",
+    "mark_message_as_read_tool_async",
+    "mark_messages_as_read_tool_async",
+    "mark_conversation_as_read_tool_async",
+    "delete_message_tool_async",
+    "mark_channel_read_tool_async",
+    "get_channel_unread_messages_tool_async",
+    "get_unread_counts_tool_async",
+    "search_messages_tool_async",
+    "get_conversations_tool_async",
+    # Diagnostics tools
+    "get_diagnostics_tool",
 ] 
\ No newline at end of file
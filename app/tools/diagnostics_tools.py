@@ -0,0 +1,50 @@
+"""
+Diagnostics MCP tools for DevLog
+
+This module exposes runtime statistics for operating the server:
+- Database connection pool usage and checkout wait times
+- Tool dispatcher lane load, queue depth and wait times
+- Entity cache size and hit/miss counters
+- Rendered resource cache size and hit/miss counters
+- Recent messages buffer hit/miss counters
+- SQLite writer group commit sizes and timings
+- Cross-process cache invalidation events and their delivery delay
+"""
+
+from typing import Dict, Any
+
+from app.crud.cache import entity_cache
+from app.crud.invalidation import invalidation_bus
+from app.crud.recent import recent_messages
+from app.db.database import engine, get_async_pool_status, get_pool_status
+from app.db.writer import writer
+from app.dispatcher import dispatcher
+from app.resources.render_cache import render_cache
+
+
+def get_diagnostics_tool() -> Dict[str, Any]:
+    """
+    Get runtime diagnostics for the server
+    
+    Returns:
+        Database dialect and live connection pool statistics (connections
+        checked out, overflow, checkout wait times) for the sync and async engines,
+        per-lane tool dispatcher statistics (active, queued, rejected calls
+        and queue wait times), settings and hit/miss counters of the
+        entity cache, rendered resource cache and recent messages buffer,
+        the SQLite writer's group commit statistics, and the number and
+        delivery delay of cache invalidation events exchanged with other processes
+    """
+    return {
+        "database": {
+            "dialect": engine.dialect.name,
+            "pool": get_pool_status(),
+            "async_pool": get_async_pool_status()
+        },
+        "dispatcher": dispatcher.stats(),
+        "cache": entity_cache.stats(),
+        "render_cache": render_cache.stats(),
+        "recent_messages": recent_messages.stats(),
+        "writer": writer.stats() if writer is not None else {"enabled": False},
+        "invalidation_bus": invalidation_bus.stats() if invalidation_bus is not None else {"enabled": False}
+    }
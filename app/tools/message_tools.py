@@ -7,14 +7,88 @@ This module provides messaging functionality including:
 - Thread management
 - Read status management
 - Real-time communication features
+
+Each tool has an ``*_async`` variant that runs the same logic on an
+AsyncSession, so the MCP server's event loop is not blocked by queries.
+The variants that write go through app.db.writer instead: on SQLite,
+concurrent writes are merged into group commits on one writer connection.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
 
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, run_async_session
+from app.db.writer import run_write_session
 from app.schemas.message import MessageCreate, DirectMessageCreate, MessageUpdate
 from app.models.message import Message as MessageModel
+from app.models.read_cursor import ReadCursor as ReadCursorModel
 from app import crud
+from app.crud.pagination import encode_cursor, next_created_at_cursor
+from app.tools.params import parse_fields, parse_timestamp
+from app.tools.serializers import serializer, serializer_for
+
+
+# Largest number of messages accepted by one create_messages call
+MAX_BATCH_SIZE = 1000
+
+
+def _validate_message(
+    content: str,
+    message_type: str = "comment",
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    recipient_id: Optional[int] = None
+) -> MessageCreate:
+    if not content or not content.strip():
+        raise ValueError("Message content is required")
+    
+    if user_id is None:
+        raise ValueError("User ID is required")
+    
+    # ダイレクトメッセージの場合の検証
+    if message_type == "direct_message":
+        if recipient_id is None:
+            raise ValueError("Recipient ID is required for direct messages")
+        if project_id is not None or task_id is not None:
+            raise ValueError("Direct messages cannot belong to projects or tasks")
+    
+    return MessageCreate(
+        content=content,
+        message_type=message_type,
+        user_id=user_id,
+        recipient_id=recipient_id,
+        project_id=project_id,
+        task_id=task_id,
+        parent_id=parent_id
+    )
+
+
+def _create_message(
+    db: Session,
+    content: str,
+    message_type: str = "comment",
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    recipient_id: Optional[int] = None
+) -> Dict[str, Any]:
+    message_data = _validate_message(
+        content=content,
+        message_type=message_type,
+        user_id=user_id,
+        project_id=project_id,
+        task_id=task_id,
+        parent_id=parent_id,
+        recipient_id=recipient_id
+    )
+    message = crud.message.create_message(db=db, message=message_data)
+    
+    return serializer(MessageModel)(message)
 
 
 def create_message_tool(
@@ -37,57 +111,157 @@ def create_message_tool(
         task_id: Task ID this message belongs to (optional)
         parent_id: Parent message ID for threaded messages (optional)
         recipient_id: Recipient user ID for direct messages (optional)
-        
+    
     Returns:
         Created message information
-        
+    
     Raises:
         ValueError: If content is empty or user_id is missing
     """
-    if not content or not content.strip():
-        raise ValueError("Message content is required")
-    
-    if user_id is None:
-        raise ValueError("User ID is required")
-    
-    # ダイレクトメッセージの場合の検証
-    if message_type == "direct_message":
-        if recipient_id is None:
-            raise ValueError("Recipient ID is required for direct messages")
-        if project_id is not None or task_id is not None:
-            raise ValueError("Direct messages cannot belong to projects or tasks")
-    
     db = SessionLocal()
     try:
-        message_data = MessageCreate(
+        return _create_message(
+            db,
             content=content,
             message_type=message_type,
             user_id=user_id,
-            recipient_id=recipient_id,
             project_id=project_id,
             task_id=task_id,
-            parent_id=parent_id
+            parent_id=parent_id,
+            recipient_id=recipient_id
         )
-        message = crud.message.create_message(db=db, message=message_data)
-        
-        return {
-            "id": message.id,
-            "content": message.content,
-            "message_type": message.message_type,
-            "user_id": message.user_id,
-            "recipient_id": message.recipient_id,
-            "project_id": message.project_id,
-            "task_id": message.task_id,
-            "parent_id": message.parent_id,
-            "is_read": message.is_read,
-            "is_deleted": message.is_deleted,
-            "created_at": message.created_at.isoformat() if message.created_at else None,
-            "updated_at": message.updated_at.isoformat() if message.updated_at else None
-        }
     finally:
         db.close()
 
 
+async def create_message_tool_async(
+    content: str,
+    message_type: str = "comment",
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    recipient_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """Async variant of create_message_tool that runs through the SQLite group-commit writer when enabled"""
+    return await run_write_session(
+        _create_message,
+        content=content,
+        message_type=message_type,
+        user_id=user_id,
+        project_id=project_id,
+        task_id=task_id,
+        parent_id=parent_id,
+        recipient_id=recipient_id
+    )
+
+
+def _create_messages(
+    db: Session,
+    messages: List[Dict[str, Any]],
+    atomic: bool = False
+) -> Dict[str, Any]:
+    if not messages:
+        raise ValueError("At least one message is required")
+    if len(messages) > MAX_BATCH_SIZE:
+        raise ValueError(f"Too many messages: {len(messages)} (maximum {MAX_BATCH_SIZE})")
+    
+    # Validate the whole batch before touching the database
+    valid: List[MessageCreate] = []
+    positions: List[int] = []
+    errors: List[Dict[str, Any]] = []
+    for index, item in enumerate(messages):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError("Each message must be an object")
+            valid.append(_validate_message(**item))
+            positions.append(index)
+        except (TypeError, ValueError) as e:
+            errors.append({"index": index, "error": str(e)})
+    
+    if errors and atomic:
+        raise ValueError(f"Invalid messages, nothing was created: {errors}")
+    
+    ids: List[Optional[int]] = [None] * len(messages)
+    try:
+        results = crud.message.create_messages_bulk(db=db, messages=valid, atomic=atomic)
+    except DBAPIError as e:
+        raise ValueError(f"Could not create messages, nothing was created: {e.orig}")
+    
+    for index, result in zip(positions, results):
+        if isinstance(result, MessageModel):
+            ids[index] = result.id
+        else:
+            errors.append({"index": index, "error": str(result.orig)})
+    errors.sort(key=lambda error: error["index"])
+    
+    return {
+        "ids": ids,
+        "created": len(messages) - len(errors),
+        "failed": len(errors),
+        "errors": errors
+    }
+
+
+def create_messages_tool(
+    messages: List[Dict[str, Any]],
+    atomic: bool = False
+) -> Dict[str, Any]:
+    """
+    Create many messages in one transaction
+    
+    Args:
+        messages: Messages to create, each with the same fields as create_message
+            (content, message_type, user_id, project_id, task_id, parent_id, recipient_id)
+        atomic: If true, create nothing when any message fails (default: False)
+    
+    Returns:
+        New message IDs in input order (None for failed items), the number
+        of created and failed messages, and an error for each failed item
+    
+    Raises:
+        ValueError: If the batch is empty or too large, or if atomic is set
+            and any message fails
+    """
+    db = SessionLocal()
+    try:
+        return _create_messages(db, messages=messages, atomic=atomic)
+    finally:
+        db.close()
+
+
+async def create_messages_tool_async(
+    messages: List[Dict[str, Any]],
+    atomic: bool = False
+) -> Dict[str, Any]:
+    """Async variant of create_messages_tool that runs through the SQLite group-commit writer when enabled"""
+    return await run_write_session(_create_messages, messages=messages, atomic=atomic)
+
+
+def _create_direct_message(
+    db: Session,
+    content: str,
+    user_id: int,
+    recipient_id: int,
+    parent_id: Optional[int] = None
+) -> Dict[str, Any]:
+    if not content or not content.strip():
+        raise ValueError("Message content is required")
+    
+    if user_id == recipient_id:
+        raise ValueError("Cannot send direct message to yourself")
+    
+    dm_data = DirectMessageCreate(
+        content=content,
+        user_id=user_id,
+        recipient_id=recipient_id,
+        parent_id=parent_id
+    )
+    message = crud.message.create_direct_message(db=db, dm=dm_data)
+    
+    return serializer(MessageModel, "direct")(message)
+
+
 def create_direct_message_tool(
     content: str,
     user_id: int,
@@ -102,43 +276,78 @@ def create_direct_message_tool(
         user_id: Sender user ID
         recipient_id: Recipient user ID
         parent_id: Parent message ID for threaded DMs (optional)
-        
+    
     Returns:
         Created direct message information
-        
+    
     Raises:
         ValueError: If content is empty or user IDs are missing
     """
-    if not content or not content.strip():
-        raise ValueError("Message content is required")
-    
-    if user_id == recipient_id:
-        raise ValueError("Cannot send direct message to yourself")
-    
     db = SessionLocal()
     try:
-        dm_data = DirectMessageCreate(
+        return _create_direct_message(
+            db,
             content=content,
             user_id=user_id,
             recipient_id=recipient_id,
             parent_id=parent_id
         )
-        message = crud.message.create_direct_message(db=db, dm=dm_data)
-        
-        return {
-            "id": message.id,
-            "content": message.content,
-            "message_type": message.message_type,
-            "user_id": message.user_id,
-            "recipient_id": message.recipient_id,
-            "parent_id": message.parent_id,
-            "is_read": message.is_read,
-            "created_at": message.created_at.isoformat() if message.created_at else None
-        }
     finally:
         db.close()
 
 
+async def create_direct_message_tool_async(
+    content: str,
+    user_id: int,
+    recipient_id: int,
+    parent_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """Async variant of create_direct_message_tool that runs through the SQLite group-commit writer when enabled"""
+    return await run_write_session(
+        _create_direct_message,
+        content=content,
+        user_id=user_id,
+        recipient_id=recipient_id,
+        parent_id=parent_id
+    )
+
+
+def _get_messages(
+    db: Session,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    recipient_id: Optional[int] = None,
+    message_type: Optional[str] = None,
+    parent_id: Optional[int] = None,
+    include_deleted: bool = False,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    fields = parse_fields(fields, MessageModel)
+    # Read path without ORM instances: rows go straight from the cursor to dicts
+    messages = crud.read.select_messages(
+        db=db,
+        project_id=project_id,
+        task_id=task_id,
+        user_id=user_id,
+        recipient_id=recipient_id,
+        message_type=message_type,
+        parent_id=parent_id,
+        include_deleted=include_deleted,
+        limit=limit,
+        cursor=cursor,
+        fields=fields
+    )
+    
+    items = serializer_for(MessageModel, fields).many(messages)
+    
+    if cursor is None:
+        return items
+    return {"items": items, "next_cursor": next_created_at_cursor(messages, limit)}
+
+
 def get_messages_tool(
     project_id: Optional[int] = None,
     task_id: Optional[int] = None,
@@ -147,8 +356,10 @@ def get_messages_tool(
     message_type: Optional[str] = None,
     parent_id: Optional[int] = None,
     include_deleted: bool = False,
-    limit: int = 100
-) -> List[Dict[str, Any]]:
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get messages with optional filters
     
@@ -161,14 +372,19 @@ def get_messages_tool(
         parent_id: Filter by parent message ID (optional)
         include_deleted: Include deleted messages (default: False)
         limit: Maximum number of messages to return (default: 100)
-        
+        cursor: Keyset pagination cursor (optional). Pass an empty string
+            for the first page, then the returned next_cursor.
+        fields: Columns to return (optional, default: all). "id" is always
+            included; other columns are not fetched from the database.
+    
     Returns:
-        List of messages matching the filters
+        List of messages matching the filters, or
+        {"items": [...], "next_cursor": ...} when cursor is given
     """
     db = SessionLocal()
     try:
-        messages = crud.message.get_messages(
-            db=db,
+        return _get_messages(
+            db,
             project_id=project_id,
             task_id=task_id,
             user_id=user_id,
@@ -176,34 +392,66 @@ def get_messages_tool(
             message_type=message_type,
             parent_id=parent_id,
             include_deleted=include_deleted,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            fields=fields
         )
-        
-        return [
-            {
-                "id": message.id,
-                "content": message.content,
-                "message_type": message.message_type,
-                "user_id": message.user_id,
-                "recipient_id": message.recipient_id,
-                "project_id": message.project_id,
-                "task_id": message.task_id,
-                "parent_id": message.parent_id,
-                "is_read": message.is_read,
-                "is_deleted": message.is_deleted,
-                "created_at": message.created_at.isoformat() if message.created_at else None,
-                "updated_at": message.updated_at.isoformat() if message.updated_at else None
-            }
-            for message in messages
-        ]
     finally:
         db.close()
 
 
+async def get_messages_tool_async(
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    recipient_id: Optional[int] = None,
+    message_type: Optional[str] = None,
+    parent_id: Optional[int] = None,
+    include_deleted: bool = False,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """Async variant of get_messages_tool that runs on an AsyncSession"""
+    return await run_async_session(
+        _get_messages,
+        project_id=project_id,
+        task_id=task_id,
+        user_id=user_id,
+        recipient_id=recipient_id,
+        message_type=message_type,
+        parent_id=parent_id,
+        include_deleted=include_deleted,
+        limit=limit,
+        cursor=cursor,
+        fields=fields
+    )
+
+
+def _get_direct_messages(
+    db: Session,
+    user_id: int,
+    other_user_id: int,
+    limit: int = 100,
+    fields: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    fields = parse_fields(fields if fields is not None else serializer(MessageModel, "direct").fields, MessageModel)
+    messages = crud.message.get_direct_messages(
+        db=db,
+        user_id=user_id,
+        other_user_id=other_user_id,
+        limit=limit,
+        fields=fields
+    )
+    
+    return serializer_for(MessageModel, fields).many(messages)
+
+
 def get_direct_messages_tool(
     user_id: int,
     other_user_id: int,
-    limit: int = 100
+    limit: int = 100,
+    fields: Optional[List[str]] = None
 ) -> List[Dict[str, Any]]:
     """
     Get direct messages between two users
@@ -212,35 +460,55 @@ def get_direct_messages_tool(
         user_id: Current user ID
         other_user_id: Other user ID
         limit: Maximum number of messages to return (default: 100)
-        
+        fields: Columns to return (optional, default: the "direct" view).
+            "id" is always included; other columns are not fetched from the database.
+    
     Returns:
         List of direct messages between the users
     """
     db = SessionLocal()
     try:
-        messages = crud.message.get_direct_messages(
-            db=db,
+        return _get_direct_messages(
+            db,
             user_id=user_id,
             other_user_id=other_user_id,
-            limit=limit
+            limit=limit,
+            fields=fields
         )
-        
-        return [
-            {
-                "id": message.id,
-                "content": message.content,
-                "user_id": message.user_id,
-                "recipient_id": message.recipient_id,
-                "parent_id": message.parent_id,
-                "is_read": message.is_read,
-                "created_at": message.created_at.isoformat() if message.created_at else None
-            }
-            for message in messages
-        ]
     finally:
         db.close()
 
 
+async def get_direct_messages_tool_async(
+    user_id: int,
+    other_user_id: int,
+    limit: int = 100,
+    fields: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Async variant of get_direct_messages_tool that runs on an AsyncSession"""
+    return await run_async_session(
+        _get_direct_messages,
+        user_id=user_id,
+        other_user_id=other_user_id,
+        limit=limit,
+        fields=fields
+    )
+
+
+def _get_thread_messages(
+    db: Session,
+    parent_id: int,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    messages = crud.message.get_thread_messages(
+        db=db,
+        parent_id=parent_id,
+        limit=limit
+    )
+    
+    return serializer(MessageModel, "thread").many(messages)
+
+
 def get_thread_messages_tool(
     parent_id: int,
     limit: int = 100
@@ -251,37 +519,114 @@ def get_thread_messages_tool(
     Args:
         parent_id: Parent message ID
         limit: Maximum number of messages to return (default: 100)
-        
+    
     Returns:
         List of thread messages
     """
     db = SessionLocal()
     try:
-        messages = crud.message.get_thread_messages(
-            db=db,
-            parent_id=parent_id,
+        return _get_thread_messages(db, parent_id=parent_id, limit=limit)
+    finally:
+        db.close()
+
+
+async def get_thread_messages_tool_async(
+    parent_id: int,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    """Async variant of get_thread_messages_tool that runs on an AsyncSession"""
+    return await run_async_session(_get_thread_messages, parent_id=parent_id, limit=limit)
+
+
+def _get_thread_tree(
+    db: Session,
+    root_id: int,
+    max_depth: int = 10,
+    limit: int = 500
+) -> List[Dict[str, Any]]:
+    rows = crud.message.get_thread_tree(
+        db=db,
+        root_id=root_id,
+        max_depth=max_depth,
+        limit=limit
+    )
+    
+    if not rows:
+        raise ValueError(f"Message not found: {root_id}")
+    
+    serialize = serializer(MessageModel, "tree")
+    return [
+        {
+            **serialize(message),
+            "content": None if message.is_deleted else message.content,
+            "depth": depth,
+            "path": [int(segment) for segment in path.split("/")]
+        }
+        for message, depth, path in rows
+    ]
+
+
+def get_thread_tree_tool(
+    root_id: int,
+    max_depth: int = 10,
+    limit: int = 500
+) -> List[Dict[str, Any]]:
+    """
+    Get a whole thread (all nested replies) in a single query
+    
+    Args:
+        root_id: Root message ID
+        max_depth: Maximum reply depth to follow (default: 10)
+        limit: Maximum number of messages to return (default: 500)
+    
+    Returns:
+        Messages in depth-first path order, each with its depth and the
+        list of message IDs from the root. Deleted messages keep their place
+        in the tree with content set to None.
+    
+    Raises:
+        ValueError: If the root message is not found
+    """
+    db = SessionLocal()
+    try:
+        return _get_thread_tree(
+            db,
+            root_id=root_id,
+            max_depth=max_depth,
             limit=limit
         )
-        
-        return [
-            {
-                "id": message.id,
-                "content": message.content,
-                "message_type": message.message_type,
-                "user_id": message.user_id,
-                "recipient_id": message.recipient_id,
-                "project_id": message.project_id,
-                "task_id": message.task_id,
-                "parent_id": message.parent_id,
-                "is_read": message.is_read,
-                "created_at": message.created_at.isoformat() if message.created_at else None
-            }
-            for message in messages
-        ]
     finally:
         db.close()
 
 
+async def get_thread_tree_tool_async(
+    root_id: int,
+    max_depth: int = 10,
+    limit: int = 500
+) -> List[Dict[str, Any]]:
+    """Async variant of get_thread_tree_tool that runs on an AsyncSession"""
+    return await run_async_session(
+        _get_thread_tree,
+        root_id=root_id,
+        max_depth=max_depth,
+        limit=limit
+    )
+
+
+def _get_unread_messages(
+    db: Session,
+    user_id: int,
+    message_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    messages = crud.message.get_unread_messages(
+        db=db,
+        user_id=user_id,
+        message_type=message_type
+    )
+    
+    return serializer(MessageModel, "summary").many(messages)
+
+
 def get_unread_messages_tool(
     user_id: int,
     message_type: Optional[str] = None
@@ -292,65 +637,111 @@ def get_unread_messages_tool(
     Args:
         user_id: User ID to get unread messages for
         message_type: Filter by message type (optional)
-        
+    
     Returns:
         List of unread messages
     """
     db = SessionLocal()
     try:
-        messages = crud.message.get_unread_messages(
-            db=db,
-            user_id=user_id,
-            message_type=message_type
-        )
-        
-        return [
-            {
-                "id": message.id,
-                "content": message.content,
-                "message_type": message.message_type,
-                "user_id": message.user_id,
-                "recipient_id": message.recipient_id,
-                "project_id": message.project_id,
-                "task_id": message.task_id,
-                "parent_id": message.parent_id,
-                "created_at": message.created_at.isoformat() if message.created_at else None
-            }
-            for message in messages
-        ]
+        return _get_unread_messages(db, user_id=user_id, message_type=message_type)
     finally:
         db.close()
 
 
+async def get_unread_messages_tool_async(
+    user_id: int,
+    message_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Async variant of get_unread_messages_tool that runs on an AsyncSession"""
+    return await run_async_session(_get_unread_messages, user_id=user_id, message_type=message_type)
+
+
+def _mark_message_as_read(db: Session, message_id: int) -> Dict[str, Any]:
+    message = crud.message.mark_as_read(db=db, message_id=message_id)
+    
+    if not message:
+        raise ValueError(f"Message not found: {message_id}")
+    
+    return serializer(MessageModel, "read_state")(message)
+
+
 def mark_message_as_read_tool(message_id: int) -> Dict[str, Any]:
     """
     Mark a message as read
     
     Args:
         message_id: Message ID to mark as read
-        
+    
     Returns:
         Updated message information
-        
+    
     Raises:
         ValueError: If message not found
     """
     db = SessionLocal()
     try:
-        message = crud.message.mark_as_read(db=db, message_id=message_id)
-        
-        if not message:
-            raise ValueError(f"Message not found: {message_id}")
-        
-        return {
-            "id": message.id,
-            "is_read": message.is_read,
-            "updated_at": message.updated_at.isoformat() if message.updated_at else None
-        }
+        return _mark_message_as_read(db, message_id=message_id)
+    finally:
+        db.close()
+
+
+async def mark_message_as_read_tool_async(message_id: int) -> Dict[str, Any]:
+    """Async variant of mark_message_as_read_tool that runs through the SQLite group-commit writer when enabled"""
+    return await run_write_session(_mark_message_as_read, message_id=message_id)
+
+
+def _mark_messages_as_read(db: Session, message_ids: List[int]) -> Dict[str, Any]:
+    if not message_ids:
+        raise ValueError("At least one message ID is required")
+    if len(message_ids) > MAX_BATCH_SIZE:
+        raise ValueError(f"Too many message IDs: {len(message_ids)} (maximum {MAX_BATCH_SIZE})")
+    
+    count = crud.message.mark_messages_as_read(db=db, message_ids=message_ids)
+    
+    return {
+        "requested": len(set(message_ids)),
+        "marked_read": count
+    }
+
+
+def mark_messages_as_read_tool(message_ids: List[int]) -> Dict[str, Any]:
+    """
+    Mark many messages as read with a single update
+    
+    Args:
+        message_ids: Message IDs to mark as read
+    
+    Returns:
+        Number of distinct IDs requested and number of messages that were
+        unread and are now marked as read (unknown or already read IDs are ignored)
+    
+    Raises:
+        ValueError: If no IDs or too many IDs are given
+    """
+    db = SessionLocal()
+    try:
+        return _mark_messages_as_read(db, message_ids=message_ids)
     finally:
         db.close()
 
 
+async def mark_messages_as_read_tool_async(message_ids: List[int]) -> Dict[str, Any]:
+    """Async variant of mark_messages_as_read_tool that runs through the SQLite group-commit writer when enabled"""
+    return await run_write_session(_mark_messages_as_read, message_ids=message_ids)
+
+
+def _mark_conversation_as_read(db: Session, user_id: int, other_user_id: int) -> Dict[str, Any]:
+    count = crud.message.mark_conversation_as_read(
+        db=db,
+        user_id=user_id,
+        other_user_id=other_user_id
+    )
+    
+    return {
+        "messages_marked_read": count
+    }
+
+
 def mark_conversation_as_read_tool(user_id: int, other_user_id: int) -> Dict[str, Any]:
     """
     Mark all messages in a conversation as read
@@ -358,87 +749,470 @@ def mark_conversation_as_read_tool(user_id: int, other_user_id: int) -> Dict[str
     Args:
         user_id: Current user ID
         other_user_id: Other user ID in the conversation
-        
+    
     Returns:
         Number of messages marked as read
     """
     db = SessionLocal()
     try:
-        count = crud.message.mark_conversation_as_read(
-            db=db,
-            user_id=user_id,
-            other_user_id=other_user_id
-        )
-        
-        return {
-            "messages_marked_read": count
-        }
+        return _mark_conversation_as_read(db, user_id=user_id, other_user_id=other_user_id)
     finally:
         db.close()
 
 
+async def mark_conversation_as_read_tool_async(user_id: int, other_user_id: int) -> Dict[str, Any]:
+    """Async variant of mark_conversation_as_read_tool that runs through the SQLite group-commit writer when enabled"""
+    return await run_write_session(_mark_conversation_as_read, user_id=user_id, other_user_id=other_user_id)
+
+
+def _delete_message(db: Session, message_id: int) -> Dict[str, Any]:
+    message = crud.message.mark_as_deleted(db=db, message_id=message_id)
+    
+    if not message:
+        raise ValueError(f"Message not found: {message_id}")
+    
+    return serializer(MessageModel, "delete_state")(message)
+
+
 def delete_message_tool(message_id: int) -> Dict[str, Any]:
     """
     Delete a message (soft delete)
     
     Args:
         message_id: Message ID to delete
-        
+    
     Returns:
         Updated message information
-        
+    
     Raises:
         ValueError: If message not found
     """
     db = SessionLocal()
     try:
-        message = crud.message.mark_as_deleted(db=db, message_id=message_id)
-        
-        if not message:
-            raise ValueError(f"Message not found: {message_id}")
-        
-        return {
-            "id": message.id,
-            "is_deleted": message.is_deleted,
-            "updated_at": message.updated_at.isoformat() if message.updated_at else None
-        }
+        return _delete_message(db, message_id=message_id)
     finally:
         db.close()
 
 
-def get_message_tool(message_id: int) -> Dict[str, Any]:
+async def delete_message_tool_async(message_id: int) -> Dict[str, Any]:
+    """Async variant of delete_message_tool that runs through the SQLite group-commit writer when enabled"""
+    return await run_write_session(_delete_message, message_id=message_id)
+
+
+def _get_message(db: Session, message_id: int, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    fields = parse_fields(fields, MessageModel)
+    message = crud.message.get_message(db=db, message_id=message_id, fields=fields)
+    
+    if not message:
+        raise ValueError(f"Message not found: {message_id}")
+    
+    return serializer_for(MessageModel, fields)(message)
+
+
+def get_message_tool(message_id: int, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get a specific message by ID
     
     Args:
         message_id: Message ID
-        
+        fields: Columns to return (optional, default: all). "id" is always
+            included; other columns are not fetched from the database.
+    
     Returns:
         Message information
-        
+    
     Raises:
         ValueError: If message not found
     """
     db = SessionLocal()
     try:
-        message = crud.message.get_message(db=db, message_id=message_id)
-        
-        if not message:
-            raise ValueError(f"Message not found: {message_id}")
-        
-        return {
-            "id": message.id,
-            "content": message.content,
-            "message_type": message.message_type,
-            "user_id": message.user_id,
-            "recipient_id": message.recipient_id,
-            "project_id": message.project_id,
-            "task_id": message.task_id,
-            "parent_id": message.parent_id,
-            "is_read": message.is_read,
-            "is_deleted": message.is_deleted,
-            "created_at": message.created_at.isoformat() if message.created_at else None,
-            "updated_at": message.updated_at.isoformat() if message.updated_at else None
+        return _get_message(db, message_id=message_id, fields=fields)
+    finally:
+        db.close()
+
+
+async def get_message_tool_async(message_id: int, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Async variant of get_message_tool that runs on an AsyncSession"""
+    return await run_async_session(_get_message, message_id=message_id, fields=fields)
+
+
+def _mark_channel_read(
+    db: Session,
+    user_id: int,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    peer_id: Optional[int] = None,
+    up_to_message_id: Optional[int] = None
+) -> Dict[str, Any]:
+    channel_type, channel_id = crud.read_cursor.resolve_channel(
+        project_id=project_id, task_id=task_id, peer_id=peer_id
+    )
+    
+    cursor, marked, unread_count = crud.read_cursor.read_channel_up_to(
+        db=db,
+        user_id=user_id,
+        channel_type=channel_type,
+        channel_id=channel_id,
+        up_to_message_id=up_to_message_id
+    )
+    
+    return {**serializer(ReadCursorModel)(cursor), "marked_read": marked, "unread_count": unread_count}
+
+
+def mark_channel_read_tool(
+    user_id: int,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    peer_id: Optional[int] = None,
+    up_to_message_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Mark a channel (project, task or direct message peer) as read for a user
+    
+    Args:
+        user_id: User ID
+        project_id: Project channel (optional)
+        task_id: Task channel (optional)
+        peer_id: Direct message peer user ID (optional)
+        up_to_message_id: Last message ID to mark as read (optional, defaults
+            to the latest message). Messages after it stay unread, so messages
+            that arrive while the client is reading are not lost.
+    
+    Returns:
+        Updated read cursor information, the number of direct messages
+        marked as read and the number of messages still unread in the channel
+    
+    Raises:
+        ValueError: If not exactly one of project_id, task_id or peer_id is given
+    """
+    db = SessionLocal()
+    try:
+        return _mark_channel_read(
+            db,
+            user_id=user_id,
+            project_id=project_id,
+            task_id=task_id,
+            peer_id=peer_id,
+            up_to_message_id=up_to_message_id
+        )
+    finally:
+        db.close()
+
+
+async def mark_channel_read_tool_async(
+    user_id: int,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    peer_id: Optional[int] = None,
+    up_to_message_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """Async variant of mark_channel_read_tool that runs through the SQLite group-commit writer when enabled"""
+    return await run_write_session(
+        _mark_channel_read,
+        user_id=user_id,
+        project_id=project_id,
+        task_id=task_id,
+        peer_id=peer_id,
+        up_to_message_id=up_to_message_id
+    )
+
+
+def _get_channel_unread_messages(
+    db: Session,
+    user_id: int,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    peer_id: Optional[int] = None,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    channel_type, channel_id = crud.read_cursor.resolve_channel(
+        project_id=project_id, task_id=task_id, peer_id=peer_id
+    )
+    
+    messages = crud.read_cursor.get_unread_channel_messages(
+        db=db,
+        user_id=user_id,
+        channel_type=channel_type,
+        channel_id=channel_id,
+        limit=limit
+    )
+    
+    return serializer(MessageModel, "summary").many(messages)
+
+
+def get_channel_unread_messages_tool(
+    user_id: int,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    peer_id: Optional[int] = None,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    """
+    Get messages in a channel posted after the user's read cursor
+    
+    Args:
+        user_id: User ID
+        project_id: Project channel (optional)
+        task_id: Task channel (optional)
+        peer_id: Direct message peer user ID (optional)
+        limit: Maximum number of messages to return (default: 100)
+    
+    Returns:
+        List of unread messages, oldest first
+    
+    Raises:
+        ValueError: If not exactly one of project_id, task_id or peer_id is given
+    """
+    db = SessionLocal()
+    try:
+        return _get_channel_unread_messages(
+            db,
+            user_id=user_id,
+            project_id=project_id,
+            task_id=task_id,
+            peer_id=peer_id,
+            limit=limit
+        )
+    finally:
+        db.close()
+
+
+async def get_channel_unread_messages_tool_async(
+    user_id: int,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    peer_id: Optional[int] = None,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    """Async variant of get_channel_unread_messages_tool that runs on an AsyncSession"""
+    return await run_async_session(
+        _get_channel_unread_messages,
+        user_id=user_id,
+        project_id=project_id,
+        task_id=task_id,
+        peer_id=peer_id,
+        limit=limit
+    )
+
+
+def _get_unread_counts(db: Session, user_id: int) -> Dict[str, Any]:
+    counters = crud.unread_counter.get_unread_counts(db=db, user_id=user_id)
+    
+    return {
+        "user_id": user_id,
+        "total_unread": sum(counter.unread_count for counter in counters),
+        "channels": [
+            {
+                "channel_type": counter.channel_type,
+                "channel_id": counter.channel_id,
+                "unread_count": counter.unread_count
+            }
+            for counter in counters
+        ]
+    }
+
+
+def get_unread_counts_tool(user_id: int) -> Dict[str, Any]:
+    """
+    Get per-channel unread message counts for a user
+    
+    Counts are maintained incrementally on every write, so this does not
+    scan the messages table.
+    
+    Args:
+        user_id: User ID
+    
+    Returns:
+        Total unread count and the channels that have unread messages
+    """
+    db = SessionLocal()
+    try:
+        return _get_unread_counts(db, user_id=user_id)
+    finally:
+        db.close()
+
+
+async def get_unread_counts_tool_async(user_id: int) -> Dict[str, Any]:
+    """Async variant of get_unread_counts_tool that runs on an AsyncSession"""
+    return await run_async_session(_get_unread_counts, user_id=user_id)
+
+
+def _search_messages(
+    db: Session,
+    query: str,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    since: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    if not query or not query.strip():
+        raise ValueError("Search query is required")
+    
+    since_at = parse_timestamp(since, "since")
+    
+    rows = crud.search.search_messages(
+        db=db,
+        query=query,
+        project_id=project_id,
+        task_id=task_id,
+        since=since_at,
+        limit=limit,
+        cursor=cursor
+    )
+    
+    serialize = serializer(MessageModel, "summary")
+    items = [
+        {**serialize(message), "snippet": snippet, "score": score}
+        for message, snippet, score in rows
+    ]
+    
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1].score, rows[-1].Message.id)
+    
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def search_messages_tool(
+    query: str,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    since: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Full-text search over message content
+    
+    All whitespace-separated terms must match. Terms are matched as
+    substrings, so Japanese text without spaces is searchable.
+    
+    Args:
+        query: Search terms
+        project_id: Filter by project ID (optional)
+        task_id: Filter by task ID (optional)
+        since: Only messages created at or after this ISO 8601 timestamp (optional)
+        limit: Maximum number of results to return (default: 20)
+        cursor: next_cursor from a previous page (optional)
+    
+    Returns:
+        Ranked results with highlighted snippets and the next page cursor
+    
+    Raises:
+        ValueError: If query is empty, or since / cursor is invalid
+    """
+    db = SessionLocal()
+    try:
+        return _search_messages(
+            db,
+            query=query,
+            project_id=project_id,
+            task_id=task_id,
+            since=since,
+            limit=limit,
+            cursor=cursor
+        )
+    finally:
+        db.close()
+
+
+async def search_messages_tool_async(
+    query: str,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    since: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Async variant of search_messages_tool that runs on an AsyncSession"""
+    return await run_async_session(
+        _search_messages,
+        query=query,
+        project_id=project_id,
+        task_id=task_id,
+        since=since,
+        limit=limit,
+        cursor=cursor
+    )
+
+
+def _get_conversations(
+    db: Session,
+    user_id: int,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    rows = crud.message.get_conversations(
+        db=db,
+        user_id=user_id,
+        limit=limit,
+        cursor=cursor
+    )
+    
+    serialize = serializer(MessageModel, "summary")
+    items = [
+        {
+            "channel_type": channel_type,
+            "channel_id": channel_id,
+            "unread_count": unread_count,
+            "last_message_at": message.created_at.isoformat() if message.created_at else None,
+            "last_message": serialize(message)
         }
+        for message, channel_type, channel_id, unread_count in rows
+    ]
+    
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1].Message.id)
+    
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def get_conversations_tool(
+    user_id: int,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get a user's conversation list (inbox)
+    
+    Returns one entry per direct message peer and per project / task channel
+    the user takes part in, with the latest message and the unread count,
+    most recently active first.
+    
+    Args:
+        user_id: User ID
+        limit: Maximum number of conversations to return (default: 20)
+        cursor: next_cursor from a previous page (optional)
+    
+    Returns:
+        Conversations and the next page cursor
+    
+    Raises:
+        ValueError: If cursor is invalid
+    """
+    db = SessionLocal()
+    try:
+        return _get_conversations(
+            db,
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor
+        )
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_conversations_tool_async(
+    user_id: int,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Async variant of get_conversations_tool that runs on an AsyncSession"""
+    return await run_async_session(
+        _get_conversations,
+        user_id=user_id,
+        limit=limit,
+        cursor=cursor
+    )
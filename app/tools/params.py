@@ -0,0 +1,55 @@
+"""
+Shared parameter parsing for DevLog MCP tools
+"""
+
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from app.crud.projection import validate_fields
+
+
+def parse_timestamp(value: Optional[str], name: str) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 timestamp parameter
+    
+    Timestamps are stored as naive UTC, so aware values are converted to
+    UTC and made naive.
+    
+    Args:
+        value: ISO 8601 timestamp, or None / empty string
+        name: Parameter name used in the error message
+        
+    Returns:
+        Naive UTC datetime, or None if no value was given
+        
+    Raises:
+        ValueError: If the value is not a valid ISO 8601 timestamp
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name} timestamp: {value}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_fields(fields: Optional[List[str]], model: Any) -> Optional[List[str]]:
+    """
+    Validate a ``fields`` projection parameter
+    
+    Args:
+        fields: Column names to return, or None for all columns
+        model: Model class the names refer to
+        
+    Returns:
+        The column names with "id" first and duplicates removed, or None
+        
+    Raises:
+        ValueError: If a name is not a column of the model
+    """
+    if fields is None:
+        return None
+    return validate_fields(model, fields)
@@ -7,12 +7,17 @@ This module provides project management functionality including:
 - Project status and metadata management
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
+
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.db.database import SessionLocal
 from app.schemas.project import ProjectCreate, ProjectUpdate
 from app.models.project import Project as ProjectModel
 from app import crud
+from app.crud.pagination import next_id_cursor
+from app.tools.params import parse_fields, parse_timestamp
+from app.tools.serializers import serializer, serializer_for
 
 
 def create_project_tool(name: str, description: Optional[str] = None) -> Dict[str, Any]:
@@ -37,69 +42,70 @@ def create_project_tool(name: str, description: Optional[str] = None) -> Dict[st
         project_data = ProjectCreate(name=name, description=description)
         project = crud.project.create_project(db=db, project=project_data)
         
-        return {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "created_at": project.created_at.isoformat() if project.created_at else None,
-            "updated_at": project.updated_at.isoformat() if project.updated_at else None
-        }
+        return serializer(ProjectModel)(project)
     finally:
         db.close()
 
 
-def get_projects_tool() -> List[Dict[str, Any]]:
+def get_projects_tool(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get all projects
     
+    Args:
+        limit: Maximum number of projects to return (default: 100)
+        cursor: Keyset pagination cursor (optional). Pass an empty string
+            for the first page, then the returned next_cursor.
+        fields: Columns to return (optional, default: all). "id" is always
+            included; other columns are not fetched from the database.
+    
     Returns:
-        List of all projects
+        List of all projects, or
+        {"items": [...], "next_cursor": ...} when cursor is given
     """
+    fields = parse_fields(fields, ProjectModel)
+    
     db = SessionLocal()
     try:
-        projects = crud.project.get_projects(db=db)
-        
-        return [
-            {
-                "id": project.id,
-                "name": project.name,
-                "description": project.description,
-                "created_at": project.created_at.isoformat() if project.created_at else None,
-                "updated_at": project.updated_at.isoformat() if project.updated_at else None
-            }
-            for project in projects
-        ]
+        projects = crud.project.get_projects(db=db, limit=limit, cursor=cursor, fields=fields)
+        
+        items = serializer_for(ProjectModel, fields).many(projects)
+        
+        if cursor is None:
+            return items
+        return {"items": items, "next_cursor": next_id_cursor(projects, limit)}
     finally:
         db.close()
 
 
-def get_project_tool(project_id: int) -> Dict[str, Any]:
+def get_project_tool(project_id: int, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get a specific project by ID
     
     Args:
         project_id: Project ID
+        fields: Columns to return (optional, default: all). "id" is always
+            included; other columns are not fetched from the database.
         
     Returns:
         Project information
         
     Raises:
-        ValueError: If project not found
+        ValueError: If project not found, or a field name is unknown
     """
+    fields = parse_fields(fields, ProjectModel)
+    
     db = SessionLocal()
     try:
-        project = crud.project.get_project(db=db, project_id=project_id)
+        project = crud.project.get_project(db=db, project_id=project_id, fields=fields)
         
         if not project:
             raise ValueError(f"Project not found: {project_id}")
         
-        return {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "created_at": project.created_at.isoformat() if project.created_at else None,
-            "updated_at": project.updated_at.isoformat() if project.updated_at else None
-        }
+        return serializer_for(ProjectModel, fields)(project)
     finally:
         db.close()
 
@@ -107,7 +113,8 @@ def get_project_tool(project_id: int) -> Dict[str, Any]:
 def update_project_tool(
     project_id: int,
     name: Optional[str] = None,
-    description: Optional[str] = None
+    description: Optional[str] = None,
+    expected_updated_at: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Update a project
@@ -116,20 +123,19 @@ def update_project_tool(
         project_id: Project ID to update
         name: New project name (optional)
         description: New project description (optional)
+        expected_updated_at: Only update if the project's updated_at still equals
+            this ISO 8601 timestamp (optional, for optimistic concurrency)
         
     Returns:
         Updated project information
         
     Raises:
-        ValueError: If project not found
+        ValueError: If project not found, or it was modified since expected_updated_at
     """
+    expected = parse_timestamp(expected_updated_at, "expected_updated_at")
+    
     db = SessionLocal()
     try:
-        # Check if project exists
-        existing_project = crud.project.get_project(db=db, project_id=project_id)
-        if not existing_project:
-            raise ValueError(f"Project not found: {project_id}")
-        
         # Create update data
         update_data = ProjectUpdate()
         if name is not None:
@@ -138,19 +144,20 @@ def update_project_tool(
             update_data.description = description
         
         # Update project
-        project = crud.project.update_project(
-            db=db,
-            project_id=project_id,
-            project=update_data
-        )
+        try:
+            project = crud.project.update_project(
+                db=db,
+                project_id=project_id,
+                project=update_data,
+                expected_updated_at=expected
+            )
+        except StaleDataError:
+            raise ValueError(f"Project {project_id} was modified since {expected_updated_at}; reload and retry")
         
-        return {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "created_at": project.created_at.isoformat() if project.created_at else None,
-            "updated_at": project.updated_at.isoformat() if project.updated_at else None
-        }
+        if not project:
+            raise ValueError(f"Project not found: {project_id}")
+        
+        return serializer(ProjectModel)(project)
     finally:
         db.close()
 
@@ -170,13 +177,9 @@ def delete_project_tool(project_id: int) -> Dict[str, Any]:
     """
     db = SessionLocal()
     try:
-        # Check if project exists
-        existing_project = crud.project.get_project(db=db, project_id=project_id)
-        if not existing_project:
-            raise ValueError(f"Project not found: {project_id}")
-        
-        # Delete project
         success = crud.project.delete_project(db=db, project_id=project_id)
+        if not success:
+            raise ValueError(f"Project not found: {project_id}")
         
         return {
             "success": success,
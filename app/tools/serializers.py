@@ -0,0 +1,198 @@
+"""
+Shared result serialization for DevLog MCP tools
+
+Every payload built by the tools and resources goes through a Serializer:
+a row-to-dict function compiled once per model and field list. Each kind of
+payload is a named view in VIEWS, so the same kind of object always has
+the same shape wherever it is returned.
+
+Example:
+    ```python
+    serialize = serializer(Message, "summary")
+    items = serialize.many(messages)
+    ```
+"""
+
+import functools
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pydantic_core
+from sqlalchemy import DateTime
+
+from app.models import Message, Project, ReadCursor, Task, User
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+
+# Field lists per model and view
+MESSAGE_SUMMARY = (
+    "id", "content", "message_type", "user_id", "recipient_id", "project_id", "task_id", "parent_id", "created_at"
+)
+VIEWS: Dict[type, Dict[str, Tuple[str, ...]]] = {
+    Message: {
+        "default": (
+            "id", "content", "message_type", "user_id", "recipient_id", "project_id", "task_id", "parent_id",
+            "is_read", "is_deleted", "created_at", "updated_at",
+            "reply_count", "last_reply_at", "last_reply_id", "participant_count"
+        ),
+        # Lists of messages: unread, channel, search, resources
+        "summary": MESSAGE_SUMMARY,
+        "thread": (*MESSAGE_SUMMARY, "is_read"),
+        "tree": (*MESSAGE_SUMMARY, "is_deleted"),
+        "direct": ("id", "content", "message_type", "user_id", "recipient_id", "parent_id", "is_read", "created_at"),
+        "read_state": ("id", "is_read", "updated_at"),
+        "delete_state": ("id", "is_deleted", "updated_at"),
+    },
+    ReadCursor: {
+        "default": ("user_id", "channel_type", "channel_id", "last_read_message_id", "updated_at"),
+    },
+    Task: {
+        "default": ("id", "title", "description", "status", "project_id", "assignee_id", "created_at", "updated_at"),
+    },
+    Project: {
+        "default": ("id", "name", "description", "created_at", "updated_at"),
+    },
+    User: {
+        "default": ("id", "username", "email", "created_at", "updated_at"),
+        # Author details embedded in message payloads
+        "ref": ("id", "username", "email"),
+    },
+}
+
+
+class Serializer:
+    """
+    Row-to-dict function for one model and field list
+    
+    The field list is compiled once into a function that builds the dict
+    in a single expression, with ISO 8601 conversion only for the
+    datetime columns. ORM instances and Core row mappings (app.crud.read)
+    each get their own compiled variant; ORM instances are read from
+    their loaded state without going through the attribute descriptors.
+    """
+    
+    def __init__(self, model: type, fields: Sequence[str]):
+        self.model = model
+        self.fields = tuple(fields)
+        
+        attributes = model.__mapper__.column_attrs
+        unknown = [name for name in self.fields if name not in attributes]
+        if unknown:
+            raise ValueError(f"Unknown fields for {model.__name__}: {', '.join(unknown)}")
+        datetimes = {name for name in self.fields if isinstance(attributes[name].columns[0].type, DateTime)}
+        
+        self._from_object = _compile_object(self.fields, datetimes)
+        self._from_mapping = _compile(self.fields, datetimes, "row[{!r}]")
+    
+    def __call__(self, row: Any) -> Dict[str, Any]:
+        """Serialize one ORM instance or row mapping"""
+        if isinstance(row, Mapping):
+            return self._from_mapping(row)
+        return self._from_object(row)
+    
+    def many(self, rows: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Serialize a list of rows of the same kind"""
+        if not rows:
+            return []
+        serialize = self._from_mapping if isinstance(rows[0], Mapping) else self._from_object
+        return [serialize(row) for row in rows]
+
+
+def _compile(fields: Tuple[str, ...], datetimes: set, access: str) -> Callable[[Any], Dict[str, Any]]:
+    # Field names are mapped column keys, checked against the model, so they are safe to inline
+    lines = ["def serialize(row):"]
+    items = []
+    for index, name in enumerate(fields):
+        value = access.format(name)
+        if name in datetimes:
+            lines.append(f"    v{index} = {value}")
+            value = f"None if v{index} is None else v{index}.isoformat()"
+        items.append(f"{name!r}: {value}")
+    lines.append(f"    return {{{', '.join(items)}}}")
+    
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    return namespace["serialize"]
+
+
+def _compile_object(fields: Tuple[str, ...], datetimes: set) -> Callable[[Any], Dict[str, Any]]:
+    # Loaded column values live in the instance __dict__; reading them there skips the
+    # ORM attribute descriptors. Expired or deferred columns are missing from __dict__,
+    # so those rows take the attribute path, which loads (or raises) as usual.
+    from_dict = _compile(fields, datetimes, "row[{!r}]")
+    from_attributes = _compile(fields, datetimes, "row.{}")
+    
+    def serialize(row: Any) -> Dict[str, Any]:
+        try:
+            return from_dict(row.__dict__)
+        except KeyError:
+            return from_attributes(row)
+    
+    return serialize
+
+
+@functools.lru_cache(maxsize=None)
+def serializer(model: type, view: str = "default") -> Serializer:
+    """
+    Get the compiled serializer for a named view
+    
+    Raises:
+        KeyError: If the model has no such view
+    """
+    return Serializer(model, VIEWS[model][view])
+
+
+@functools.lru_cache(maxsize=256)
+def projection(model: type, fields: Tuple[str, ...]) -> Serializer:
+    """Get the compiled serializer for a caller-chosen field list (the tools' fields parameter)"""
+    return Serializer(model, fields)
+
+
+def serializer_for(model: type, fields: Optional[Sequence[str]] = None) -> Serializer:
+    """Serializer for the requested fields, or the model's default view when fields is None"""
+    if fields is None:
+        return serializer(model)
+    return projection(model, tuple(fields))
+
+
+def to_dict(instance: Any, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Convert a model instance or a Core row mapping to a JSON-ready dict
+    
+    Args:
+        instance: Model instance, or a RowMapping from app.crud.read
+        fields: Columns to include (default: the model's default view, or
+            every key of a row mapping). Only these attributes are read, so
+            columns the crud layer did not load are never touched.
+    
+    Returns:
+        Dict of column name to value, with datetimes as ISO 8601 strings
+    """
+    if isinstance(instance, Mapping):
+        names = fields if fields is not None else instance.keys()
+        return {name: _json_value(instance[name]) for name in names}
+    return serializer_for(type(instance), fields)(instance)
+
+
+def _json_value(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def dumps(data: Any) -> str:
+    """
+    Encode a tool result as compact JSON text
+    
+    Installed as the MCP server's tool serializer. Uses orjson when it is
+    installed, which is markedly faster on large lists; otherwise
+    pydantic_core, the encoder FastMCP uses by default. Values JSON cannot
+    represent are encoded with str(), as FastMCP does.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return pydantic_core.to_json(data, fallback=str).decode()
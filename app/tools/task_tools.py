@@ -7,12 +7,18 @@ This module provides task management functionality including:
 - Task dependencies and relationships
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
+
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.db.database import SessionLocal
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.message import MessageCreate
+from app.schemas.task import TaskBulkUpdate, TaskCreate, TaskStatus, TaskUpdate
 from app.models.task import Task as TaskModel
 from app import crud
+from app.crud.pagination import next_id_cursor
+from app.tools.params import parse_fields, parse_timestamp
+from app.tools.serializers import serializer, serializer_for
 
 
 def create_task_tool(
@@ -52,16 +58,7 @@ def create_task_tool(
         )
         task = crud.task.create_task(db=db, task=task_data)
         
-        return {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "status": task.status,
-            "project_id": task.project_id,
-            "assignee_id": task.assignee_id,
-            "created_at": task.created_at.isoformat() if task.created_at else None,
-            "updated_at": task.updated_at.isoformat() if task.updated_at else None
-        }
+        return serializer(TaskModel)(task)
     finally:
         db.close()
 
@@ -69,8 +66,11 @@ def create_task_tool(
 def get_tasks_tool(
     project_id: Optional[int] = None,
     status: Optional[str] = None,
-    assignee_id: Optional[int] = None
-) -> List[Dict[str, Any]]:
+    assignee_id: Optional[int] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get tasks with optional filters
     
@@ -78,66 +78,64 @@ def get_tasks_tool(
         project_id: Filter by project ID (optional)
         status: Filter by status (optional)
         assignee_id: Filter by assignee ID (optional)
+        limit: Maximum number of tasks to return (default: 100)
+        cursor: Keyset pagination cursor (optional). Pass an empty string
+            for the first page, then the returned next_cursor.
+        fields: Columns to return (optional, default: all). "id" is always
+            included; other columns are not fetched from the database.
         
     Returns:
-        List of tasks matching the filters
+        List of tasks matching the filters, or
+        {"items": [...], "next_cursor": ...} when cursor is given
     """
+    fields = parse_fields(fields, TaskModel)
+    
     db = SessionLocal()
     try:
         tasks = crud.task.get_tasks(
             db=db,
             project_id=project_id,
             status=status,
-            assignee_id=assignee_id
+            assignee_id=assignee_id,
+            limit=limit,
+            cursor=cursor,
+            fields=fields
         )
         
-        return [
-            {
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "status": task.status,
-                "project_id": task.project_id,
-                "assignee_id": task.assignee_id,
-                "created_at": task.created_at.isoformat() if task.created_at else None,
-                "updated_at": task.updated_at.isoformat() if task.updated_at else None
-            }
-            for task in tasks
-        ]
+        items = serializer_for(TaskModel, fields).many(tasks)
+        
+        if cursor is None:
+            return items
+        return {"items": items, "next_cursor": next_id_cursor(tasks, limit)}
     finally:
         db.close()
 
 
-def get_task_tool(task_id: int) -> Dict[str, Any]:
+def get_task_tool(task_id: int, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get a specific task by ID
     
     Args:
         task_id: Task ID
+        fields: Columns to return (optional, default: all). "id" is always
+            included; other columns are not fetched from the database.
         
     Returns:
         Task information
         
     Raises:
-        ValueError: If task not found
+        ValueError: If task not found, or a field name is unknown
     """
+    fields = parse_fields(fields, TaskModel)
+    
     db = SessionLocal()
     try:
-        task = crud.task.get_task(db=db, task_id=task_id)
+        task = crud.task.get_task(db=db, task_id=task_id, fields=fields)
         
         if not task:
             raise ValueError(f"Task not found: {task_id}")
         
-        return {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "status": task.status,
-            "project_id": task.project_id,
-            "assignee_id": task.assignee_id,
-            "created_at": task.created_at.isoformat() if task.created_at else None,
-            "updated_at": task.updated_at.isoformat() if task.updated_at else None
-        }
+        return serializer_for(TaskModel, fields)(task)
     finally:
         db.close()
 
@@ -147,7 +145,8 @@ def update_task_tool(
     title: Optional[str] = None,
     description: Optional[str] = None,
     status: Optional[str] = None,
-    assignee_id: Optional[int] = None
+    assignee_id: Optional[int] = None,
+    expected_updated_at: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Update a task
@@ -158,20 +157,19 @@ def update_task_tool(
         description: New task description (optional)
         status: New task status (optional)
         assignee_id: New assignee ID (optional)
+        expected_updated_at: Only update if the task's updated_at still equals
+            this ISO 8601 timestamp (optional, for optimistic concurrency)
         
     Returns:
         Updated task information
         
     Raises:
-        ValueError: If task not found
+        ValueError: If task not found, or it was modified since expected_updated_at
     """
+    expected = parse_timestamp(expected_updated_at, "expected_updated_at")
+    
     db = SessionLocal()
     try:
-        # Check if task exists
-        existing_task = crud.task.get_task(db=db, task_id=task_id)
-        if not existing_task:
-            raise ValueError(f"Task not found: {task_id}")
-        
         # Create update data
         update_data = TaskUpdate()
         if title is not None:
@@ -184,22 +182,20 @@ def update_task_tool(
             update_data.assignee_id = assignee_id
         
         # Update task
-        task = crud.task.update_task(
-            db=db,
-            task_id=task_id,
-            task=update_data
-        )
+        try:
+            task = crud.task.update_task(
+                db=db,
+                task_id=task_id,
+                task=update_data,
+                expected_updated_at=expected
+            )
+        except StaleDataError:
+            raise ValueError(f"Task {task_id} was modified since {expected_updated_at}; reload and retry")
         
-        return {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "status": task.status,
-            "project_id": task.project_id,
-            "assignee_id": task.assignee_id,
-            "created_at": task.created_at.isoformat() if task.created_at else None,
-            "updated_at": task.updated_at.isoformat() if task.updated_at else None
-        }
+        if not task:
+            raise ValueError(f"Task not found: {task_id}")
+        
+        return serializer(TaskModel)(task)
     finally:
         db.close()
 
@@ -219,17 +215,103 @@ def delete_task_tool(task_id: int) -> Dict[str, Any]:
     """
     db = SessionLocal()
     try:
-        # Check if task exists
-        existing_task = crud.task.get_task(db=db, task_id=task_id)
-        if not existing_task:
-            raise ValueError(f"Task not found: {task_id}")
-        
-        # Delete task
         success = crud.task.delete_task(db=db, task_id=task_id)
+        if not success:
+            raise ValueError(f"Task not found: {task_id}")
         
         return {
             "success": success,
             "message": f"Task {task_id} deleted successfully" if success else f"Failed to delete task {task_id}"
         }
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+def bulk_update_tasks_tool(
+    task_ids: Optional[List[int]] = None,
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    status: Optional[str] = None,
+    set_status: Optional[str] = None,
+    set_assignee_id: Optional[int] = None,
+    unassign: bool = False,
+    set_project_id: Optional[int] = None,
+    summary_user_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Update many tasks at once, e.g. to reassign or close a sprint's tasks
+    
+    The tasks to update are those matching task_ids and/or the filters
+    (project_id, assignee_id, status). All tasks are updated in one
+    transaction, in chunks of set-based updates.
+    
+    Args:
+        task_ids: Task IDs to update (optional)
+        project_id: Only update tasks in this project (optional)
+        assignee_id: Only update tasks assigned to this user (optional)
+        status: Only update tasks with this status (optional)
+        set_status: New status (optional)
+        set_assignee_id: New assignee ID (optional)
+        unassign: Remove the assignee from the tasks (default: False)
+        set_project_id: Move the tasks and their messages to this project (optional)
+        summary_user_id: If given, post one task_update message as this user
+            summarizing the change (optional)
+        
+    Returns:
+        Number of updated tasks, the applied changes and the summary message ID
+        
+    Raises:
+        ValueError: If no tasks or no changes are specified, or a status is invalid
+    """
+    if task_ids is None and project_id is None and assignee_id is None and status is None:
+        raise ValueError("Either task_ids or a filter (project_id, assignee_id, status) is required")
+    if unassign and set_assignee_id is not None:
+        raise ValueError("Cannot both set and remove the assignee")
+    
+    changes: Dict[str, Any] = {}
+    if set_status is not None:
+        changes["status"] = set_status
+    if set_assignee_id is not None or unassign:
+        changes["assignee_id"] = set_assignee_id
+    if set_project_id is not None:
+        changes["project_id"] = set_project_id
+    if not changes:
+        raise ValueError("At least one of set_status, set_assignee_id, unassign or set_project_id is required")
+    
+    # Validate the statuses once for the whole batch
+    update_data = TaskBulkUpdate(**changes)
+    if status is not None:
+        status = TaskStatus(status).value
+    
+    summary = None
+    if summary_user_id is not None:
+        described = ", ".join(
+            f"{field}={getattr(value, 'value', value)}"
+            for field, value in update_data.model_dump(exclude_unset=True).items()
+        )
+        summary = MessageCreate(
+            content=f"Bulk task update: {described}",
+            message_type="task_update",
+            user_id=summary_user_id,
+            project_id=set_project_id if set_project_id is not None else project_id
+        )
+    
+    db = SessionLocal()
+    try:
+        updated, message = crud.task.bulk_update_tasks(
+            db=db,
+            changes=update_data,
+            task_ids=task_ids,
+            project_id=project_id,
+            assignee_id=assignee_id,
+            status=status,
+            summary=summary
+        )
+        
+        return {
+            "updated": updated,
+            "changes": update_data.model_dump(mode="json", exclude_unset=True),
+            "summary_message_id": message.id if message else None
+        }
+    finally:
+        db.close()
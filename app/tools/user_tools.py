@@ -8,12 +8,15 @@ This module provides user management functionality including:
 """
 
 import re
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 
 from app.db.database import SessionLocal
 from app.schemas.user import UserCreate
 from app.models.user import User as UserModel
 from app import crud
+from app.crud.pagination import next_id_cursor
+from app.tools.params import parse_fields
+from app.tools.serializers import serializer, serializer_for
 
 
 def create_user_tool(username: str, email: str) -> Dict[str, Any]:
@@ -49,45 +52,49 @@ def create_user_tool(username: str, email: str) -> Dict[str, Any]:
         if not user:
             raise ValueError("User with this username or email already exists")
         
-        return {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None
-        }
+        return serializer(UserModel)(user)
     finally:
         db.close()
 
 
-def get_users_tool() -> List[Dict[str, Any]]:
+def get_users_tool(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get all users
     
+    Args:
+        limit: Maximum number of users to return (default: 100)
+        cursor: Keyset pagination cursor (optional). Pass an empty string
+            for the first page, then the returned next_cursor.
+        fields: Columns to return (optional, default: all). "id" is always
+            included; other columns are not fetched from the database.
+    
     Returns:
-        List of all users
+        List of all users, or
+        {"items": [...], "next_cursor": ...} when cursor is given
     """
+    fields = parse_fields(fields, UserModel)
+    
     db = SessionLocal()
     try:
-        users = crud.user.get_users(db=db)
+        users = crud.user.get_users(db=db, limit=limit, cursor=cursor, fields=fields)
         
-        return [
-            {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "created_at": user.created_at.isoformat() if user.created_at else None,
-                "updated_at": user.updated_at.isoformat() if user.updated_at else None
-            }
-            for user in users
-        ]
+        items = serializer_for(UserModel, fields).many(users)
+        
+        if cursor is None:
+            return items
+        return {"items": items, "next_cursor": next_id_cursor(users, limit)}
     finally:
         db.close()
 
 
 def get_user_tool(
     user_id: Optional[int] = None,
-    username: Optional[str] = None
+    username: Optional[str] = None,
+    fields: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Get a specific user by ID or username
@@ -95,33 +102,31 @@ def get_user_tool(
     Args:
         user_id: User ID (optional)
         username: Username (optional)
+        fields: Columns to return (optional, default: all). "id" is always
+            included; other columns are not fetched from the database.
         
     Returns:
         User information
         
     Raises:
-        ValueError: If neither user_id nor username is provided, or user not found
+        ValueError: If neither user_id nor username is provided, user not found,
+            or a field name is unknown
     """
     if user_id is None and username is None:
         raise ValueError("Either user_id or username must be provided")
+    fields = parse_fields(fields, UserModel)
     
     db = SessionLocal()
     try:
         if user_id is not None:
-            user = crud.user.get_user(db=db, user_id=user_id)
+            user = crud.user.get_user(db=db, user_id=user_id, fields=fields)
         else:
-            user = crud.user.get_user_by_username(db=db, username=username)
+            user = crud.user.get_user_by_username(db=db, username=username, fields=fields)
         
         if not user:
             identifier = f"user_id={user_id}" if user_id is not None else f"username={username}"
             raise ValueError(f"User not found: {identifier}")
         
-        return {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None
-        }
+        return serializer_for(UserModel, fields)(user)
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
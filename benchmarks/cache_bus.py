@@ -0,0 +1,125 @@
+"""
+プロセス間のキャッシュ無効化（app.crud.invalidation）の遅延の計測
+
+SQLiteファイルを共有する2つのプロセスで、書き込みプロセスがプロジェクトを
+--gap ミリ秒ごとに --updates 回更新し、このプロセスの InvalidationBus が
+エンティティの世代番号を進めるまでの時間（コミット完了から無効化まで）を計測します。
+あわせて、変更がない間の PRAGMA data_version の確認1回あたりのコストを表示します。
+
+Usage:
+    python -m benchmarks.cache_bus [--updates 100] [--gap 50] [--interval 20]
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.crud import invalidation
+from app.crud.cache import generations
+from app.crud.invalidation import InvalidationBus, create_listener_engine
+from app.db.database import Base, SQLITE_PRAGMAS, configure_sqlite_engine
+from app.models import Project
+from app.schemas.project import ProjectUpdate
+
+
+def make_database(path: str) -> None:
+    """テーブルとベンチマーク用のプロジェクトを作成"""
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite_engine(engine, SQLITE_PRAGMAS)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Project(name="bench"))
+        db.commit()
+    engine.dispose()
+
+
+def writer_process(path: str, updates: int, gap: float, committed) -> None:
+    """プロジェクトを gap 秒ごとに更新し、コミットが完了した時刻を送る"""
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite_engine(engine, SQLITE_PRAGMAS)
+    invalidation.invalidation_bus = InvalidationBus(f"sqlite:///{path}", origin="writer")
+    invalidation.invalidation_bus.register(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        for i in range(updates):
+            time.sleep(gap)
+            crud.project.update_project(db, 1, ProjectUpdate(name=f"bench {i}"))
+            committed.put(time.time())
+    committed.put(None)
+    engine.dispose()
+
+
+def idle_poll_cost(path: str, polls: int = 10000) -> float:
+    """変更がない間の確認1回あたりの時間（マイクロ秒）"""
+    bus = InvalidationBus(f"sqlite:///{path}", origin="idle")
+    listener = create_listener_engine(f"sqlite:///{path}")
+    with listener.connect() as connection:
+        bus.poll(connection)
+        started = time.perf_counter()
+        for _ in range(polls):
+            bus.poll(connection)
+        elapsed = time.perf_counter() - started
+    listener.dispose()
+    return elapsed / polls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=100)
+    parser.add_argument("--gap", type=float, default=50, help="更新の間隔（ミリ秒）")
+    parser.add_argument("--interval", type=float, default=20, help="data_version の確認間隔（ミリ秒）")
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        make_database(path)
+        bus = InvalidationBus(f"sqlite:///{path}", origin="reader", interval=args.interval / 1000)
+        bus.start()
+        
+        # InvalidationBus のスレッドが動いているため、fork ではなく spawn で起動する
+        context = multiprocessing.get_context("spawn")
+        committed = context.Queue()
+        process = context.Process(target=writer_process, args=(path, args.updates, args.gap / 1000, committed))
+        process.start()
+        
+        # 世代番号が進んだ時刻を記録する
+        observed: List[float] = []
+        generation = generations.entity("Project", 1)
+        deadline = time.monotonic() + args.updates * args.gap / 1000 + 30
+        while len(observed) < args.updates and time.monotonic() < deadline:
+            current = generations.entity("Project", 1)
+            if current != generation:
+                generation = current
+                observed.append(time.time())
+            time.sleep(0.0005)
+        process.join()
+        bus.close()
+        
+        commits = []
+        while (value := committed.get()) is not None:
+            commits.append(value)
+        delays = sorted((seen - done) * 1000 for seen, done in zip(observed, commits))
+        print(f"updates  {len(commits)}  invalidations {len(observed)}  (interval={args.interval} ms)")
+        if delays:
+            print(
+                f"delay ms  p50={statistics.median(delays):7.2f}  "
+                f"p99={delays[min(len(delays) - 1, int(len(delays) * 0.99))]:7.2f}  max={delays[-1]:7.2f}"
+            )
+        print(f"idle poll  {idle_poll_cost(path):6.1f} us")
+        print(f"         {bus.stats()}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
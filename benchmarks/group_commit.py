@@ -0,0 +1,111 @@
+"""
+SQLiteの書き込みスループットの比較（呼び出しごとのコミットとグループコミット）
+
+T 個のスレッドが同時に create_message を N 回ずつ呼び出し、全件がコミット
+されるまでの時間から、1秒あたりの書き込み件数を比較します。
+
+- per-call: 現在の同期ツールと同じく、呼び出しごとにプールからセッションを取得してコミット
+- group:    app.db.writer.GroupCommitWriter の書き込みスレッドでまとめてコミット
+
+synchronous=FULL ではコミットごとに fsync するため、差が大きくなります。
+
+Usage:
+    python -m benchmarks.group_commit [--threads 16] [--writes 200] [--synchronous NORMAL]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.db.database import Base, SQLITE_PRAGMAS, configure_sqlite_engine, connect_args
+from app.db.writer import GroupCommitWriter, create_writer_engine
+from app.models import User
+from app.schemas.message import MessageCreate
+
+
+def make_database(path: str) -> None:
+    """テーブルとベンチマーク用のユーザーを作成"""
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite_engine(engine, SQLITE_PRAGMAS)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(User(username="ci-bot", email="ci-bot@example.com"))
+        db.commit()
+    engine.dispose()
+
+
+def run_threads(threads: int, writes: int, write: Callable[[MessageCreate], None]) -> float:
+    """threads 個のスレッドで writes 回ずつ write を呼び、経過時間（秒）を返す"""
+    def worker(index: int) -> None:
+        for i in range(writes):
+            write(MessageCreate(content=f"worker {index} step {i}", message_type="status_update", user_id=1))
+    
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def per_call(path: str, threads: int, writes: int) -> float:
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args=connect_args, pool_size=threads, max_overflow=0
+    )
+    configure_sqlite_engine(engine, SQLITE_PRAGMAS)
+    Session_ = sessionmaker(bind=engine, autoflush=False)
+    
+    def write(message: MessageCreate) -> None:
+        with Session_() as db:
+            crud.message.create_message(db, message)
+    
+    try:
+        return run_threads(threads, writes, write)
+    finally:
+        engine.dispose()
+
+
+def group(path: str, threads: int, writes: int) -> float:
+    writer = GroupCommitWriter(create_writer_engine(f"sqlite:///{path}"))
+    try:
+        elapsed = run_threads(threads, writes, lambda message: writer.run(crud.message.create_message, message))
+        print(f"         {writer.stats()}")
+        return elapsed
+    finally:
+        writer.close()
+        writer.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--synchronous", default=SQLITE_PRAGMAS["synchronous"])
+    args = parser.parse_args()
+    SQLITE_PRAGMAS["synchronous"] = args.synchronous
+    
+    total = args.threads * args.writes
+    results: Dict[str, float] = {}
+    for label, fn in (("per-call", per_call), ("group", group)):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            make_database(path)
+            results[label] = fn(path, args.threads, args.writes)
+        finally:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        print(f"{label:8s} {results[label]:7.2f} s  writes/s={total / results[label]:9.1f}")
+    print(f"speedup  {results['per-call'] / results['group']:6.1f}x (synchronous={args.synchronous})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+メッセージ一覧の読み取りパスの比較（ORM と Core）
+
+get_messages ツールで大きな limit を指定した場合を想定し、
+1回の呼び出しで N 行を取得して辞書に変換するまでの CPU 時間と
+ピークメモリ（tracemalloc）を比較します。
+
+- orm:  crud.message.get_messages で Message インスタンスを構築してから to_dict
+- core: crud.read.select_messages で RowMapping を取得して to_dict
+
+Usage:
+    python -m benchmarks.list_read [--rows 10000] [--repeat 5]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.db.database import Base, SQLITE_PRAGMAS, configure_sqlite_engine
+from app.models import Message, Project, User
+from app.tools.serializers import to_dict
+
+
+def make_session(path: str, rows: int) -> sessionmaker:
+    """rows 件のメッセージを持つベンチマーク用のセッションファクトリを作成"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    configure_sqlite_engine(engine, SQLITE_PRAGMAS)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all([User(username="ci-bot", email="ci-bot@example.com"), Project(name="bench")])
+        db.commit()
+        db.execute(insert(Message), [
+            {
+                "content": f"build step {i} passed on runner {i % 16}",
+                "message_type": "status_update",
+                "user_id": 1,
+                "project_id": 1,
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def orm_path(Session: sessionmaker, rows: int) -> List[dict]:
+    """現在の ORM 経由の読み取り"""
+    with Session() as db:
+        return [to_dict(message) for message in crud.message.get_messages(db, project_id=1, limit=rows)]
+
+
+def core_path(Session: sessionmaker, rows: int) -> List[dict]:
+    """crud.read による ORM を経由しない読み取り"""
+    with Session() as db:
+        return [to_dict(row) for row in crud.read.select_messages(db, project_id=1, limit=rows)]
+
+
+def measure(fn: Callable[[sessionmaker, int], List[dict]], Session: sessionmaker, rows: int, repeat: int) -> Tuple[float, float]:
+    """fn を repeat 回実行し、最短の CPU 時間（秒）とピークメモリ（MiB）を返す"""
+    best_cpu = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.process_time()
+        result = fn(Session, rows)
+        best_cpu = min(best_cpu, time.process_time() - start)
+        assert len(result) == rows
+    
+    # tracemalloc は実行時間を大きく伸ばすため、メモリは別の1回で計測する
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(Session, rows)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best_cpu, peak / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    Session = make_session(path, args.rows)
+    try:
+        results = {
+            label: measure(fn, Session, args.rows, args.repeat)
+            for label, fn in (("orm", orm_path), ("core", core_path))
+        }
+    finally:
+        Session.kw["bind"].dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    
+    for label, (cpu, peak) in results.items():
+        print(f"{label:6s} cpu={cpu * 1000:9.1f} ms  peak={peak:7.1f} MiB  rows/s={args.rows / cpu:10.1f}")
+    (orm_cpu, orm_peak), (core_cpu, core_peak) = results["orm"], results["core"]
+    print(f"saved  cpu={(1 - core_cpu / orm_cpu) * 100:8.1f} %   peak={(1 - core_peak / orm_peak) * 100:6.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+メッセージの一括作成と1件ずつの作成の比較
+
+CIボットが1回のパイプラインで投稿するステータスメッセージを想定し、
+create_message を N 回（呼び出しごとにセッションを開いてコミット）実行した場合と、
+create_messages_bulk を1回実行した場合の所要時間を比較します。
+
+Usage:
+    python -m benchmarks.message_batch [--count 500] [--repeat 3]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.db.database import Base, SQLITE_PRAGMAS, configure_sqlite_engine
+from app.models import Project, User
+from app.schemas.message import MessageCreate
+
+
+def make_session(path: str) -> sessionmaker:
+    """ベンチマーク用のセッションファクトリを作成"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    configure_sqlite_engine(engine, SQLITE_PRAGMAS)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all([
+            User(username="ci-bot", email="ci-bot@example.com"),
+            User(username="reader", email="reader@example.com"),
+            Project(name="bench"),
+        ])
+        db.commit()
+        # 読み手が既読カーソルを持つようにして、未読カウンターの更新も計測に含める
+        crud.message.create_message(db, MessageCreate(
+            content="hello", message_type="comment", user_id=2, project_id=1
+        ))
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def single_calls(Session: sessionmaker, messages: List[MessageCreate]) -> None:
+    """create_message ツールと同じく、1件ごとにセッションを開いてコミット"""
+    for message in messages:
+        with Session() as db:
+            crud.message.create_message(db, message)
+
+
+def bulk_call(Session: sessionmaker, messages: List[MessageCreate]) -> None:
+    """create_messages ツールと同じく、1つのセッション・トランザクションで一括作成"""
+    with Session() as db:
+        crud.message.create_messages_bulk(db, messages)
+
+
+def measure(fn: Callable[[sessionmaker, List[MessageCreate]], None], count: int, repeat: int) -> float:
+    """一時ファイルのデータベースで fn を repeat 回実行し、最短の所要時間（秒）を返す"""
+    messages = [
+        MessageCreate(content=f"build step {i} passed", message_type="status_update", user_id=1, project_id=1)
+        for i in range(count)
+    ]
+    best = float("inf")
+    for _ in range(repeat):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        Session = make_session(path)
+        try:
+            start = time.perf_counter()
+            fn(Session, messages)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            Session.kw["bind"].dispose()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    single = measure(single_calls, args.count, args.repeat)
+    bulk = measure(bulk_call, args.count, args.repeat)
+    for label, seconds in (("single", single), ("bulk", bulk)):
+        print(f"{label:8s} {seconds * 1000:9.1f} ms  messages/s={args.count / seconds:10.1f}")
+    print(f"speedup  {single / bulk:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+SQLiteのPRAGMA設定による同時読み書きスループットの比較
+
+デフォルト設定（ロールバックジャーナル）と SQLITE_PRAGMAS のプロファイルで、
+書き込みプロセスと読み取りプロセスを同時に動かし、処理件数と
+"database is locked" エラーの件数を比較します。
+GILの影響を避けるため、各ワーカーは別プロセスで実行します。
+
+Usage:
+    python -m benchmarks.sqlite_pragmas [--seconds 5] [--writers 2] [--readers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.db.database import Base, SQLITE_PRAGMAS, configure_sqlite_engine
+from app.models import Project, User
+from app.schemas.message import MessageCreate
+
+
+def make_session(path: str, pragmas: Optional[Dict[str, str]]) -> sessionmaker:
+    """ベンチマーク用のセッションファクトリを作成"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if pragmas is not None:
+        configure_sqlite_engine(engine, pragmas)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def worker(kind: str, path: str, pragmas: Optional[Dict[str, str]], deadline: float, results) -> None:
+    """期限まで書き込みまたは読み取りを繰り返し、件数を結果キューに送る"""
+    Session = make_session(path, pragmas)
+    done = locked = 0
+    with Session() as db:
+        while time.time() < deadline:
+            try:
+                if kind == "write":
+                    crud.message.create_message(db, MessageCreate(
+                        content="bench", message_type="comment", user_id=1, project_id=1
+                    ))
+                else:
+                    crud.message.get_messages(db, project_id=1, limit=50)
+                    db.rollback()
+                done += 1
+            except OperationalError:
+                db.rollback()
+                locked += 1
+    results.put((kind, done, locked))
+
+
+def run(pragmas: Optional[Dict[str, str]], seconds: float, writers: int, readers: int) -> Dict[str, int]:
+    """一時ファイルのデータベースで同時読み書きを実行し、件数を返す"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    
+    Session = make_session(path, pragmas)
+    Base.metadata.create_all(bind=Session.kw["bind"])
+    with Session() as db:
+        db.add_all([User(username="bench", email="bench@example.com"), Project(name="bench")])
+        db.commit()
+        for i in range(200):
+            crud.message.create_message(db, MessageCreate(
+                content=f"seed {i}", message_type="comment", user_id=1, project_id=1
+            ))
+    Session.kw["bind"].dispose()
+    
+    results = multiprocessing.Queue()
+    deadline = time.time() + seconds
+    processes = [
+        multiprocessing.Process(target=worker, args=(kind, path, pragmas, deadline, results))
+        for kind in ["write"] * writers + ["read"] * readers
+    ]
+    for process in processes:
+        process.start()
+    
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    for _ in processes:
+        kind, done, locked = results.get()
+        counts["writes" if kind == "write" else "reads"] += done
+        counts["locked"] += locked
+    for process in processes:
+        process.join()
+    
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+    
+    for label, pragmas in (("default", None), ("tuned", SQLITE_PRAGMAS)):
+        counts = run(pragmas, args.seconds, args.writers, args.readers)
+        print(
+            f"{label:8s} writes/s={counts['writes'] / args.seconds:9.1f} "
+            f"reads/s={counts['reads'] / args.seconds:9.1f} "
+            f"locked={counts['locked']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
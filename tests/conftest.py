@@ -6,10 +6,13 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.crud.cache import entity_cache
+from app.crud.recent import recent_messages
 from app.db.database import Base, get_db
+from app.resources.render_cache import render_cache
 
 # すべてのモデルをインポートして、リレーションシップが正しく解決されるようにする
-from app.models import Project, Task, User, Message  # noqa: F401
+from app.models import Project, Task, User, Message, ReadCursor, UnreadCounter  # noqa: F401
 
 
 # テスト用のSQLiteデータベースを使用
@@ -23,6 +26,18 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_entity_cache():
+    """テストごとにエンティティキャッシュ・描画結果・最新メッセージを空にする（テーブルは毎回作り直され、IDが再利用されるため）"""
+    entity_cache.clear()
+    render_cache.clear()
+    recent_messages.clear()
+    yield
+    entity_cache.clear()
+    render_cache.clear()
+    recent_messages.clear()
+
+
 @pytest.fixture
 def db():
     """テスト用のデータベースセッション"""
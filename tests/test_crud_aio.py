@@ -0,0 +1,91 @@
+"""
+非同期CRUD操作と非同期ツールのテスト
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.crud import aio
+from app.db import database
+from app.db.database import Base, async_database_url
+from app.schemas.message import MessageCreate
+from app.schemas.project import ProjectCreate
+from app.schemas.user import UserCreate
+from app.tools.message_tools import get_messages_tool_async, get_unread_counts_tool_async
+
+
+@pytest_asyncio.fixture
+async def async_session_factory(monkeypatch):
+    """テスト用のインメモリDBに接続する非同期セッションファクトリ"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", factory)
+    try:
+        yield factory
+    finally:
+        await engine.dispose()
+
+
+class TestAsyncCRUD:
+    """非同期CRUD操作のテストクラス"""
+
+    @pytest.mark.parametrize("url, expected", [
+        ("sqlite:///./devlog.db", "sqlite+aiosqlite:///./devlog.db"),
+        ("postgresql://user:pw@localhost/devlog", "postgresql+asyncpg://user:pw@localhost/devlog"),
+        ("postgresql+psycopg2://localhost/devlog", "postgresql+asyncpg://localhost/devlog"),
+        ("postgresql+asyncpg://localhost/devlog", "postgresql+asyncpg://localhost/devlog"),
+    ])
+    def test_async_database_url(self, url, expected):
+        """同期URLから非同期ドライバのURLへの変換"""
+        assert async_database_url(url) == expected
+
+    def test_only_session_functions_are_wrapped(self):
+        """dbを第一引数に取らない関数は非同期版に含めない"""
+        assert hasattr(aio.read_cursor, "mark_channel_read")
+        assert not hasattr(aio.read_cursor, "resolve_channel")
+
+    @pytest.mark.asyncio
+    async def test_create_and_get_message(self, async_session_factory):
+        """非同期セッションでのメッセージ作成と取得"""
+        async with async_session_factory() as db:
+            user = await aio.user.create_user(db, UserCreate(username="alice", email="alice@example.com"))
+            project = await aio.project.create_project(db, ProjectCreate(name="Async"))
+            message = await aio.message.create_message(db, MessageCreate(
+                content="hello", message_type="comment", user_id=user.id, project_id=project.id
+            ))
+            
+            result = await aio.message.get_messages(db, project_id=project.id)
+        
+        assert [m.id for m in result] == [message.id]
+        assert result[0].content == "hello"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_async_tools(self, async_session_factory):
+        """非同期ツールを同時に実行できる"""
+        async with async_session_factory() as db:
+            alice = await aio.user.create_user(db, UserCreate(username="alice", email="alice@example.com"))
+            bob = await aio.user.create_user(db, UserCreate(username="bob", email="bob@example.com"))
+            project = await aio.project.create_project(db, ProjectCreate(name="Async"))
+            await aio.read_cursor.mark_channel_read(db, bob.id, "project", project.id)
+            for i in range(3):
+                await aio.message.create_message(db, MessageCreate(
+                    content=f"m{i}", message_type="comment", user_id=alice.id, project_id=project.id
+                ))
+        
+        messages, counts = await asyncio.gather(
+            get_messages_tool_async(project_id=project.id),
+            get_unread_counts_tool_async(user_id=bob.id),
+        )
+        
+        assert [m["content"] for m in messages] == ["m2", "m1", "m0"]
+        assert counts["total_unread"] == 3
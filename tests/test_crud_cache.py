@@ -0,0 +1,177 @@
+"""
+エンティティキャッシュ（crud.cache）のテスト
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.crud import project as crud_project
+from app.crud import task as crud_task
+from app.crud import user as crud_user
+from app.crud.cache import EntityCache, Generations, entity_cache, generations, invalidate, pending_invalidations
+from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.schemas.task import TaskBulkUpdate, TaskUpdate
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+
+class TestEntityCache:
+    """エンティティキャッシュのテストクラス"""
+    
+    @pytest.fixture
+    def test_project(self, db: Session) -> Project:
+        """テスト用のプロジェクトを作成"""
+        project = Project(name="Test Project", description="Test Description")
+        db.add(project)
+        db.commit()
+        db.refresh(project)
+        return project
+    
+    @pytest.fixture
+    def statements(self, db: Session):
+        """発行されたSQLを記録"""
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        yield statements
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+    
+    def test_get_project_hits_cache(self, db: Session, test_project: Project, statements: list):
+        """2回目以降の取得は別のセッションでもSQLを発行しないことを確認"""
+        # Arrange
+        project_id = test_project.id
+        crud_project.get_project(db, project_id)
+        db.close()
+        statements.clear()
+        hits = entity_cache.stats()["hits"]
+        
+        # Act
+        project = crud_project.get_project(db, project_id)
+        
+        # Assert
+        assert project.name == "Test Project"
+        assert project in db
+        assert statements == []
+        # ヒット数はプロセス全体の累計のため、増えた分を確認する
+        assert entity_cache.stats()["hits"] == hits + 1
+    
+    def test_update_invalidates(self, db: Session, test_project: Project):
+        """更新・削除でキャッシュが無効化されることを確認"""
+        # Arrange
+        project_id = test_project.id
+        crud_project.get_project(db, project_id)
+        
+        # Act
+        crud_project.update_project(db, project_id, ProjectUpdate(name="Renamed"))
+        db.close()
+        
+        # Assert
+        assert crud_project.get_project(db, project_id).name == "Renamed"
+        assert crud_project.delete_project(db, project_id) is True
+        assert crud_project.get_project(db, project_id) is None
+    
+    def test_task_invalidation(self, db: Session, test_project: Project):
+        """タスクの更新・一括更新・プロジェクト削除でタスクのキャッシュが無効化されることを確認"""
+        # Arrange
+        task = Task(title="Task", status="pending", project_id=test_project.id)
+        db.add(task)
+        db.commit()
+        task_id, project_id = task.id, test_project.id
+        crud_task.get_task(db, task_id)
+        
+        # Act / Assert
+        crud_task.update_task(db, task_id, TaskUpdate(status="in_progress"))
+        db.close()
+        assert crud_task.get_task(db, task_id).status == "in_progress"
+        
+        crud_task.bulk_update_tasks(db, TaskBulkUpdate(status="completed"), project_id=project_id)
+        db.close()
+        assert crud_task.get_task(db, task_id).status == "completed"
+        
+        crud_project.delete_project(db, project_id)
+        db.close()
+        assert crud_task.get_task(db, task_id) is None
+    
+    def test_get_user_by_username_is_invalidated_by_id(self, db: Session):
+        """ユーザー名で保存したキャッシュもIDの無効化で取り除かれることを確認"""
+        # Arrange
+        user = User(username="alice", email="alice@example.com")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        assert crud_user.get_user_by_username(db, "alice").id == user_id
+        
+        # Act
+        entity_cache.invalidate("User", {user_id})
+        
+        # Assert
+        assert entity_cache.stats()["size"] == 0
+    
+    def test_partial_loads_are_not_cached(self, db: Session, test_project: Project):
+        """fieldsを指定した取得結果はキャッシュしないことを確認"""
+        crud_project.get_project(db, test_project.id, fields=["name"])
+        assert entity_cache.stats()["size"] == 0
+    
+    def test_lru_and_ttl(self):
+        """件数上限と有効期限を確認"""
+        cache = EntityCache(max_size=2, ttl=60)
+        for i in range(3):
+            cache.put(("Task", "id", i), Task(id=i))
+        assert cache.get(("Task", "id", 0)) is None
+        assert cache.stats()["evictions"] == 1
+        
+        expired = EntityCache(max_size=2, ttl=0)
+        expired.put(("Task", "id", 1), Task(id=1))
+        assert expired.get(("Task", "id", 1)) is None
+        assert expired.stats()["expirations"] == 1
+    
+    def test_writes_bump_generations(self, db: Session, test_project: Project):
+        """作成・更新で世代番号が進み、読み取りでは進まないことを確認"""
+        # Arrange
+        project_id = test_project.id
+        before = generations.entity("Project", project_id)
+        
+        # Act / Assert
+        crud_project.update_project(db, project_id, ProjectUpdate(name="Renamed"))
+        after_update = generations.entity("Project", project_id)
+        assert after_update > before
+        
+        created = crud_project.create_project(db, ProjectCreate(name="New"))
+        assert generations.entity("Project", created.id) > after_update
+        assert generations.entity("Project", project_id) == after_update
+        
+        task_generation = generations.model("Task")
+        crud_task.get_task(db, 1)
+        assert generations.model("Task") == task_generation
+    
+    def test_savepoint_release_keeps_pending_invalidations(self, db: Session, test_project: Project):
+        """SAVEPOINTの解放では無効化せず、外側のトランザクションのコミットまで待つことを確認"""
+        # Arrange
+        invalidate(db, Project, test_project.id)
+        before = generations.entity("Project", test_project.id)
+        
+        # Act / Assert
+        with db.begin_nested():
+            pass
+        assert pending_invalidations(db) == {"Project": {test_project.id}}
+        assert generations.entity("Project", test_project.id) == before
+        
+        db.commit()
+        assert pending_invalidations(db) == {}
+        assert generations.entity("Project", test_project.id) > before
+    
+    def test_generations_floor_after_eviction(self):
+        """追い出したエンティティの番号が下限として残ることを確認"""
+        gens = Generations(max_entities=1)
+        gens.bump("Task", {1})
+        first = gens.entity("Task", 1)
+        gens.bump("Task", {2})
+        
+        assert gens.entity("Task", 1) >= first
+        assert gens.entity("Task", 3) >= first
+        
+        gens.bump("Task")
+        assert gens.entity("Task", 2) == gens.model("Task")
@@ -0,0 +1,232 @@
+"""
+プロセス間のキャッシュ無効化（crud.invalidation）のテスト
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.crud import invalidation
+from app.crud.cache import entity_cache, generations, invalidate
+from app.crud.invalidation import InvalidationBus, create_listener_engine
+from app.crud.recent import recent_messages
+from app.db.database import Base
+from app.db.writer import GroupCommitWriter, create_writer_engine
+from app.models.cache_event import CacheEvent
+from app.models.project import Project
+from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.schemas.user import UserCreate
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 別のプロセスでプロジェクトを更新するスクリプト（DEVLOG_DATABASE_URL のデータベースを使用）
+UPDATE_PROJECT_SCRIPT = """
+import sys
+from app import crud
+from app.db.database import SessionLocal
+from app.schemas.project import ProjectUpdate
+
+with SessionLocal() as db:
+    crud.project.update_project(db, int(sys.argv[1]), ProjectUpdate(name="Renamed"))
+"""
+
+
+class TestInvalidationBus:
+    """プロセス間のキャッシュ無効化のテストクラス"""
+    
+    @pytest.fixture
+    def database_url(self, tmp_path) -> str:
+        """テーブルを作成したSQLiteファイルのURL"""
+        url = f"sqlite:///{tmp_path / 'shared.db'}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+        return url
+    
+    @pytest.fixture
+    def engine(self, database_url: str):
+        """このプロセスの書き込み用エンジン"""
+        engine = create_engine(database_url)
+        yield engine
+        engine.dispose()
+    
+    @pytest.fixture
+    def publisher(self, database_url: str, engine, monkeypatch) -> InvalidationBus:
+        """engine のセッションのコミットでイベントを発行するバス"""
+        bus = InvalidationBus(database_url, origin="publisher")
+        bus.register(engine)
+        monkeypatch.setattr(invalidation, "invalidation_bus", bus)
+        return bus
+    
+    @pytest.fixture
+    def listener(self, database_url: str):
+        """イベントを受け取る接続"""
+        listener_engine = create_listener_engine(database_url)
+        with listener_engine.connect() as connection:
+            yield connection
+        listener_engine.dispose()
+    
+    def create_cached_project(self, engine) -> int:
+        """プロジェクトを作成し、エンティティキャッシュに読み込む"""
+        with sessionmaker(bind=engine)() as db:
+            project = crud.project.create_project(db, ProjectCreate(name="Shared", description="Shared project"))
+            crud.project.get_project(db, project.id)
+        assert entity_cache.get(("Project", "id", project.id)) is not None
+        return project.id
+    
+    def test_other_process_write_invalidates_cache(self, database_url: str, engine):
+        """SQLiteを共有する別のプロセスでの更新で、このプロセスのキャッシュが無効化されることを確認"""
+        # Arrange
+        project_id = self.create_cached_project(engine)
+        generation = generations.entity("Project", project_id)
+        bus = InvalidationBus(database_url, origin="receiver", interval=0.01)
+        bus.start()
+        
+        try:
+            # Act
+            env = {**os.environ, "DEVLOG_DATABASE_URL": database_url, "DEVLOG_SQLITE_WRITER": "false"}
+            subprocess.run(
+                [sys.executable, "-c", UPDATE_PROJECT_SCRIPT, str(project_id)],
+                cwd=ROOT, env=env, check=True, timeout=60
+            )
+            deadline = time.monotonic() + 5
+            while entity_cache.get(("Project", "id", project_id)) is not None and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            bus.close()
+        
+        # Assert
+        assert entity_cache.get(("Project", "id", project_id)) is None
+        assert generations.entity("Project", project_id) > generation
+        stats = bus.stats()
+        assert stats["received"] == 1
+        assert stats["full_flushes"] == 0
+    
+    def test_own_events_are_skipped(self, engine, publisher: InvalidationBus, listener, database_url: str):
+        """イベントは発行元以外のプロセスだけが適用することを確認"""
+        # Arrange
+        project_id = self.create_cached_project(engine)
+        receiver = InvalidationBus(database_url, origin="receiver")
+        publisher.poll(listener)
+        receiver.poll(listener)
+        
+        # Act
+        with sessionmaker(bind=engine)() as db:
+            crud.project.update_project(db, project_id, ProjectUpdate(name="Renamed"))
+            crud.project.get_project(db, project_id)
+        
+        # Assert
+        assert publisher.poll(listener) == 0
+        assert entity_cache.get(("Project", "id", project_id)) is not None
+        assert receiver.poll(listener) == 1
+        assert entity_cache.get(("Project", "id", project_id)) is None
+        assert publisher.stats()["published"] == 2
+    
+    def test_rollback_publishes_nothing(self, engine, publisher: InvalidationBus):
+        """ロールバックした書き込みのイベントは残らないことを確認"""
+        # Arrange
+        db = sessionmaker(bind=engine)()
+        
+        # Act
+        try:
+            crud.project.update_project(db, 999, ProjectUpdate(name="Missing"))
+            crud.user.create_user(db, UserCreate(username="alice", email="alice@example.com"))
+            crud.user.create_user(db, UserCreate(username="alice", email="alice@example.com"))
+        finally:
+            db.close()
+        
+        # Assert
+        with engine.connect() as conn:
+            events = conn.execute(select(CacheEvent.model, CacheEvent.entity_id)).all()
+        assert events == [("User", 1)]
+    
+    def test_savepoint_release_publishes_nothing(self, engine, publisher: InvalidationBus):
+        """SAVEPOINTの解放ではイベントを発行せず、外側のコミットで1回だけ発行することを確認"""
+        # Arrange
+        db = sessionmaker(bind=engine)()
+        
+        # Act
+        try:
+            project = Project(name="Nested")
+            db.add(project)
+            db.flush()
+            project_id = project.id
+            invalidate(db, Project, project_id)
+            with db.begin_nested():
+                pass
+            db.commit()
+        finally:
+            db.close()
+        
+        # Assert
+        with engine.connect() as conn:
+            events = conn.execute(select(CacheEvent.model, CacheEvent.entity_id)).all()
+        assert events == [("Project", project_id)]
+    
+    def test_writer_publishes_in_group_commit(self, database_url: str, publisher: InvalidationBus, listener):
+        """書き込みスレッドでまとめてコミットした書き込みのイベントも発行されることを確認"""
+        # Arrange
+        receiver = InvalidationBus(database_url, origin="receiver")
+        receiver.poll(listener)
+        writer = GroupCommitWriter(create_writer_engine(database_url))
+        publisher.register(writer.engine)
+        
+        # Act
+        try:
+            writer.run(crud.project.create_project, ProjectCreate(name="A", description="A"))
+            writer.run(crud.project.create_project, ProjectCreate(name="B", description="B"))
+        finally:
+            writer.close()
+            writer.engine.dispose()
+        
+        # Assert
+        assert receiver.poll(listener) == 2
+    
+    def test_pruned_events_clear_all_caches(self, engine, listener, database_url: str):
+        """読む前に削除されたイベントがある場合は、すべてのキャッシュを捨てることを確認"""
+        # Arrange
+        project_id = self.create_cached_project(engine)
+        receiver = InvalidationBus(database_url, origin="receiver")
+        receiver.poll(listener)
+        with engine.begin() as conn:
+            conn.execute(insert(CacheEvent), [
+                {"origin": "other", "model": "User", "entity_id": i, "generation": i} for i in range(1, 4)
+            ])
+            conn.execute(text("DELETE FROM cache_events WHERE entity_id < 3"))
+        
+        # Act
+        received = receiver.poll(listener)
+        
+        # Assert
+        assert received == 0
+        assert receiver.stats()["full_flushes"] == 1
+        assert entity_cache.get(("Project", "id", project_id)) is None
+    
+    def test_recent_buffer_is_reset_before_generation_bump(self, db, database_url: str, monkeypatch):
+        """他のプロセスのメッセージの変更で、世代番号が進む時点で最新メッセージのバッファが捨てられていることを確認"""
+        # Arrange
+        bus = InvalidationBus(database_url, origin="receiver")
+        windows = []
+        bump = generations.bump
+        
+        def record(model_name, entity_ids=None):
+            if model_name == "Message":
+                windows.append(recent_messages.stats()["windows"])
+            bump(model_name, entity_ids)
+        
+        monkeypatch.setattr(generations, "bump", record)
+        
+        # Act
+        recent_messages.seed(db)
+        bus.apply({"Message": {1}})
+        recent_messages.seed(db)
+        bus.flush()
+        
+        # Assert
+        assert windows == [0, 0]
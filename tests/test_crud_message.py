@@ -2,9 +2,11 @@
 メッセージCRUD操作のテスト
 """
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.crud import message as crud_message
-from app.schemas.message import MessageCreate
+from app.schemas.message import MessageCreate, DirectMessageCreate, MessageUpdate
+from app.crud.pagination import next_created_at_cursor, next_id_cursor
 from app.models.message import Message
 from app.models.project import Project
 from app.models.task import Task
@@ -320,4 +322,393 @@ class TestMessageCRUD:
         # Assert
         assert len(result) == 2
         assert result[0].content == "Message 1"
-        assert result[1].content == "Message 2" 
\ No newline at end of file
+        assert result[1].content == "Message 2" 
+    def test_get_messages_with_cursor(self, db: Session, test_user: User, test_project: Project):
+        """カーソルによるメッセージリストのページ送り"""
+        # Arrange
+        for i in range(5):
+            db.add(Message(
+                content=f"Message {i}",
+                message_type="comment",
+                user_id=test_user.id,
+                project_id=test_project.id
+            ))
+        db.commit()
+        
+        # Act
+        pages = []
+        cursor = None
+        while True:
+            page = crud_message.get_messages(db, project_id=test_project.id, limit=2, cursor=cursor)
+            pages.append([m.id for m in page])
+            cursor = next_created_at_cursor(page, limit=2)
+            if cursor is None:
+                break
+        
+        # Assert
+        ids = [message_id for page in pages for message_id in page]
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert len(set(ids)) == 5
+        assert ids == [m.id for m in crud_message.get_messages(db, project_id=test_project.id)]
+
+    def test_get_messages_with_invalid_cursor(self, db: Session):
+        """不正なカーソルの指定"""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            crud_message.get_messages(db, cursor="not-a-cursor")
+
+    def test_get_thread_tree(self, db: Session, test_user: User, test_project: Project):
+        """再帰CTEによるスレッド全体の取得"""
+        # Arrange
+        def post(parent=None, content="reply"):
+            message = Message(
+                content=content,
+                message_type="comment",
+                user_id=test_user.id,
+                project_id=test_project.id,
+                parent_id=parent.id if parent else None
+            )
+            db.add(message)
+            db.commit()
+            return message
+        
+        root = post(content="root")
+        a = post(root, "a")
+        b = post(root, "b")
+        a1 = post(a, "a1")
+        a1x = post(a1, "a1x")
+        post(content="unrelated")
+        expected_path = "/".join(f"{m.id:010d}" for m in (root, a, a1, a1x))
+        root_id = root.id
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Act
+        try:
+            rows = crud_message.get_thread_tree(db, root_id=root_id)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Assert
+        assert len(statements) == 1
+        assert [(row.Message.content, row.depth) for row in rows] == [
+            ("root", 0), ("a", 1), ("a1", 2), ("a1x", 3), ("b", 1)
+        ]
+        assert rows[3].path == expected_path
+
+    def test_get_thread_tree_max_depth(self, db: Session, test_user: User, test_project: Project):
+        """max_depthを超える返信は取得しない"""
+        # Arrange
+        parent = None
+        for i in range(5):
+            parent_id = parent.id if parent else None
+            parent = Message(content=f"level {i}", message_type="comment", user_id=test_user.id, parent_id=parent_id)
+            db.add(parent)
+            db.commit()
+            if i == 0:
+                root_id = parent.id
+        
+        # Act
+        rows = crud_message.get_thread_tree(db, root_id=root_id, max_depth=2)
+        
+        # Assert
+        assert [row.depth for row in rows] == [0, 1, 2]
+
+    def test_get_thread_tree_not_found(self, db: Session):
+        """存在しないルートの場合は空"""
+        assert crud_message.get_thread_tree(db, root_id=999) == []
+
+    def test_reply_updates_thread_summary(self, db: Session, test_user: User, test_project: Project):
+        """返信の作成で親メッセージの集計値が更新される"""
+        # Arrange
+        user2 = User(username="user2", email="user2@example.com")
+        db.add(user2)
+        db.commit()
+        root = crud_message.create_message(db, MessageCreate(
+            content="root", message_type="comment", user_id=test_user.id, project_id=test_project.id
+        ))
+        
+        # Act
+        replies = [
+            crud_message.create_message(db, MessageCreate(
+                content="reply", message_type="comment", user_id=author.id,
+                project_id=test_project.id, parent_id=root.id
+            ))
+            for author in (test_user, user2, test_user)
+        ]
+        db.refresh(root)
+        
+        # Assert
+        assert root.reply_count == 3
+        assert root.participant_count == 2
+        assert root.last_reply_id == replies[-1].id
+        assert root.last_reply_at == replies[-1].created_at
+
+    def test_deleting_reply_updates_thread_summary(self, db: Session, test_user: User, test_project: Project):
+        """返信の論理削除で親メッセージの集計値が更新される"""
+        # Arrange
+        user2 = User(username="user2", email="user2@example.com")
+        db.add(user2)
+        db.commit()
+        root = crud_message.create_message(db, MessageCreate(
+            content="root", message_type="comment", user_id=test_user.id, project_id=test_project.id
+        ))
+        first = crud_message.create_message(db, MessageCreate(
+            content="first", message_type="comment", user_id=test_user.id, parent_id=root.id
+        ))
+        second = crud_message.create_message(db, MessageCreate(
+            content="second", message_type="comment", user_id=user2.id, parent_id=root.id
+        ))
+        
+        # Act
+        crud_message.mark_as_deleted(db, second.id)
+        crud_message.mark_as_deleted(db, second.id)
+        db.refresh(root)
+        
+        # Assert
+        assert root.reply_count == 1
+        assert root.participant_count == 1
+        assert root.last_reply_id == first.id
+        assert root.last_reply_at == first.created_at
+        
+        # 最後の返信も削除すると集計値が空になる
+        crud_message.mark_as_deleted(db, first.id)
+        db.refresh(root)
+        assert root.reply_count == 0
+        assert root.participant_count == 0
+        assert root.last_reply_id is None
+        assert root.last_reply_at is None
+
+    def test_reply_keeps_parent_updated_at(self, db: Session, test_user: User, test_project: Project):
+        """返信の作成・削除で親メッセージの updated_at は変わらない"""
+        # Arrange
+        root = crud_message.create_message(db, MessageCreate(
+            content="root", message_type="comment", user_id=test_user.id, project_id=test_project.id
+        ))
+        updated_at = root.updated_at
+        
+        # Act
+        reply = crud_message.create_message(db, MessageCreate(
+            content="reply", message_type="comment", user_id=test_user.id, parent_id=root.id
+        ))
+        db.refresh(root)
+        after_reply = root.updated_at
+        crud_message.mark_as_deleted(db, reply.id)
+        db.refresh(root)
+        
+        # Assert
+        assert after_reply == updated_at
+        assert root.updated_at == updated_at
+        assert root.reply_count == 0
+
+    def test_update_message_deleting_reply_updates_thread_summary(
+        self, db: Session, test_user: User, test_project: Project
+    ):
+        """update_message での論理削除・削除の取り消しでも親メッセージの集計値が更新される"""
+        # Arrange
+        root = crud_message.create_message(db, MessageCreate(
+            content="root", message_type="comment", user_id=test_user.id, project_id=test_project.id
+        ))
+        first = crud_message.create_message(db, MessageCreate(
+            content="first", message_type="comment", user_id=test_user.id, parent_id=root.id
+        ))
+        second = crud_message.create_message(db, MessageCreate(
+            content="second", message_type="comment", user_id=test_user.id, parent_id=root.id
+        ))
+        
+        # Act / Assert
+        crud_message.update_message(db, second.id, MessageUpdate(is_deleted=True))
+        db.refresh(root)
+        assert root.reply_count == 1
+        assert root.participant_count == 1
+        assert root.last_reply_id == first.id
+        
+        crud_message.update_message(db, second.id, MessageUpdate(is_deleted=True))
+        db.refresh(root)
+        assert root.reply_count == 1
+        
+        crud_message.update_message(db, second.id, MessageUpdate(is_deleted=False))
+        db.refresh(root)
+        assert root.reply_count == 2
+        assert root.participant_count == 1
+        assert root.last_reply_id == second.id
+        assert root.last_reply_at == second.created_at
+
+    def test_get_conversations(self, db: Session, test_user: User, test_project: Project, test_task: Task):
+        """DM相手と参加チャンネルごとに最新メッセージと未読数を取得"""
+        # Arrange
+        user2 = User(username="user2", email="user2@example.com")
+        user3 = User(username="user3", email="user3@example.com")
+        db.add_all([user2, user3])
+        db.commit()
+        crud_message.create_message(db, MessageCreate(
+            content="project post", message_type="comment", user_id=test_user.id, project_id=test_project.id
+        ))
+        project_reply = crud_message.create_message(db, MessageCreate(
+            content="project reply", message_type="comment", user_id=user2.id, project_id=test_project.id
+        ))
+        # test_userが参加していないタスクのメッセージは含まれない
+        crud_message.create_message(db, MessageCreate(
+            content="task post", message_type="comment", user_id=user2.id, task_id=test_task.id
+        ))
+        crud_message.create_direct_message(db, DirectMessageCreate(
+            content="hello", user_id=user2.id, recipient_id=test_user.id
+        ))
+        dm_latest = crud_message.create_direct_message(db, DirectMessageCreate(
+            content="again", user_id=user2.id, recipient_id=test_user.id
+        ))
+        sent = crud_message.create_direct_message(db, DirectMessageCreate(
+            content="to user3", user_id=test_user.id, recipient_id=user3.id
+        ))
+        
+        # Act
+        rows = crud_message.get_conversations(db, user_id=test_user.id)
+        
+        # Assert
+        assert [(r.channel_type, r.channel_id, r.Message.id, r.unread_count) for r in rows] == [
+            ("dm", user3.id, sent.id, 0),
+            ("dm", user2.id, dm_latest.id, 2),
+            ("project", test_project.id, project_reply.id, 1),
+        ]
+        
+        # カーソルによるページ送り
+        first = crud_message.get_conversations(db, user_id=test_user.id, limit=2)
+        second = crud_message.get_conversations(
+            db, user_id=test_user.id, limit=2, cursor=next_id_cursor([r.Message for r in first], limit=2)
+        )
+        assert [r.channel_id for r in first] == [user3.id, user2.id]
+        assert [(r.channel_type, r.channel_id) for r in second] == [("project", test_project.id)]
+
+    def test_get_direct_messages_with_fields(self, db: Session, test_user: User):
+        """ダイレクトメッセージでもUNIONの内側で指定した列だけをSELECTすることを確認"""
+        # Arrange
+        other = User(username="other", email="other@example.com")
+        db.add(other)
+        db.commit()
+        for sender, recipient in ((test_user.id, other.id), (other.id, test_user.id)):
+            crud_message.create_direct_message(db, DirectMessageCreate(
+                content="secret", user_id=sender, recipient_id=recipient
+            ))
+        user_id, other_id = test_user.id, other.id
+        db.expunge_all()
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Act
+        try:
+            messages = crud_message.get_direct_messages(db, user_id, other_id, fields=["user_id"])
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Assert
+        assert sorted(m.user_id for m in messages) == sorted([user_id, other_id])
+        assert len(statements) == 1
+        assert "content" not in statements[0]
+
+    def test_create_messages_bulk(self, db: Session, test_user: User, test_project: Project):
+        """複数メッセージを1トランザクションで作成し、未読数とスレッド集計値をまとめて更新"""
+        from app.crud import unread_counter as crud_unread_counter
+        
+        # Arrange
+        user2 = User(username="user2", email="user2@example.com")
+        db.add(user2)
+        db.commit()
+        parent = crud_message.create_message(db, MessageCreate(
+            content="parent", message_type="comment", user_id=user2.id, project_id=test_project.id
+        ))
+        batch = [
+            MessageCreate(
+                content=f"build {i}", message_type="status_update",
+                user_id=test_user.id, project_id=test_project.id
+            )
+            for i in range(3)
+        ] + [
+            MessageCreate(content="dm", message_type="direct_message", user_id=test_user.id, recipient_id=user2.id),
+            MessageCreate(content="dm", message_type="direct_message", user_id=test_user.id, recipient_id=user2.id),
+        ]
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Act
+        try:
+            results = crud_message.create_messages_bulk(db, batch)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", capture)
+        reply = crud_message.create_messages_bulk(db, [MessageCreate(
+            content="reply", message_type="comment", user_id=test_user.id,
+            project_id=test_project.id, parent_id=parent.id
+        )])[0]
+        
+        # Assert
+        assert [m.content for m in results] == ["build 0", "build 1", "build 2", "dm", "dm"]
+        assert [m.id for m in results] == sorted(m.id for m in results)
+        assert sum(s.startswith("INSERT INTO messages") for s in statements) == 1
+        counts = {
+            (c.channel_type, c.channel_id): c.unread_count
+            for c in crud_unread_counter.get_unread_counts(db, user2.id)
+        }
+        assert counts == {("project", test_project.id): 4, ("dm", test_user.id): 2}
+        db.refresh(parent)
+        assert parent.reply_count == 1
+        assert parent.last_reply_id == reply.id
+
+    def test_create_messages_bulk_keeps_input_order_on_other_databases(
+        self, db: Session, test_user: User, monkeypatch
+    ):
+        """SQLite以外ではIDの並べ替えではなく、入力の順序で返すようSQLAlchemyに指定する"""
+        # Arrange
+        monkeypatch.setattr(db.get_bind().dialect, "name", "postgresql")
+        batch = [
+            MessageCreate(content=f"item {i}", message_type="comment", user_id=test_user.id)
+            for i in range(3)
+        ]
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Act
+        try:
+            results = crud_message.create_messages_bulk(db, batch)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Assert
+        assert [m.content for m in results] == ["item 0", "item 1", "item 2"]
+        # sort_by_parameter_order=True は、SQLiteでは1行ずつのINSERTで実行される
+        assert sum(s.startswith("INSERT INTO messages") for s in statements) == 3
+
+    def test_create_messages_bulk_partial_failure(self, db: Session, test_user: User, test_project: Project):
+        """失敗した項目だけを例外として返し、atomic指定時は1件も作成しない"""
+        from sqlalchemy.exc import IntegrityError
+        
+        # Arrange
+        good = MessageCreate(content="ok", message_type="comment", user_id=test_user.id, project_id=test_project.id)
+        # 検証を通さずにNOT NULL制約に違反するメッセージを作る
+        bad = MessageCreate.model_construct(**dict(good.model_dump(), content=None))
+        
+        # Act
+        results = crud_message.create_messages_bulk(db, [good, bad, good])
+        
+        # Assert
+        assert isinstance(results[0], Message)
+        assert isinstance(results[1], IntegrityError)
+        assert isinstance(results[2], Message)
+        assert db.query(Message).count() == 2
+        
+        with pytest.raises(IntegrityError):
+            crud_message.create_messages_bulk(db, [good, bad], atomic=True)
+        assert db.query(Message).count() == 2
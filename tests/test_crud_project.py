@@ -2,10 +2,13 @@
 プロジェクトCRUD操作のテスト
 """
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.crud import project as crud_project
+from app.crud.cache import invalidate, pending_invalidations
 from app.schemas.project import ProjectCreate, ProjectUpdate
 from app.models.project import Project
+from app.models.task import Task
 
 
 class TestProjectCRUD:
@@ -167,4 +170,48 @@ class TestProjectCRUD:
         result = crud_project.delete_project(db, project_id=999)
         
         # Assert
-        assert result is False 
\ No newline at end of file
+        assert result is False
+
+    def test_delete_project_not_found_keeps_pending_changes(self, db: Session):
+        """存在しないプロジェクトの削除で、呼び出し元の未コミットの変更と関連行が残ることを確認"""
+        # Arrange
+        pending = Project(name="Pending")
+        db.add_all([pending, Task(title="Orphan", status="pending", project_id=999)])
+        db.flush()
+        invalidate(db, Project, pending.id)
+        
+        # Act
+        result = crud_project.delete_project(db, project_id=999)
+        
+        # Assert
+        assert result is False
+        assert pending_invalidations(db) == {"Project": {pending.id}}
+        db.commit()
+        assert db.query(Project).filter(Project.name == "Pending").count() == 1
+        assert db.query(Task).filter(Task.title == "Orphan").count() == 1
+
+    def test_create_project_single_round_trip(self, db: Session):
+        """プロジェクト作成がINSERT ... RETURNINGの1文で完了することを確認"""
+        # Arrange
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Act
+        try:
+            result = crud_project.create_project(db, ProjectCreate(name="One Trip"))
+            values = (result.id, result.name, result.created_at, result.updated_at)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Assert
+        assert len(statements) == 1
+        assert "RETURNING" in statements[0]
+        assert values[0] is not None
+        assert values[1] == "One Trip"
+        # 返された値はDBから再取得した値と一致する
+        db.expire(result)
+        assert (result.id, result.name, result.created_at, result.updated_at) == values
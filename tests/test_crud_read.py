@@ -0,0 +1,95 @@
+"""
+ORMを経由しない読み取り（crud.read）のテスト
+"""
+import pytest
+from sqlalchemy import RowMapping
+from sqlalchemy.orm import Session
+from app import crud
+from app.crud import read as crud_read
+from app.crud.pagination import next_created_at_cursor
+from app.models.message import Message
+from app.models.project import Project
+from app.models.user import User
+
+
+class TestReadCRUD:
+    """読み取り専用クエリのテストクラス"""
+
+    @pytest.fixture
+    def test_user(self, db: Session) -> User:
+        """テスト用のユーザーを作成"""
+        user = User(username="testuser", email="test@example.com")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+    @pytest.fixture
+    def test_project(self, db: Session) -> Project:
+        """テスト用のプロジェクトを作成"""
+        project = Project(name="Test Project", description="Test Description")
+        db.add(project)
+        db.commit()
+        db.refresh(project)
+        return project
+
+    @pytest.fixture
+    def messages(self, db: Session, test_user: User, test_project: Project) -> list:
+        """種類の異なるメッセージを作成"""
+        messages = [
+            Message(content=f"Message {i}", message_type="comment" if i % 2 else "status_update",
+                    user_id=test_user.id, project_id=test_project.id)
+            for i in range(5)
+        ]
+        db.add_all(messages)
+        db.commit()
+        return messages
+
+    def test_select_messages_matches_orm(self, db: Session, test_project: Project, messages: list):
+        """ORMのget_messagesと同じ行を同じ順序で返すことを確認"""
+        # Act
+        rows = crud_read.select_messages(db, project_id=test_project.id, message_type="comment")
+        expected = crud.message.get_messages(db, project_id=test_project.id, message_type="comment")
+        
+        # Assert
+        assert [row["id"] for row in rows] == [message.id for message in expected]
+        assert all(isinstance(row, RowMapping) for row in rows)
+        assert rows[0]["content"] == expected[0].content
+
+    def test_select_messages_builds_no_orm_instances(self, db: Session, messages: list):
+        """結果の行がセッションのアイデンティティマップに登録されないことを確認"""
+        # Arrange
+        db.expunge_all()
+        
+        # Act
+        rows = crud_read.select_messages(db)
+        
+        # Assert
+        assert len(rows) == 5
+        assert len(db.identity_map) == 0
+
+    def test_select_messages_with_fields_and_cursor(self, db: Session, messages: list):
+        """fieldsで列を絞り込み、カーソルで次ページを取得できることを確認"""
+        # Act
+        first = crud_read.select_messages(db, limit=3, fields=["content"])
+        cursor = next_created_at_cursor(first, 3)
+        second = crud_read.select_messages(db, limit=3, cursor=cursor, fields=["content"])
+        
+        # Assert
+        assert set(first[0].keys()) == {"id", "content", "created_at"}
+        assert len(second) == 2
+        assert not {row["id"] for row in first} & {row["id"] for row in second}
+
+    def test_select_messages_unknown_field(self, db: Session):
+        """存在しない列名を指定するとValueError"""
+        with pytest.raises(ValueError, match="Unknown fields"):
+            crud_read.select_messages(db, fields=["secret"])
+
+    def test_select_users_by_id(self, db: Session, test_user: User):
+        """複数ユーザーをIDをキーにした辞書で取得"""
+        # Act
+        users = crud_read.select_users_by_id(db, [test_user.id, test_user.id, 999], ["username"])
+        
+        # Assert
+        assert list(users) == [test_user.id]
+        assert dict(users[test_user.id]) == {"id": test_user.id, "username": "testuser"}
@@ -0,0 +1,127 @@
+"""
+既読カーソルCRUD操作のテスト
+"""
+import pytest
+from sqlalchemy.orm import Session
+
+from app.crud import read_cursor as crud_read_cursor
+from app.crud import message as crud_message
+from app.models.message import Message
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+
+class TestReadCursorCRUD:
+    """既読カーソルCRUD操作のテストクラス"""
+
+    @pytest.fixture
+    def users(self, db: Session) -> list:
+        """テスト用のユーザーを作成"""
+        users = [
+            User(username="alice", email="alice@example.com"),
+            User(username="bob", email="bob@example.com"),
+        ]
+        db.add_all(users)
+        db.commit()
+        return users
+
+    @pytest.fixture
+    def test_project(self, db: Session) -> Project:
+        """テスト用のプロジェクトを作成"""
+        project = Project(name="Test Project")
+        db.add(project)
+        db.commit()
+        return project
+
+    def _post(self, db: Session, **kwargs) -> Message:
+        message = Message(content="hello", message_type="comment", **kwargs)
+        db.add(message)
+        db.commit()
+        return message
+
+    def test_resolve_channel(self):
+        """チャンネルの決定"""
+        assert crud_read_cursor.resolve_channel(project_id=1) == ("project", 1)
+        assert crud_read_cursor.resolve_channel(task_id=2) == ("task", 2)
+        assert crud_read_cursor.resolve_channel(peer_id=3) == ("dm", 3)
+
+    @pytest.mark.parametrize("kwargs", [{}, {"project_id": 1, "task_id": 2}])
+    def test_resolve_channel_requires_exactly_one(self, kwargs):
+        """チャンネル指定が1つでない場合はエラー"""
+        with pytest.raises(ValueError, match="Exactly one"):
+            crud_read_cursor.resolve_channel(**kwargs)
+
+    def test_message_channel(self, db: Session, users: list, test_project: Project):
+        """メッセージの所属チャンネルの判定"""
+        alice, bob = users
+        task = Task(title="Task", status="pending", project_id=test_project.id)
+        db.add(task)
+        db.commit()
+
+        dm = self._post(db, user_id=alice.id, recipient_id=bob.id)
+        task_message = self._post(db, user_id=alice.id, project_id=test_project.id, task_id=task.id)
+        project_message = self._post(db, user_id=alice.id, project_id=test_project.id)
+
+        assert crud_read_cursor.message_channel(dm, bob.id) == ("dm", alice.id)
+        assert crud_read_cursor.message_channel(dm, alice.id) == ("dm", bob.id)
+        assert crud_read_cursor.message_channel(task_message, bob.id) == ("task", task.id)
+        assert crud_read_cursor.message_channel(project_message, bob.id) == ("project", test_project.id)
+
+    def test_unread_without_cursor(self, db: Session, users: list, test_project: Project):
+        """カーソルがない場合は他人の全メッセージが未読"""
+        alice, bob = users
+        self._post(db, user_id=alice.id, project_id=test_project.id)
+        self._post(db, user_id=bob.id, project_id=test_project.id)
+
+        unread = crud_read_cursor.get_unread_channel_messages(db, bob.id, "project", test_project.id)
+
+        assert [m.user_id for m in unread] == [alice.id]
+
+    def test_mark_channel_read(self, db: Session, users: list, test_project: Project):
+        """チャンネルを既読にすると以降のメッセージのみ未読になる"""
+        alice, bob = users
+        self._post(db, user_id=alice.id, project_id=test_project.id)
+        last = self._post(db, user_id=alice.id, project_id=test_project.id)
+
+        cursor = crud_read_cursor.mark_channel_read(db, bob.id, "project", test_project.id)
+        newer = self._post(db, user_id=alice.id, project_id=test_project.id)
+        unread = crud_read_cursor.get_unread_channel_messages(db, bob.id, "project", test_project.id)
+
+        assert cursor.last_read_message_id == last.id
+        assert [m.id for m in unread] == [newer.id]
+
+    def test_read_cursor_never_moves_backwards(self, db: Session, users: list, test_project: Project):
+        """既読カーソルは後退しない"""
+        alice, bob = users
+        first = self._post(db, user_id=alice.id, project_id=test_project.id)
+        second = self._post(db, user_id=alice.id, project_id=test_project.id)
+
+        crud_read_cursor.mark_channel_read(db, bob.id, "project", test_project.id, message_id=second.id)
+        cursor = crud_read_cursor.mark_channel_read(db, bob.id, "project", test_project.id, message_id=first.id)
+
+        assert cursor.last_read_message_id == second.id
+
+    def test_read_state_is_per_user(self, db: Session, users: list, test_project: Project):
+        """既読状態がユーザーごとに独立している"""
+        alice, bob = users
+        carol = User(username="carol", email="carol@example.com")
+        db.add(carol)
+        db.commit()
+        self._post(db, user_id=alice.id, project_id=test_project.id)
+
+        crud_read_cursor.mark_channel_read(db, bob.id, "project", test_project.id)
+
+        assert crud_read_cursor.get_unread_channel_messages(db, bob.id, "project", test_project.id) == []
+        assert len(crud_read_cursor.get_unread_channel_messages(db, carol.id, "project", test_project.id)) == 1
+
+    def test_mark_conversation_as_read_advances_dm_cursor(self, db: Session, users: list):
+        """会話の既読化でDMチャンネルのカーソルも進む"""
+        alice, bob = users
+        dm = self._post(db, user_id=alice.id, recipient_id=bob.id)
+
+        crud_message.mark_conversation_as_read(db, user_id=bob.id, other_user_id=alice.id)
+
+        cursor = crud_read_cursor.get_read_cursor(db, bob.id, "dm", alice.id)
+        assert cursor.last_read_message_id == dm.id
+        assert crud_read_cursor.get_unread_channel_messages(db, bob.id, "dm", alice.id) == []
@@ -0,0 +1,189 @@
+"""
+最新メッセージのバッファ（crud.recent）のテスト
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.crud import message as crud_message
+from app.crud import project as crud_project
+from app.crud.cache import generations
+from app.crud.recent import RecentMessages, record_created, recent_messages
+from app.schemas.message import MessageCreate, MessageUpdate
+from app.models.message import Message
+from app.models.project import Project
+from app.models.user import User
+
+
+class TestRecentMessages:
+    """最新メッセージのバッファのテストクラス"""
+    
+    @pytest.fixture
+    def test_user(self, db: Session) -> User:
+        """テスト用のユーザーを作成"""
+        user = User(username="testuser", email="test@example.com")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+    
+    @pytest.fixture
+    def test_project(self, db: Session) -> Project:
+        """テスト用のプロジェクトを作成"""
+        project = Project(name="Test Project", description="Test Description")
+        db.add(project)
+        db.commit()
+        db.refresh(project)
+        return project
+    
+    @pytest.fixture
+    def statements(self, db: Session):
+        """発行されたSQLを記録"""
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        yield statements
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+    
+    def create(self, db: Session, user: User, content: str, project_id=None) -> Message:
+        return crud_message.create_message(db, MessageCreate(
+            content=content, message_type="comment", user_id=user.id, project_id=project_id
+        ))
+    
+    def test_serves_from_memory_after_seed(self, db: Session, test_user: User, statements: list):
+        """読み込み後は作成したメッセージも含めてSQLを発行せずに返すことを確認"""
+        # Arrange
+        self.create(db, test_user, "first")
+        recent_messages.seed(db)
+        self.create(db, test_user, "second")
+        statements.clear()
+        
+        # Act
+        rows = recent_messages.latest(db, limit=10)
+        
+        # Assert
+        assert [row["content"] for row in rows] == ["second", "first"]
+        assert statements == []
+    
+    def test_matches_database_order(self, db: Session, test_user: User, test_project: Project):
+        """プロジェクトごとのバッファが select_messages と同じ結果を返すことを確認"""
+        # Arrange
+        for i in range(5):
+            self.create(db, test_user, f"Message {i}", project_id=test_project.id if i % 2 else None)
+        
+        # Act
+        rows = recent_messages.latest(db, limit=10, project_id=test_project.id)
+        everything = recent_messages.latest(db, limit=3)
+        
+        # Assert
+        assert [row["content"] for row in rows] == ["Message 3", "Message 1"]
+        assert [row["content"] for row in everything] == ["Message 4", "Message 3", "Message 2"]
+    
+    def test_delete_and_restore(self, db: Session, test_user: User):
+        """論理削除で取り除かれ、削除の取り消しで戻ることを確認"""
+        # Arrange
+        messages = [self.create(db, test_user, f"Message {i}") for i in range(3)]
+        recent_messages.seed(db)
+        
+        # Act / Assert
+        crud_message.mark_as_deleted(db, messages[1].id)
+        assert [row["content"] for row in recent_messages.latest(db, limit=10)] == ["Message 2", "Message 0"]
+        
+        crud_message.update_message(db, messages[1].id, MessageUpdate(is_deleted=False))
+        assert len(recent_messages.latest(db, limit=10)) == 3
+    
+    def test_delete_by_update(self, db: Session, test_user: User):
+        """update_message での論理削除でもバッファから取り除かれることを確認"""
+        # Arrange
+        messages = [self.create(db, test_user, f"Message {i}") for i in range(2)]
+        recent_messages.seed(db)
+        
+        # Act
+        crud_message.update_message(db, messages[1].id, MessageUpdate(is_deleted=True))
+        
+        # Assert
+        assert [row["content"] for row in recent_messages.latest(db, limit=10)] == ["Message 0"]
+    
+    def test_rollback_is_not_applied(self, db: Session, test_user: User):
+        """ロールバックした作成はバッファに反映されないことを確認"""
+        # Arrange
+        recent_messages.seed(db)
+        message = Message(content="rolled back", message_type="comment", user_id=test_user.id)
+        db.add(message)
+        db.flush()
+        
+        # Act
+        record_created(db, message)
+        db.rollback()
+        
+        # Assert
+        assert recent_messages.latest(db, limit=10) == []
+    
+    def test_savepoint_release_is_not_applied(self, db: Session, test_user: User):
+        """SAVEPOINTの解放ではバッファに反映せず、外側のロールバックで捨てられることを確認"""
+        # Arrange
+        recent_messages.seed(db)
+        message = Message(content="rolled back", message_type="comment", user_id=test_user.id)
+        db.add(message)
+        db.flush()
+        record_created(db, message)
+        
+        # Act
+        with db.begin_nested():
+            pass
+        db.rollback()
+        
+        # Assert
+        assert recent_messages.latest(db, limit=10) == []
+    
+    def test_window_keeps_only_known_rows(self, db: Session, test_user: User):
+        """件数上限を超えた後、削除で足りなくなった件数はDBから読み直すことを確認"""
+        # Arrange
+        buffer = RecentMessages(size=2, ttl=60)
+        messages = [self.create(db, test_user, f"Message {i}") for i in range(3)]
+        buffer.seed(db)
+        crud_message.mark_as_deleted(db, messages[2].id)
+        buffer.apply([("deleted", messages[2].id)])
+        
+        # Act
+        rows = buffer.latest(db, limit=2)
+        
+        # Assert
+        assert [row["content"] for row in rows] == ["Message 1", "Message 0"]
+        assert buffer.stats()["misses"] == 1
+        assert buffer.latest(db, limit=3) is None
+    
+    def test_delete_project_resets(self, db: Session, test_user: User, test_project: Project):
+        """プロジェクト削除でバッファが捨てられ、project_idの変更が反映されることを確認"""
+        # Arrange
+        self.create(db, test_user, "in project", project_id=test_project.id)
+        recent_messages.latest(db, limit=10, project_id=test_project.id)
+        
+        # Act
+        crud_project.delete_project(db, test_project.id)
+        
+        # Assert
+        assert recent_messages.stats()["windows"] == 0
+        assert recent_messages.latest(db, limit=10)[0]["project_id"] is None
+    
+    def test_buffer_is_updated_before_generation_bump(self, db: Session, test_user: User, monkeypatch):
+        """コミット後にメッセージの世代番号が進む時点で、バッファに作成したメッセージが含まれることを確認"""
+        # Arrange
+        recent_messages.seed(db)
+        seen = []
+        bump = generations.bump
+        
+        def record(model_name, entity_ids=None):
+            if model_name == "Message":
+                seen.append([row["content"] for row in recent_messages.latest(db, limit=10)])
+            bump(model_name, entity_ids)
+        
+        monkeypatch.setattr(generations, "bump", record)
+        
+        # Act
+        self.create(db, test_user, "new")
+        
+        # Assert: 最後（コミット後）の世代番号の更新では、新しいメッセージが見える
+        assert seen[-1] == ["new"]
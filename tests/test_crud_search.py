@@ -0,0 +1,136 @@
+"""
+メッセージ全文検索のテスト
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.crud import search as crud_search
+from app.crud.pagination import encode_cursor
+from app.db.database import Base
+from app.db.search_index import is_search_index_object
+from app.models.message import Message
+from app.models.project import Project
+from app.models.user import User
+
+
+class TestMessageSearch:
+    """メッセージ全文検索のテストクラス"""
+
+    @pytest.fixture
+    def test_user(self, db: Session) -> User:
+        """テスト用のユーザーを作成"""
+        user = User(username="testuser", email="test@example.com")
+        db.add(user)
+        db.commit()
+        return user
+
+    @pytest.fixture
+    def test_project(self, db: Session) -> Project:
+        """テスト用のプロジェクトを作成"""
+        project = Project(name="Test Project")
+        db.add(project)
+        db.commit()
+        return project
+
+    def _post(self, db: Session, user: User, content: str, **kwargs) -> Message:
+        message = Message(content=content, message_type="comment", user_id=user.id, **kwargs)
+        db.add(message)
+        db.commit()
+        return message
+
+    def _ids(self, rows) -> list:
+        return sorted(row.Message.id for row in rows)
+
+    def test_search_japanese_without_spaces(self, db: Session, test_user: User):
+        """空白のない日本語の部分一致で検索できる"""
+        hit = self._post(db, test_user, "本番環境へのデプロイが完了しました")
+        self._post(db, test_user, "レビューをお願いします")
+
+        rows = crud_search.search_messages(db, "デプロイ")
+
+        assert self._ids(rows) == [hit.id]
+        assert "[デプロイ]" in rows[0].snippet
+
+    def test_search_requires_all_terms(self, db: Session, test_user: User):
+        """全ての語を含むメッセージのみ返す"""
+        both = self._post(db, test_user, "deploy finished on staging")
+        self._post(db, test_user, "deploy started")
+
+        rows = crud_search.search_messages(db, "deploy staging")
+
+        assert self._ids(rows) == [both.id]
+
+    def test_search_ranks_better_matches_first(self, db: Session, test_user: User):
+        """関連度の高いメッセージが先に並ぶ"""
+        weak = self._post(db, test_user, "a long message that mentions the release only once among many other words")
+        strong = self._post(db, test_user, "release release release")
+
+        rows = crud_search.search_messages(db, "release")
+
+        assert [row.Message.id for row in rows] == [strong.id, weak.id]
+
+    def test_search_short_terms(self, db: Session, test_user: User):
+        """3文字未満の語も部分一致で検索できる"""
+        hit = self._post(db, test_user, "CIが落ちています")
+        self._post(db, test_user, "テストは成功")
+
+        assert self._ids(crud_search.search_messages(db, "CI")) == [hit.id]
+
+    def test_search_excludes_deleted(self, db: Session, test_user: User):
+        """削除済みメッセージは検索対象外"""
+        self._post(db, test_user, "secret plan", is_deleted=True)
+
+        assert crud_search.search_messages(db, "secret") == []
+
+    def test_search_follows_content_updates(self, db: Session, test_user: User):
+        """本文の更新がトリガーで索引に反映される"""
+        message = self._post(db, test_user, "old wording")
+
+        message.content = "new wording"
+        db.commit()
+
+        assert crud_search.search_messages(db, "old") == []
+        assert self._ids(crud_search.search_messages(db, "new wording")) == [message.id]
+
+    def test_search_filters(self, db: Session, test_user: User, test_project: Project):
+        """プロジェクトと日時による絞り込み"""
+        in_project = self._post(db, test_user, "incident report", project_id=test_project.id)
+        self._post(db, test_user, "incident report")
+        old = self._post(db, test_user, "incident report", project_id=test_project.id)
+        old.created_at = datetime.now() - timedelta(days=30)
+        db.commit()
+
+        rows = crud_search.search_messages(
+            db, "incident", project_id=test_project.id, since=datetime.now() - timedelta(days=1)
+        )
+
+        assert self._ids(rows) == [in_project.id]
+
+    def test_search_pagination(self, db: Session, test_user: User):
+        """(score, id) カーソルによるページ送り"""
+        for i in range(5):
+            self._post(db, test_user, f"build {i} passed")
+
+        first = crud_search.search_messages(db, "build", limit=3)
+        cursor = encode_cursor(first[-1].score, first[-1].Message.id)
+        second = crud_search.search_messages(db, "build", limit=3, cursor=cursor)
+
+        assert len(first) == 3
+        assert len(second) == 2
+        assert not set(self._ids(first)) & set(self._ids(second))
+
+    def test_search_empty_query(self, db: Session):
+        """空の検索文字列はエラー"""
+        with pytest.raises(ValueError, match="Search query is required"):
+            crud_search.search_messages(db, "   ")
+
+    def test_search_index_tables_are_excluded_from_autogenerate(self, db: Session):
+        """FTS5のテーブルとシャドウテーブルはマイグレーションの自動生成の対象外"""
+        tables = inspect(db.get_bind()).get_table_names()
+        search_tables = [name for name in tables if is_search_index_object(name, "table")]
+
+        assert "messages_fts" in search_tables
+        assert set(tables) - set(search_tables) == set(Base.metadata.tables)
@@ -2,9 +2,14 @@
 タスクCRUD操作のテスト
 """
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from app.crud import task as crud_task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.message import MessageCreate
+from app.schemas.task import TaskBulkUpdate, TaskCreate, TaskUpdate
+from app.crud.pagination import next_id_cursor
+from app.models.message import Message
 from app.models.task import Task
 from app.models.project import Project
 from app.models.user import User
@@ -292,4 +297,252 @@ class TestTaskCRUD:
         result = crud_task.delete_task(db, task_id=999)
         
         # Assert
-        assert result is False 
\ No newline at end of file
+        assert result is False 
+    def test_get_tasks_with_cursor(self, db: Session, test_project: Project):
+        """カーソルによるタスクリストのページ送り"""
+        # Arrange
+        for i in range(5):
+            db.add(Task(title=f"Task {i}", status="pending", project_id=test_project.id))
+        db.commit()
+        
+        # Act
+        first = crud_task.get_tasks(db, limit=3)
+        second = crud_task.get_tasks(db, limit=3, cursor=next_id_cursor(first, limit=3))
+        
+        # Assert
+        assert [t.title for t in first] == ["Task 0", "Task 1", "Task 2"]
+        assert [t.title for t in second] == ["Task 3", "Task 4"]
+        assert next_id_cursor(second, limit=3) is None
+
+    def test_update_task_single_statement(self, db: Session, test_project: Project):
+        """タスク更新がUPDATE ... RETURNINGの1文で完了することを確認"""
+        # Arrange
+        task = Task(title="Before", status="pending", project_id=test_project.id)
+        db.add(task)
+        db.commit()
+        task_id = task.id
+        db.expunge_all()
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Act
+        try:
+            result = crud_task.update_task(db, task_id=task_id, task=TaskUpdate(title="After"))
+            title = result.title
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Assert
+        assert title == "After"
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE")
+        assert "RETURNING" in statements[0]
+
+    def test_update_task_expected_updated_at(self, db: Session, test_project: Project):
+        """updated_atの前提条件による楽観的排他制御のテスト"""
+        # Arrange
+        task = Task(title="Original", status="pending", project_id=test_project.id)
+        db.add(task)
+        db.commit()
+        task_id = task.id
+        loaded_at = task.updated_at
+        
+        # Act: 読み込んだ時点のupdated_atを指定すると更新できる
+        updated = crud_task.update_task(
+            db, task_id=task_id, task=TaskUpdate(title="First"), expected_updated_at=loaded_at
+        )
+        
+        # Assert
+        assert updated.title == "First"
+        assert updated.updated_at != loaded_at
+        
+        # 古いupdated_atでの更新は拒否され、内容は変わらない
+        with pytest.raises(StaleDataError):
+            crud_task.update_task(
+                db, task_id=task_id, task=TaskUpdate(title="Second"), expected_updated_at=loaded_at
+            )
+        assert crud_task.get_task(db, task_id=task_id).title == "First"
+        
+        # 存在しないタスクはNoneを返す
+        assert crud_task.update_task(
+            db, task_id=999, task=TaskUpdate(title="X"), expected_updated_at=loaded_at
+        ) is None
+
+    def test_not_found_keeps_pending_changes(self, db: Session):
+        """存在しないタスクの更新・削除で、呼び出し元の未コミットの変更が捨てられないことを確認"""
+        # Arrange
+        db.add(Project(name="Pending"))
+        db.flush()
+        
+        # Act
+        updated = crud_task.update_task(db, task_id=999, task=TaskUpdate(title="X"))
+        deleted = crud_task.delete_task(db, task_id=999)
+        db.commit()
+        
+        # Assert
+        assert updated is None
+        assert deleted is False
+        assert db.query(Project).filter(Project.name == "Pending").count() == 1
+
+    def test_delete_task_single_statement(self, db: Session, test_project: Project):
+        """タスク削除が事前のSELECTなしにDELETE 1文で完了することを確認"""
+        # Arrange
+        task = Task(title="Gone", status="pending", project_id=test_project.id)
+        db.add(task)
+        db.commit()
+        task_id = task.id
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Act
+        try:
+            result = crud_task.delete_task(db, task_id=task_id)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Assert
+        assert result is True
+        assert len(statements) == 1
+        assert statements[0].startswith("DELETE")
+
+    def test_bulk_update_tasks_by_filter(self, db: Session, test_project: Project, test_user: User):
+        """条件に一致するタスクをチャンクに分けて一括更新し、まとめのメッセージを投稿"""
+        # Arrange
+        other = User(username="other", email="other@example.com")
+        db.add(other)
+        db.add_all([
+            Task(title=f"Task {i}", status="pending", project_id=test_project.id, assignee_id=test_user.id)
+            for i in range(5)
+        ])
+        db.add(Task(title="Done", status="completed", project_id=test_project.id, assignee_id=test_user.id))
+        db.commit()
+        
+        # Act
+        updated, message = crud_task.bulk_update_tasks(
+            db,
+            TaskBulkUpdate(assignee_id=other.id, status="in_progress"),
+            assignee_id=test_user.id,
+            status="pending",
+            summary=MessageCreate(
+                content="reassigned", message_type="task_update",
+                user_id=test_user.id, project_id=test_project.id
+            ),
+            chunk_size=2
+        )
+        
+        # Assert
+        assert updated == 5
+        assert message.content == "reassigned"
+        tasks = crud_task.get_tasks(db, assignee_id=other.id)
+        assert len(tasks) == 5
+        assert {t.status for t in tasks} == {"in_progress"}
+        assert [t.title for t in crud_task.get_tasks(db, assignee_id=test_user.id)] == ["Done"]
+
+    def test_bulk_update_tasks_by_ids(self, db: Session, test_project: Project, test_user: User):
+        """IDリストで指定したタスクの担当者を外し、他のプロジェクトへ移動"""
+        # Arrange
+        target = Project(name="Target")
+        tasks = [
+            Task(title=f"Task {i}", status="pending", project_id=test_project.id, assignee_id=test_user.id)
+            for i in range(3)
+        ]
+        db.add(target)
+        db.add_all(tasks)
+        db.commit()
+        
+        # Act
+        updated, message = crud_task.bulk_update_tasks(
+            db,
+            TaskBulkUpdate(assignee_id=None, project_id=target.id),
+            task_ids=[tasks[0].id, tasks[2].id, tasks[2].id, 999]
+        )
+        
+        # Assert
+        assert updated == 2
+        assert message is None
+        moved = crud_task.get_tasks(db, project_id=target.id)
+        assert [t.id for t in moved] == [tasks[0].id, tasks[2].id]
+        assert all(t.assignee_id is None for t in moved)
+        assert crud_task.get_task(db, tasks[1].id).project_id == test_project.id
+
+    def test_bulk_update_tasks_moves_messages(self, db: Session, test_project: Project, test_user: User):
+        """プロジェクトを移動したタスクのメッセージも移動先のプロジェクトに移る"""
+        # Arrange
+        target = Project(name="Target")
+        tasks = [Task(title=f"Task {i}", status="pending", project_id=test_project.id) for i in range(2)]
+        db.add(target)
+        db.add_all(tasks)
+        db.flush()
+        messages = [
+            Message(content=f"About {task.title}", message_type="comment", user_id=test_user.id,
+                    project_id=test_project.id, task_id=task.id)
+            for task in tasks
+        ]
+        db.add_all(messages)
+        db.commit()
+        
+        # Act
+        crud_task.bulk_update_tasks(db, TaskBulkUpdate(project_id=target.id), task_ids=[tasks[0].id])
+        
+        # Assert
+        db.expire_all()
+        assert messages[0].project_id == target.id
+        assert messages[1].project_id == test_project.id
+
+    def test_bulk_update_tasks_requires_target_and_changes(self, db: Session):
+        """対象や設定する値がない一括更新を拒否"""
+        with pytest.raises(ValueError):
+            crud_task.bulk_update_tasks(db, TaskBulkUpdate(status="completed"))
+        with pytest.raises(ValueError):
+            crud_task.bulk_update_tasks(db, TaskBulkUpdate(), task_ids=[1])
+
+    def test_get_tasks_with_fields(self, db: Session, test_project: Project):
+        """fieldsで指定した列だけをSELECTすることを確認"""
+        # Arrange
+        project_id = test_project.id
+        db.add(Task(title="Projected", description="Long description", status="pending", project_id=project_id))
+        db.commit()
+        db.expunge_all()
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Act
+        try:
+            tasks = crud_task.get_tasks(db, project_id=project_id, fields=["title"])
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Assert
+        assert [task.title for task in tasks] == ["Projected"]
+        assert len(statements) == 1
+        assert "tasks.title" in statements[0]
+        assert "tasks.description" not in statements[0]
+        with pytest.raises(Exception):
+            tasks[0].description
+
+    def test_get_task_with_unknown_field(self, db: Session):
+        """存在しない列名を指定するとValueError"""
+        with pytest.raises(ValueError, match="Unknown fields"):
+            crud_task.get_task(db, task_id=1, fields=["title", "secret"])
+
+    def test_count_tasks(self, db: Session, test_project: Project):
+        """プロジェクトのタスク数をタスクを読み込まずに数える"""
+        # Arrange
+        db.add_all([Task(title=f"Task {i}", status="pending", project_id=test_project.id) for i in range(3)])
+        db.commit()
+        
+        # Act / Assert
+        assert crud_task.count_tasks(db, project_id=test_project.id) == 3
+        assert crud_task.count_tasks(db, project_id=test_project.id + 1) == 0
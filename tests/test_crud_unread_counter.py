@@ -0,0 +1,251 @@
+"""
+未読カウンターCRUD操作のテスト
+"""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.crud import message as crud_message
+from app.crud import read_cursor as crud_read_cursor
+from app.crud import unread_counter as crud_unread_counter
+from app.schemas.message import MessageCreate, DirectMessageCreate, MessageUpdate
+from app.models.project import Project
+from app.models.user import User
+
+
+class TestUnreadCounterCRUD:
+    """未読カウンターCRUD操作のテストクラス"""
+
+    @pytest.fixture
+    def users(self, db: Session) -> list:
+        """テスト用のユーザーを作成"""
+        users = [
+            User(username="alice", email="alice@example.com"),
+            User(username="bob", email="bob@example.com"),
+            User(username="carol", email="carol@example.com"),
+        ]
+        db.add_all(users)
+        db.commit()
+        return users
+
+    @pytest.fixture
+    def test_project(self, db: Session) -> Project:
+        """テスト用のプロジェクトを作成"""
+        project = Project(name="Test Project")
+        db.add(project)
+        db.commit()
+        return project
+
+    def _counts(self, db: Session, user_id: int) -> dict:
+        return {
+            (c.channel_type, c.channel_id): c.unread_count
+            for c in crud_unread_counter.get_unread_counts(db, user_id)
+        }
+
+    def _dm(self, db: Session, sender: User, recipient: User):
+        return crud_message.create_direct_message(
+            db, DirectMessageCreate(content="hi", user_id=sender.id, recipient_id=recipient.id)
+        )
+
+    def _post(self, db: Session, user: User, project: Project):
+        return crud_message.create_message(
+            db, MessageCreate(content="update", message_type="comment", user_id=user.id, project_id=project.id)
+        )
+
+    def test_direct_message_increments_recipient(self, db: Session, users: list):
+        """DMの受信で受信者のカウンターが増える"""
+        alice, bob, _ = users
+        self._dm(db, alice, bob)
+        self._dm(db, alice, bob)
+
+        assert self._counts(db, bob.id) == {("dm", alice.id): 2}
+        assert self._counts(db, alice.id) == {}
+
+    def test_mark_as_read_decrements(self, db: Session, users: list):
+        """DMの既読化でカウンターが減り、二重には減らない"""
+        alice, bob, _ = users
+        first = self._dm(db, alice, bob)
+        self._dm(db, alice, bob)
+
+        crud_message.mark_as_read(db, first.id)
+        crud_message.mark_as_read(db, first.id)
+
+        assert self._counts(db, bob.id) == {("dm", alice.id): 1}
+
+    def test_mark_conversation_as_read_resets(self, db: Session, users: list):
+        """会話の既読化でカウンターが0になる"""
+        alice, bob, _ = users
+        self._dm(db, alice, bob)
+        self._dm(db, alice, bob)
+
+        crud_message.mark_conversation_as_read(db, user_id=bob.id, other_user_id=alice.id)
+
+        assert self._counts(db, bob.id) == {}
+
+    def test_deleting_unread_dm_decrements(self, db: Session, users: list):
+        """未読DMの削除でカウンターが減る"""
+        alice, bob, _ = users
+        dm = self._dm(db, alice, bob)
+
+        crud_message.mark_as_deleted(db, dm.id)
+
+        assert self._counts(db, bob.id) == {}
+
+    def test_project_channel_counts_for_participants(self, db: Session, users: list, test_project: Project):
+        """プロジェクトの投稿は参加者のカウンターのみを増やす"""
+        alice, bob, carol = users
+        self._post(db, bob, test_project)  # bobは投稿して参加者になる
+
+        self._post(db, alice, test_project)
+        self._post(db, alice, test_project)
+
+        assert self._counts(db, bob.id) == {("project", test_project.id): 2}
+        assert self._counts(db, alice.id) == {}
+        assert self._counts(db, carol.id) == {}
+
+    def test_posting_marks_channel_read_for_author(self, db: Session, users: list, test_project: Project):
+        """投稿者自身はそのメッセージまで既読になる"""
+        alice, bob, _ = users
+        self._post(db, bob, test_project)
+        self._post(db, alice, test_project)
+
+        self._post(db, bob, test_project)
+
+        assert self._counts(db, bob.id) == {}
+        assert self._counts(db, alice.id) == {("project", test_project.id): 1}
+
+    def test_mark_channel_read_refreshes_counter(self, db: Session, users: list, test_project: Project):
+        """チャンネルの既読化でカウンターが数え直される"""
+        alice, bob, _ = users
+        self._post(db, bob, test_project)
+        first = self._post(db, alice, test_project)
+        self._post(db, alice, test_project)
+
+        crud_read_cursor.mark_channel_read(db, bob.id, "project", test_project.id, message_id=first.id)
+
+        assert self._counts(db, bob.id) == {("project", test_project.id): 1}
+
+    def test_deleting_project_message_decrements(self, db: Session, users: list, test_project: Project):
+        """未読のプロジェクトメッセージの削除でカウンターが減る"""
+        alice, bob, _ = users
+        self._post(db, bob, test_project)
+        message = self._post(db, alice, test_project)
+
+        crud_message.mark_as_deleted(db, message.id)
+
+        assert self._counts(db, bob.id) == {}
+
+    def test_mark_channel_read_on_dm_updates_is_read(self, db: Session, users: list):
+        """DMチャンネルの既読化で is_read も更新される"""
+        alice, bob, _ = users
+        dm = self._dm(db, alice, bob)
+
+        crud_read_cursor.mark_channel_read(db, bob.id, "dm", alice.id)
+
+        assert crud_message.get_message(db, dm.id).is_read is True
+        assert self._counts(db, bob.id) == {}
+
+    def test_get_unread_counts_does_not_touch_messages(self, db: Session, users: list):
+        """未読数の取得でmessagesテーブルを参照しない"""
+        alice, bob, _ = users
+        self._dm(db, alice, bob)
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            crud_unread_counter.get_unread_counts(db, bob.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert statements
+        assert all("messages" not in statement for statement in statements)
+
+    def test_mark_messages_as_read_decrements_in_bulk(self, db: Session, users: list):
+        """複数メッセージの既読化を1回のUPDATEで行い、カウンターを送信者ごとに減算する"""
+        alice, bob, carol = users
+        from_alice = [self._dm(db, alice, bob) for _ in range(3)]
+        from_carol = self._dm(db, carol, bob)
+        ids = [from_alice[0].id, from_alice[1].id, from_carol.id, 999]
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            count = crud_message.mark_messages_as_read(db, ids)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert count == 3
+        assert sum(statement.startswith("UPDATE messages") for statement in statements) == 1
+        assert not any(statement.startswith("SELECT") for statement in statements)
+        assert self._counts(db, bob.id) == {("dm", alice.id): 1}
+        # 既読のメッセージは数えない
+        assert crud_message.mark_messages_as_read(db, ids[:1]) == 0
+
+    def test_read_channel_up_to_keeps_newer_messages_unread(self, db: Session, users: list):
+        """ウォーターマークより後のDMは未読のまま残る"""
+        alice, bob, _ = users
+        first = self._dm(db, alice, bob)
+        second = self._dm(db, alice, bob)
+        later = self._dm(db, alice, bob)
+
+        cursor, marked, unread_count = crud_read_cursor.read_channel_up_to(
+            db, bob.id, "dm", alice.id, up_to_message_id=second.id
+        )
+
+        assert cursor.last_read_message_id == second.id
+        assert marked == 2
+        assert unread_count == 1
+        assert crud_message.get_message(db, first.id).is_read is True
+        assert crud_message.get_message(db, later.id).is_read is False
+        assert self._counts(db, bob.id) == {("dm", alice.id): 1}
+
+    def test_update_message_flags_update_dm_counter(self, db: Session, users: list):
+        """update_message での既読化・削除と、その取り消しでDMのカウンターが増減する"""
+        alice, bob, _ = users
+        read = self._dm(db, alice, bob)
+        deleted = self._dm(db, alice, bob)
+
+        crud_message.update_message(db, read.id, MessageUpdate(is_read=True))
+        crud_message.update_message(db, deleted.id, MessageUpdate(is_read=True, is_deleted=True))
+        assert self._counts(db, bob.id) == {}
+
+        crud_message.update_message(db, read.id, MessageUpdate(is_read=False))
+        crud_message.update_message(db, deleted.id, MessageUpdate(is_deleted=False))
+        assert self._counts(db, bob.id) == {("dm", alice.id): 1}
+
+    def test_update_message_deleting_project_message_updates_counter(
+        self, db: Session, users: list, test_project: Project
+    ):
+        """update_message での論理削除と、その取り消しでプロジェクトのカウンターが増減する"""
+        alice, bob, _ = users
+        self._post(db, bob, test_project)
+        message = self._post(db, alice, test_project)
+
+        crud_message.update_message(db, message.id, MessageUpdate(is_deleted=True))
+        assert self._counts(db, bob.id) == {}
+
+        crud_message.update_message(db, message.id, MessageUpdate(is_deleted=False))
+        assert self._counts(db, bob.id) == {("project", test_project.id): 1}
+
+    def test_stale_update_message_keeps_counter(self, db: Session, users: list):
+        """expected_updated_at が一致しない更新ではカウンターも変わらない"""
+        alice, bob, _ = users
+        dm = self._dm(db, alice, bob)
+        stale = dm.updated_at - timedelta(seconds=1)
+
+        with pytest.raises(StaleDataError):
+            crud_message.update_message(db, dm.id, MessageUpdate(is_read=True), expected_updated_at=stale)
+        db.commit()
+
+        assert self._counts(db, bob.id) == {("dm", alice.id): 1}
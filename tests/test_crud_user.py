@@ -2,6 +2,7 @@
 ユーザーCRUD操作のテスト
 """
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.crud import user as crud_user
 from app.schemas.user import UserCreate
@@ -171,4 +172,47 @@ class TestUserCRUD:
         
         # Act & Assert
         result = crud_user.create_user(db, user=user_data)
-        assert result is None  # または例外が発生することを期待 
\ No newline at end of file
+        assert result is None  # または例外が発生することを期待
+
+    def test_create_user_single_statement(self, db: Session):
+        """ユーザー作成と重複検出がそれぞれ1文で行われることを確認"""
+        # Arrange
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Act
+        try:
+            created = crud_user.create_user(db, UserCreate(username="alice", email="alice@example.com"))
+            username = created.username
+            duplicate = crud_user.create_user(db, UserCreate(username="alice", email="other@example.com"))
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", capture)
+        
+        # Assert
+        assert username == "alice"
+        assert duplicate is None
+        # SAVEPOINTの操作以外はINSERT ... RETURNING の2文だけ
+        statements = [s for s in statements if "SAVEPOINT" not in s]
+        assert len(statements) == 2
+        assert all(s.startswith("INSERT INTO users") and "RETURNING" in s for s in statements)
+        # 重複による失敗後もセッションは使える
+        assert crud_user.get_user(db, created.id).email == "alice@example.com"
+
+    def test_create_user_duplicate_keeps_pending_changes(self, db: Session):
+        """重複によるユーザー作成の失敗で、呼び出し元の未コミットの変更が捨てられないことを確認"""
+        # Arrange
+        crud_user.create_user(db, UserCreate(username="alice", email="alice@example.com"))
+        db.add(User(username="pending", email="pending@example.com"))
+        db.flush()
+        
+        # Act
+        duplicate = crud_user.create_user(db, UserCreate(username="alice", email="other@example.com"))
+        db.commit()
+        
+        # Assert
+        assert duplicate is None
+        assert crud_user.get_user_by_email(db, "pending@example.com") is not None
@@ -0,0 +1,135 @@
+"""
+書き込みスレッドとグループコミット（app.db.writer）のテスト
+"""
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.db.database import Base, SQLITE_READER_PRAGMAS, configure_sqlite_engine
+from app.db.writer import GroupCommitWriter, create_writer_engine
+from app.models.user import User
+from app.schemas.message import MessageCreate
+from app.schemas.user import UserCreate
+
+
+class TestGroupCommitWriter:
+    """書き込みスレッドのテストクラス"""
+    
+    @pytest.fixture
+    def database_url(self, tmp_path) -> str:
+        """テーブルを作成したSQLiteファイルのURL"""
+        url = f"sqlite:///{tmp_path / 'writer.db'}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+        return url
+    
+    @pytest.fixture
+    def writer(self, database_url: str):
+        """テスト用の書き込みスレッド"""
+        writer = GroupCommitWriter(create_writer_engine(database_url), batch_size=16, batch_window=0.01)
+        yield writer
+        writer.close()
+        writer.engine.dispose()
+    
+    def count(self, database_url: str, table: str) -> int:
+        engine = create_engine(database_url)
+        try:
+            with engine.connect() as conn:
+                return conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+        finally:
+            engine.dispose()
+    
+    def test_concurrent_writes_are_grouped(self, writer: GroupCommitWriter, database_url: str):
+        """同時に届いた書き込みがまとめてコミットされ、それぞれの結果が返ることを確認"""
+        # Arrange
+        user = writer.run(crud.user.create_user, UserCreate(username="alice", email="alice@example.com"))
+        results = {}
+        
+        def post(i: int) -> None:
+            message = MessageCreate(content=f"Message {i}", message_type="comment", user_id=user.id)
+            results[i] = writer.run(crud.message.create_message, message).content
+        
+        # Act
+        threads = [threading.Thread(target=post, args=(i,)) for i in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Assert
+        assert results == {i: f"Message {i}" for i in range(40)}
+        assert self.count(database_url, "messages") == 40
+        stats = writer.stats()
+        assert stats["jobs"] == 41
+        assert stats["batches"] < stats["jobs"]
+        assert stats["max_batch"] <= 16
+    
+    def test_failed_write_is_isolated(self, writer: GroupCommitWriter, database_url: str):
+        """失敗した書き込みだけがロールバックされ、例外が呼び出し元に返ることを確認"""
+        # Arrange
+        def fail(db: Session) -> None:
+            db.add(User(username="bob", email="bob@example.com"))
+            db.flush()
+            raise ValueError("User not found: 999")
+        
+        # Act
+        first = writer.submit(crud.user.create_user, UserCreate(username="alice", email="alice@example.com"))
+        failed = writer.submit(fail)
+        duplicate = writer.submit(crud.user.create_user, UserCreate(username="alice", email="alice@example.com"))
+        last = writer.submit(crud.user.create_user, UserCreate(username="carol", email="carol@example.com"))
+        
+        # Assert
+        assert first.result().username == "alice"
+        with pytest.raises(ValueError, match="User not found"):
+            failed.result()
+        # crud 内のロールバック（一意制約違反）も、その書き込みの SAVEPOINT までに限られる
+        assert duplicate.result() is None
+        assert last.result().username == "carol"
+        assert self.count(database_url, "users") == 2
+    
+    def test_after_commit_fires_after_group_commit(self, writer: GroupCommitWriter, database_url: str):
+        """after_commit のイベントが、別の接続から行が見えるようになってから発火することを確認"""
+        # Arrange
+        visible = []
+        
+        def check(session: Session) -> None:
+            # create_user のSAVEPOINTの解放でも発火するため、外側のコミットだけを見る
+            if session.info.get("writer_test") and not session.in_nested_transaction():
+                visible.append(self.count(database_url, "users"))
+        
+        def create(db: Session) -> None:
+            db.info["writer_test"] = True
+            crud.user.create_user(db, UserCreate(username="alice", email="alice@example.com"))
+        
+        event.listen(Session, "after_commit", check)
+        try:
+            # Act
+            writer.run(create)
+        finally:
+            event.remove(Session, "after_commit", check)
+        
+        # Assert
+        assert visible == [1]
+    
+    def test_run_async(self, writer: GroupCommitWriter):
+        """非同期版がコミット後の結果を返すことを確認"""
+        user = asyncio.run(writer.run_async(crud.user.create_user, UserCreate(username="alice", email="alice@example.com")))
+        assert user.username == "alice"
+    
+    def test_reader_pragmas_reject_writes(self, database_url: str):
+        """読み取り専用の接続では書き込みが失敗することを確認"""
+        engine = create_engine(database_url)
+        configure_sqlite_engine(engine, SQLITE_READER_PRAGMAS)
+        try:
+            with engine.connect() as conn:
+                assert conn.execute(text("SELECT count(*) FROM users")).scalar() == 0
+                with pytest.raises(OperationalError, match="readonly"):
+                    conn.execute(text("INSERT INTO users (username, email) VALUES ('a', 'a@example.com')"))
+        finally:
+            engine.dispose()
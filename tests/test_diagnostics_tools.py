@@ -0,0 +1,41 @@
+"""
+Test cases for diagnostics MCP tools
+"""
+from app.tools.diagnostics_tools import get_diagnostics_tool
+
+
+class TestDiagnosticsTools:
+    """Test cases for diagnostics tools"""
+    
+    def test_get_diagnostics_reports_pool(self):
+        """Test that diagnostics include connection pool statistics"""
+        result = get_diagnostics_tool()
+        
+        pool = result["database"]["pool"]
+        assert result["database"]["dialect"] == "sqlite"
+        assert pool["mode"] == "queue"
+        assert pool["checked_out"] >= 0
+        assert "wait_time_max_ms" in pool
+        assert result["database"]["async_pool"]["pool_class"] == "InstrumentedAsyncQueuePool"
+    
+    def test_get_diagnostics_reports_cache(self):
+        """Test that diagnostics include entity cache statistics"""
+        cache = get_diagnostics_tool()["cache"]
+        
+        assert cache["enabled"] is True
+        assert {"size", "max_size", "ttl_seconds", "hits", "misses", "hit_rate"} <= set(cache)
+    
+    def test_get_diagnostics_reports_render_cache(self):
+        """Test that diagnostics include rendered resource cache statistics"""
+        render_cache = get_diagnostics_tool()["render_cache"]
+        
+        assert render_cache["enabled"] is True
+        assert {"size", "hits", "misses", "hit_rate", "stale"} <= set(render_cache)
+    
+    def test_get_diagnostics_reports_invalidation_bus(self):
+        """Test that diagnostics include cross-process cache invalidation statistics"""
+        bus = get_diagnostics_tool()["invalidation_bus"]
+        
+        assert bus["enabled"] is True
+        assert bus["backend"] == "data_version"
+        assert {"published", "received", "full_flushes", "max_delay_ms"} <= set(bus)
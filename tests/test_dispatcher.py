@@ -0,0 +1,153 @@
+"""
+Test cases for the tool dispatcher
+"""
+import asyncio
+import inspect
+import threading
+
+import pytest
+
+from app.dispatcher import Lane, ToolBusyError, ToolDispatcher, heavy_if_limit_above
+
+
+def make_dispatcher(concurrency: int = 1, queue: int = 1) -> ToolDispatcher:
+    return ToolDispatcher({
+        "default": Lane("default", concurrency, queue),
+        "heavy": Lane("heavy", concurrency, queue),
+    })
+
+
+class TestToolDispatcher:
+    """Test cases for lanes and admission control"""
+
+    def test_wrapper_keeps_signature(self):
+        """Test that the wrapped tool exposes the original parameters"""
+        dispatcher = make_dispatcher()
+
+        def get_items(project_id: int, limit: int = 100) -> list:
+            """Get items"""
+            return []
+
+        wrapped = dispatcher.tool()(get_items)
+
+        assert inspect.iscoroutinefunction(wrapped)
+        assert list(inspect.signature(wrapped).parameters) == ["project_id", "limit"]
+        assert wrapped.__doc__ == "Get items"
+
+    def test_unknown_lane(self):
+        """Test that registering a tool on an unknown lane fails"""
+        with pytest.raises(ValueError):
+            make_dispatcher().tool(lane="bulk")(lambda: None)
+
+    @pytest.mark.asyncio
+    async def test_sync_tool_runs_off_event_loop(self):
+        """Test that sync tools run on a lane thread"""
+        dispatcher = make_dispatcher()
+
+        @dispatcher.tool()
+        def whoami() -> int:
+            return threading.get_ident()
+
+        assert await whoami() != threading.get_ident()
+        assert dispatcher.stats()["default"]["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self):
+        """Test that calls beyond concurrency + queue are rejected with a retryable error"""
+        dispatcher = make_dispatcher(concurrency=1, queue=1)
+        release = threading.Event()
+
+        @dispatcher.tool()
+        def blocking() -> str:
+            release.wait(5)
+            return "done"
+
+        @dispatcher.tool(lane="heavy")
+        def other_lane() -> str:
+            return "ok"
+
+        running = asyncio.create_task(blocking())
+        queued = asyncio.create_task(blocking())
+        await asyncio.sleep(0.05)
+
+        stats = dispatcher.stats()["default"]
+        assert stats["active"] == 1
+        assert stats["queued"] == 1
+
+        with pytest.raises(ToolBusyError) as exc_info:
+            await blocking()
+        assert exc_info.value.retryable
+        assert "retry" in str(exc_info.value)
+
+        # Other lanes are not affected
+        assert await other_lane() == "ok"
+
+        release.set()
+        assert await asyncio.gather(running, queued) == ["done", "done"]
+        stats = dispatcher.stats()["default"]
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["queued"] == stats["active"] == 0
+        assert stats["wait_time_max_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_lane_selected_by_arguments(self):
+        """Test that large requests are routed to the heavy lane"""
+        dispatcher = make_dispatcher()
+
+        @dispatcher.tool(lane=heavy_if_limit_above(100))
+        async def get_items(limit: int = 100) -> int:
+            return limit
+
+        await get_items()
+        await get_items(limit=1000)
+
+        stats = dispatcher.stats()
+        assert stats["default"]["completed"] == 1
+        assert stats["heavy"]["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_per_tool_concurrency_limit(self):
+        """Test that a tool can be limited below its lane's concurrency"""
+        dispatcher = make_dispatcher(concurrency=4, queue=4)
+        running = 0
+        peak = 0
+
+        @dispatcher.tool(max_concurrency=1)
+        async def export() -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(export() for _ in range(3)))
+
+        assert peak == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_calls_are_not_completed(self):
+        """Test that calls that raise or are cancelled while queued count only as failed"""
+        dispatcher = make_dispatcher(concurrency=1, queue=1)
+        release = threading.Event()
+
+        @dispatcher.tool()
+        def blocking() -> str:
+            release.wait(5)
+            raise RuntimeError("boom")
+
+        running = asyncio.create_task(blocking())
+        queued = asyncio.create_task(blocking())
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        release.set()
+        with pytest.raises(RuntimeError):
+            await running
+
+        stats = dispatcher.stats()["default"]
+        assert stats["failed"] == 2
+        assert stats["completed"] == 0
+        assert stats["queued"] == stats["active"] == 0
@@ -0,0 +1,83 @@
+"""
+メッセージ検索用インデックスのクエリプランテスト
+
+CRUD関数が実際に発行するSQLに対して EXPLAIN QUERY PLAN を実行し、
+想定した複合インデックスが使われていることを確認する。
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud import message as crud_message
+from app.crud.pagination import encode_cursor
+
+
+def _query_plans(db: Session, func, **kwargs) -> list:
+    """CRUD関数が発行したSELECT文のクエリプランを取得する"""
+    engine = db.get_bind()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        func(db, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert statements, "SELECT文が発行されていません"
+    connection = db.connection().connection
+    plans = []
+    for statement, parameters in statements:
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        plans.append(" ".join(row[-1] for row in rows))
+    return plans
+
+
+class TestMessageIndexes:
+    """メッセージの複合インデックスのテストクラス"""
+
+    @pytest.mark.parametrize(
+        "func, kwargs, index_name",
+        [
+            (crud_message.get_messages, {"project_id": 1}, "ix_messages_project_id_created_at"),
+            (crud_message.get_messages, {"task_id": 1}, "ix_messages_task_id_created_at"),
+            (crud_message.get_thread_messages, {"parent_id": 1}, "ix_messages_parent_id_created_at"),
+            (crud_message.get_unread_messages, {"user_id": 1}, "ix_messages_recipient_id_is_read"),
+            (
+                crud_message.get_direct_messages,
+                {"user_id": 1, "other_user_id": 2},
+                "ix_messages_user_id_recipient_id_created_at",
+            ),
+        ],
+    )
+    def test_query_uses_index(self, db: Session, func, kwargs, index_name):
+        """各CRUD関数のクエリが対応するインデックスを使用すること"""
+        plans = _query_plans(db, func, **kwargs)
+
+        assert any(index_name in plan for plan in plans), plans
+
+    def test_project_messages_avoid_sort(self, db: Session):
+        """プロジェクトのメッセージ取得で一時B-treeによるソートが発生しないこと"""
+        plans = _query_plans(db, crud_message.get_messages, project_id=1)
+
+        assert all("USE TEMP B-TREE" not in plan for plan in plans), plans
+
+    def test_partial_index_skipped_for_deleted(self, db: Session):
+        """削除済みメッセージを含む検索では部分インデックスが使われないこと"""
+        plans = _query_plans(db, crud_message.get_messages, project_id=1, include_deleted=True)
+
+        assert all("ix_messages_project_id_created_at" not in plan for plan in plans), plans
+
+    def test_project_messages_cursor_page_uses_index(self, db: Session):
+        """カーソル指定時もインデックスの範囲検索でソートなしに取得できること"""
+        cursor = encode_cursor(datetime(2025, 1, 1), 100)
+
+        plans = _query_plans(db, crud_message.get_messages, project_id=1, cursor=cursor)
+
+        assert any("ix_messages_project_id_created_at" in plan for plan in plans), plans
+        assert all("USE TEMP B-TREE" not in plan for plan in plans), plans
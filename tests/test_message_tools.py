@@ -8,8 +8,10 @@ from sqlalchemy.orm import Session
 
 from app.tools.message_tools import (
     create_message_tool,
+    create_messages_tool,
     get_messages_tool,
     get_message_tool,
+    get_direct_messages_tool,
 )
 from app.models.message import Message as MessageModel
 
@@ -182,4 +184,63 @@ class TestMessageTools:
                 
                 # Act & Assert
                 with pytest.raises(ValueError, match="Message not found"):
-                    get_message_tool(message_id=message_id) 
\ No newline at end of file
+                    get_message_tool(message_id=message_id) 
+
+    def test_get_direct_messages_tool_with_fields(self):
+        """Test direct messages default to the DM columns and honour fields"""
+        message = MessageModel(id=1, content="Hi", message_type="direct_message", user_id=1, recipient_id=2, is_read=False)
+        
+        with patch('app.tools.message_tools.SessionLocal'):
+            with patch('app.tools.message_tools.crud.message.get_direct_messages') as mock_get_dms:
+                mock_get_dms.return_value = [message]
+                
+                # Act
+                default = get_direct_messages_tool(user_id=1, other_user_id=2)
+                projected = get_direct_messages_tool(user_id=1, other_user_id=2, fields=["content"])
+                
+                # Assert
+                assert list(default[0]) == ["id", "content", "message_type", "user_id", "recipient_id", "parent_id", "is_read", "created_at"]
+                assert projected == [{"id": 1, "content": "Hi"}]
+
+    def test_create_messages_tool_reports_invalid_items(self):
+        """Test that invalid items are reported per index without aborting the batch"""
+        # Arrange
+        messages = [
+            {"content": "build started", "message_type": "status_update", "user_id": 1, "project_id": 1},
+            {"content": "", "user_id": 1, "project_id": 1},
+            {"content": "build passed", "message_type": "status_update", "user_id": 1, "project_id": 1},
+        ]
+        created = [MessageModel(id=10, content="build started"), MessageModel(id=11, content="build passed")]
+        
+        with patch('app.tools.message_tools.SessionLocal'):
+            with patch('app.tools.message_tools.crud.message.create_messages_bulk') as mock_bulk:
+                mock_bulk.return_value = created
+                
+                # Act
+                result = create_messages_tool(messages=messages)
+                
+                # Assert
+                assert result["ids"] == [10, None, 11]
+                assert result["created"] == 2
+                assert result["failed"] == 1
+                assert result["errors"][0]["index"] == 1
+                assert "content is required" in result["errors"][0]["error"]
+                assert len(mock_bulk.call_args.kwargs["messages"]) == 2
+
+    def test_create_messages_tool_atomic_rejects_invalid_batch(self):
+        """Test that an atomic batch with an invalid item creates nothing"""
+        messages = [
+            {"content": "ok", "user_id": 1, "project_id": 1},
+            {"content": "missing user"},
+        ]
+        
+        with patch('app.tools.message_tools.SessionLocal'):
+            with patch('app.tools.message_tools.crud.message.create_messages_bulk') as mock_bulk:
+                with pytest.raises(ValueError, match="nothing was created"):
+                    create_messages_tool(messages=messages, atomic=True)
+                mock_bulk.assert_not_called()
+
+    def test_create_messages_tool_empty_batch(self):
+        """Test that an empty batch is rejected"""
+        with pytest.raises(ValueError, match="At least one message"):
+            create_messages_tool(messages=[])
@@ -0,0 +1,49 @@
+"""
+キーセットページネーション用カーソルのテスト
+"""
+from datetime import datetime
+
+import pytest
+
+from app.crud.pagination import (
+    encode_cursor,
+    decode_cursor,
+    decode_id_cursor,
+    decode_created_at_cursor,
+)
+
+
+class TestPagination:
+    """カーソルのエンコード・デコードのテストクラス"""
+
+    def test_id_cursor_roundtrip(self):
+        """IDカーソルのエンコードとデコード"""
+        assert decode_id_cursor(encode_cursor(42)) == 42
+
+    def test_created_at_cursor_roundtrip(self):
+        """(created_at, id) カーソルのエンコードとデコード"""
+        created_at = datetime(2025, 6, 9, 13, 54, 3, 843598)
+
+        assert decode_created_at_cursor(encode_cursor(created_at, 7)) == (created_at, 7)
+
+    def test_cursor_is_opaque(self):
+        """カーソルがURLセーフな文字列であること"""
+        cursor = encode_cursor(datetime(2025, 1, 1), 1)
+
+        assert cursor.replace("-", "").replace("_", "").isalnum()
+
+    @pytest.mark.parametrize("cursor", ["", "@@@", encode_cursor("x"), encode_cursor({"id": 1})])
+    def test_invalid_id_cursor(self, cursor):
+        """不正なIDカーソル"""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_id_cursor(cursor)
+
+    def test_invalid_created_at_cursor(self):
+        """日時として解釈できないカーソル"""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_created_at_cursor(encode_cursor("yesterday", 1))
+
+    def test_decode_cursor_rejects_non_list(self):
+        """リスト以外をエンコードしたカーソル"""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor("eyJhIjoxfQ")  # {"a":1}
@@ -0,0 +1,121 @@
+"""
+Tests for the versioned render cache of MCP resources
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud import project as crud_project
+from app.crud import task as crud_task
+from app.main import project_resource, task_resource
+from app.models.project import Project
+from app.resources.render_cache import RenderCache, render_cache
+from app.schemas.project import ProjectCreate
+from app.schemas.task import TaskCreate, TaskUpdate
+from tests.conftest import TestingSessionLocal
+
+
+class TestRenderCache:
+    """Test suite for RenderCache"""
+    
+    def test_reuses_text_for_same_version(self):
+        """Test that text is rendered once per version"""
+        cache = RenderCache(max_size=10, ttl=60)
+        render = Mock(side_effect=["v1", "v2"])
+        
+        assert cache.get_or_render("key", (1,), render) == "v1"
+        assert cache.get_or_render("key", (1,), render) == "v1"
+        assert cache.get_or_render("key", (2,), render) == "v2"
+        
+        assert render.call_count == 2
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 2, 1)
+    
+    def test_errors_are_not_cached(self):
+        """Test that a failing render is retried on the next read"""
+        cache = RenderCache(max_size=10, ttl=60)
+        render = Mock(side_effect=[ValueError("Project not found: 1"), "text"])
+        
+        with pytest.raises(ValueError):
+            cache.get_or_render("key", (0,), render)
+        assert cache.get_or_render("key", (0,), render) == "text"
+    
+    def test_expiry_and_size_limit(self):
+        """Test TTL expiry, LRU eviction and the disabled cache"""
+        expired = RenderCache(max_size=10, ttl=0)
+        expired.get_or_render("key", (0,), lambda: "old")
+        assert expired.get_or_render("key", (0,), lambda: "new") == "new"
+        
+        small = RenderCache(max_size=1, ttl=60)
+        small.get_or_render("a", (0,), lambda: "a")
+        small.get_or_render("b", (0,), lambda: "b")
+        assert small.stats()["size"] == 1
+        
+        disabled = RenderCache(max_size=0, ttl=60)
+        disabled.get_or_render("key", (0,), lambda: "text")
+        assert disabled.stats()["size"] == 0
+
+
+class TestResourceRendering:
+    """Test that resources are served from the cache until a write"""
+    
+    @pytest.fixture
+    def resources_db(self, db: Session):
+        """Point the resource handlers at the test database"""
+        with patch('app.resources.project_resources.SessionLocal', TestingSessionLocal), \
+             patch('app.resources.task_resources.SessionLocal', TestingSessionLocal):
+            yield db
+    
+    @pytest.fixture
+    def statements(self, db: Session):
+        """Record issued SQL statements"""
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.get_bind(), "before_cursor_execute", capture)
+        yield statements
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+    
+    def test_project_resource_counts_tasks(self, resources_db: Session, statements: list):
+        """Test that project:// counts tasks in SQL and re-renders after a task is created"""
+        # Arrange
+        project = Project(name="Render", description="Cached")
+        resources_db.add(project)
+        resources_db.commit()
+        project_id = project.id
+        crud_task.create_task(resources_db, TaskCreate(title="First", status="pending", project_id=project_id))
+        
+        # Act
+        first = project_resource(str(project_id))
+        statements.clear()
+        cached = project_resource(str(project_id))
+        
+        # Assert
+        assert first == "Project: Render\nDescription: Cached\n\nTasks: 1 tasks"
+        assert cached == first
+        assert statements == []
+        
+        crud_task.create_task(resources_db, TaskCreate(title="Second", status="pending", project_id=project_id))
+        assert project_resource(str(project_id)).endswith("Tasks: 2 tasks")
+        assert any("count(" in statement for statement in statements)
+        assert not any(statement.lstrip().startswith("SELECT tasks.") for statement in statements)
+    
+    def test_task_resource_rerenders_after_update(self, resources_db: Session):
+        """Test that task:// reflects an update made through the crud layer"""
+        # Arrange
+        project = crud_project.create_project(resources_db, ProjectCreate(name="Project"))
+        task = crud_task.create_task(resources_db, TaskCreate(title="Task", status="pending", project_id=project.id))
+        task_id = task.id
+        assert "Status: pending" in task_resource(str(task_id))
+        stale = render_cache.stats()["stale"]
+        
+        # Act
+        crud_task.update_task(resources_db, task_id, TaskUpdate(status="completed"))
+        
+        # Assert
+        assert "Status: completed" in task_resource(str(task_id))
+        assert render_cache.stats()["stale"] == stale + 1
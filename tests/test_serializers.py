@@ -0,0 +1,76 @@
+"""
+Tests for the shared tool result serializers
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.message import Message as MessageModel
+from app.models.project import Project as ProjectModel
+from app.models.task import Task as TaskModel
+from app.models.user import User as UserModel
+from app.tools.serializers import VIEWS, dumps, projection, serializer, serializer_for
+
+
+class TestSerializers:
+    """Test suite for compiled serializers"""
+
+    def test_view_serializes_listed_fields(self):
+        """Test that a view returns exactly its fields, with ISO 8601 datetimes"""
+        created_at = datetime(2024, 1, 1, 12, 30)
+        task = TaskModel(id=1, title="Task", status="pending", project_id=2, created_at=created_at)
+        
+        result = serializer(TaskModel)(task)
+        
+        assert list(result) == list(VIEWS[TaskModel]["default"])
+        assert result["created_at"] == "2024-01-01T12:30:00"
+        assert result["updated_at"] is None
+
+    def test_views_are_compiled_once(self):
+        """Test that serializers are cached per view and per field list"""
+        assert serializer(MessageModel, "summary") is serializer(MessageModel, "summary")
+        assert projection(MessageModel, ("id", "content")) is serializer_for(MessageModel, ["id", "content"])
+        assert serializer_for(MessageModel) is serializer(MessageModel)
+
+    def test_unknown_view_and_field(self):
+        """Test that unknown views and columns are rejected"""
+        with pytest.raises(KeyError):
+            serializer(MessageModel, "missing")
+        with pytest.raises(ValueError, match="Unknown fields"):
+            projection(MessageModel, ("id", "secret"))
+
+    def test_row_mappings_and_instances_match(self, db: Session):
+        """Test that Core row mappings serialize the same as ORM instances"""
+        user = UserModel(username="testuser", email="test@example.com")
+        db.add(user)
+        db.commit()
+        db.add(MessageModel(content="Hello", message_type="comment", user_id=user.id))
+        db.commit()
+        serialize = serializer(MessageModel, "summary")
+        
+        from_instance = serialize.many(db.query(MessageModel).all())
+        from_mapping = serialize.many(db.execute(select(MessageModel.__table__)).mappings().all())
+        
+        assert from_instance == from_mapping
+        assert serialize.many([]) == []
+
+    def test_dumps_compact_json(self):
+        """Test that dumps produces compact JSON and falls back to str()"""
+        text = dumps({"items": [{"id": 1, "at": datetime(2024, 1, 1)}]})
+        
+        assert "\n" not in text
+        assert json.loads(text)["items"][0]["id"] == 1
+
+    def test_expired_instance_is_reloaded(self, db: Session):
+        """Test that instances expired by a commit are read through the ORM attributes"""
+        project = ProjectModel(name="Before")
+        db.add(project)
+        db.commit()
+        db.execute(update(ProjectModel).values(name="After"))
+        db.commit()
+        
+        assert serializer(ProjectModel)(project)["name"] == "After"
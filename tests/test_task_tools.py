@@ -12,6 +12,7 @@ from app.tools.task_tools import (
     get_task_tool,
     update_task_tool,
     delete_task_tool,
+    bulk_update_tasks_tool,
 )
 from app.models.task import Task as TaskModel
 
@@ -259,4 +260,59 @@ class TestTaskTools:
                 
                 # Act & Assert
                 with pytest.raises(ValueError, match="Task not found"):
-                    delete_task_tool(task_id=task_id) 
\ No newline at end of file
+                    delete_task_tool(task_id=task_id)
+
+    def test_bulk_update_tasks_tool_success(self):
+        """Test bulk update with a filter and a summary message"""
+        summary_message = Mock(id=7)
+        
+        with patch('app.tools.task_tools.SessionLocal'):
+            with patch('app.tools.task_tools.crud.task.bulk_update_tasks') as mock_bulk:
+                mock_bulk.return_value = (12, summary_message)
+                
+                # Act
+                result = bulk_update_tasks_tool(
+                    project_id=1, status="in_progress", set_status="completed", summary_user_id=3
+                )
+                
+                # Assert
+                assert result == {"updated": 12, "changes": {"status": "completed"}, "summary_message_id": 7}
+                kwargs = mock_bulk.call_args.kwargs
+                assert kwargs["status"] == "in_progress"
+                assert kwargs["summary"].message_type == "task_update"
+                assert kwargs["summary"].project_id == 1
+
+    def test_bulk_update_tasks_tool_validation(self):
+        """Test that invalid bulk updates are rejected before touching the database"""
+        with patch('app.tools.task_tools.crud.task.bulk_update_tasks') as mock_bulk:
+            with pytest.raises(ValueError, match="filter"):
+                bulk_update_tasks_tool(set_status="completed")
+            with pytest.raises(ValueError, match="set_status"):
+                bulk_update_tasks_tool(task_ids=[1])
+            with pytest.raises(ValueError):
+                bulk_update_tasks_tool(task_ids=[1], set_status="archived")
+            with pytest.raises(ValueError):
+                bulk_update_tasks_tool(project_id=1, status="archived", set_status="completed")
+            mock_bulk.assert_not_called()
+
+    def test_get_tasks_tool_with_fields(self):
+        """Test that only the requested columns are fetched and returned"""
+        task = TaskModel(id=1, title="Test Task", status="pending", project_id=1)
+        
+        with patch('app.tools.task_tools.SessionLocal'):
+            with patch('app.tools.task_tools.crud.task.get_tasks') as mock_get_tasks:
+                mock_get_tasks.return_value = [task]
+                
+                # Act
+                result = get_tasks_tool(project_id=1, fields=["title", "status"])
+                
+                # Assert
+                assert result == [{"id": 1, "title": "Test Task", "status": "pending"}]
+                assert mock_get_tasks.call_args.kwargs["fields"] == ["id", "title", "status"]
+
+    def test_get_task_tool_unknown_field(self):
+        """Test that unknown fields are rejected before touching the database"""
+        with patch('app.tools.task_tools.crud.task.get_task') as mock_get_task:
+            with pytest.raises(ValueError, match="Unknown fields"):
+                get_task_tool(task_id=1, fields=["secret"])
+            mock_get_task.assert_not_called()